@@ -0,0 +1,159 @@
+"""Add import, enrichment history, outreach and scheduler columns and indexes
+
+Brings databases created from the earlier models up to date: lead scores,
+delta snapshots, outreach due times, scheduled job runs, Apify import
+checkpoints, website/phone match keys, duplicate clustering and the unique
+google_business_url index used by CompanyLoader. Statements use IF NOT EXISTS
+so databases already created from the current models are left as they are.
+
+Before the unique index is created, companies sharing a google_business_url
+are merged into the most recently updated one: enrichment snapshots and
+outreach rows are moved to it and the other rows are deleted. Each moved
+snapshot chain is kept contiguous, starting from a full snapshot, ahead of
+the kept company's own chain, so the latest state is still the kept
+company's and deltas rebuild against the right base.
+
+Revision ID: 7c1e4b9a2d53
+Revises:
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4b9a2d53'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (table, column, definition)
+NEW_COLUMNS = [
+    ("companies", "lead_score", "DOUBLE PRECISION"),
+    ("companies", "website_domain", "VARCHAR"),
+    ("companies", "phone_primary_e164", "VARCHAR"),
+    ("companies", "phone_dispatch_e164", "VARCHAR"),
+    ("companies", "latitude", "DOUBLE PRECISION"),
+    ("companies", "longitude", "DOUBLE PRECISION"),
+    ("companies", "canonical_company_id", "UUID REFERENCES companies (id)"),
+    ("companies", "duplicate_score", "DOUBLE PRECISION"),
+    ("enrichment_snapshots", "snapshot_type", "VARCHAR NOT NULL DEFAULT 'full'"),
+    ("enrichment_snapshots", "content_hash", "VARCHAR"),
+    ("enrichment_snapshots", "chain_seq", "INTEGER NOT NULL DEFAULT 0"),
+    ("outreach_assignments", "next_step_due_at", "TIMESTAMP WITHOUT TIME ZONE"),
+    ("apify_runs", "import_offset", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+# (name, table, columns)
+NEW_INDEXES = [
+    ("ix_companies_lead_score", "companies", "lead_score"),
+    ("ix_companies_website_domain", "companies", "website_domain"),
+    ("ix_companies_phone_primary_e164", "companies", "phone_primary_e164"),
+    ("ix_companies_phone_dispatch_e164", "companies", "phone_dispatch_e164"),
+    ("ix_companies_canonical_company_id", "companies", "canonical_company_id"),
+    ("ix_enrichment_snapshots_company_created", "enrichment_snapshots", "company_id, created_at"),
+    ("ix_enrichment_snapshots_chain", "enrichment_snapshots", "company_id, enrichment_source, chain_seq"),
+    ("ix_outreach_assignments_status_due", "outreach_assignments", "status, next_step_due_at"),
+    ("ix_outreach_history_company_channel_sent", "outreach_history", "company_id, channel, sent_at"),
+]
+
+# Tables whose company_id moves to the kept company when duplicates are merged
+COMPANY_CHILD_TABLES = ("enrichment_snapshots", "outreach_history", "outreach_assignments")
+
+
+def _find_duplicate_companies() -> None:
+    """Temporary table mapping each company sharing a google_business_url to the one kept"""
+    op.execute(
+        "CREATE TEMPORARY TABLE company_url_duplicates ON COMMIT DROP AS "
+        "SELECT id, keep_id FROM ("
+        "  SELECT id, first_value(id) OVER ("
+        "    PARTITION BY google_business_url "
+        "    ORDER BY updated_at DESC NULLS LAST, created_at DESC NULLS LAST, id"
+        "  ) AS keep_id "
+        "  FROM companies WHERE google_business_url IS NOT NULL"
+        ") ranked WHERE id <> keep_id"
+    )
+
+
+def _number_snapshot_chains() -> None:
+    """Set chain_seq per company/source chain as it will be after duplicates are merged"""
+    # A chain's first row has no base to apply to, so it must be a full snapshot;
+    # a delta there holds the whole state in 'set'
+    op.execute(
+        "UPDATE enrichment_snapshots s SET snapshot_type = 'full', "
+        "snapshot_data = s.snapshot_data -> 'set', content_hash = NULL FROM ("
+        "  SELECT id, row_number() OVER ("
+        "    PARTITION BY company_id, enrichment_source ORDER BY chain_seq, created_at, id"
+        "  ) AS position FROM enrichment_snapshots"
+        ") chains WHERE s.id = chains.id AND chains.position = 1 AND s.snapshot_type = 'delta'"
+    )
+    # Snapshots of merged duplicates come first, one whole chain per company, and
+    # the kept company's chain last; within a chain the existing order is kept
+    # (rows predating chain_seq all have 0 and fall back to created_at)
+    op.execute(
+        "UPDATE enrichment_snapshots s SET chain_seq = ordered.seq FROM ("
+        "  SELECT e.id, row_number() OVER ("
+        "    PARTITION BY COALESCE(d.keep_id, e.company_id), e.enrichment_source "
+        "    ORDER BY d.id IS NULL, e.company_id, e.chain_seq, e.created_at, e.id"
+        "  ) - 1 AS seq "
+        "  FROM enrichment_snapshots e "
+        "  LEFT JOIN company_url_duplicates d ON d.id = e.company_id"
+        ") ordered WHERE s.id = ordered.id AND s.chain_seq <> ordered.seq"
+    )
+
+
+def _merge_duplicate_companies() -> None:
+    """Move rows of duplicate companies to the kept company and delete the duplicates"""
+    for table in COMPANY_CHILD_TABLES:
+        op.execute(
+            f"UPDATE {table} t SET company_id = d.keep_id "
+            "FROM company_url_duplicates d WHERE t.company_id = d.id"
+        )
+    op.execute(
+        "UPDATE companies c SET canonical_company_id = d.keep_id "
+        "FROM company_url_duplicates d WHERE c.canonical_company_id = d.id"
+    )
+    op.execute("DELETE FROM companies c USING company_url_duplicates d WHERE c.id = d.id")
+
+
+def upgrade() -> None:
+    for table, column, definition in NEW_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {definition}")
+
+    _find_duplicate_companies()
+    _number_snapshot_chains()
+    _merge_duplicate_companies()
+
+    for name, table, columns in NEW_INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_companies_google_business_url "
+        "ON companies (google_business_url)"
+    )
+
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS scheduled_job_runs ("
+        "id UUID PRIMARY KEY, "
+        "job_id VARCHAR NOT NULL, "
+        "instance_id VARCHAR NOT NULL, "
+        "status VARCHAR NOT NULL, "
+        "started_at TIMESTAMP WITHOUT TIME ZONE NOT NULL, "
+        "finished_at TIMESTAMP WITHOUT TIME ZONE, "
+        "duration_seconds DOUBLE PRECISION, "
+        "error TEXT, "
+        "created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_scheduled_job_runs_job_started "
+        "ON scheduled_job_runs (job_id, started_at)"
+    )
+
+def downgrade() -> None:
+    # Merged duplicate companies are not restored
+    op.execute("DROP TABLE IF EXISTS scheduled_job_runs")
+    op.execute("DROP INDEX IF EXISTS ux_companies_google_business_url")
+    for name, _, _ in reversed(NEW_INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    for table, column, _ in reversed(NEW_COLUMNS):
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS {column}")
@@ -3,8 +3,9 @@
 from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
 
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_user, get_current_user_remote, security, token_cache
 from app.auth.schemas import (
     RefreshTokenRequest,
     TokenResponse,
@@ -13,6 +14,7 @@ from app.auth.schemas import (
     UserSignup,
 )
 from app.auth.service import AuthService
+from app.auth.tokens import unverified_expiry
 
 router = APIRouter()
 
@@ -61,18 +63,20 @@ async def login(login_data: UserLogin) -> TokenResponse:
 
 
 @router.post("/logout")
-async def logout(current_user: dict = Depends(get_current_user)) -> Dict[str, str]:
+async def logout(
+    current_user: dict = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> Dict[str, str]:
     """
     Logout current user
 
-    Invalidates the current session
+    Invalidates the current session; the token is refused from then on
     """
+    token_cache.invalidate(credentials.credentials, unverified_expiry(credentials.credentials))
     auth_service = AuthService()
-    # Extract token from Authorization header if available
-    # Note: Supabase client handles session internally
     try:
         # Attempt logout - Supabase handles session cleanup
-        await auth_service.logout("")
+        await auth_service.logout(credentials.credentials)
         return {"message": "Logged out successfully"}
     except Exception:
         # Even if logout fails, return success to client
@@ -99,7 +103,7 @@ async def refresh_token(refresh_data: RefreshTokenRequest) -> TokenResponse:
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_remote),
 ) -> UserResponse:
     """
     Get current user profile
@@ -1,5 +1,6 @@
 """Company API endpoints"""
 
+import asyncio
 from typing import List, Optional
 from uuid import UUID
 
@@ -9,10 +10,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth.dependencies import get_current_user
 from app.database import get_db
 from app.schemas.company import CompanyResponse, CompanyUpdate
+from app.schemas.enrichment import EnrichmentJobResponse
 from app.services.company_service import CompanyService
+from app.services.entity_resolution_service import EntityResolutionService
+from app.services.job_tracker import job_tracker
 
 router = APIRouter()
 
+# Keep references to running background jobs so they aren't garbage collected
+_background_tasks: set = set()
+
 
 @router.get("", response_model=List[CompanyResponse])
 async def list_companies(
@@ -38,6 +45,20 @@ async def list_companies(
     )
 
 
+@router.get("/by-phone", response_model=List[CompanyResponse])
+async def find_companies_by_phone(
+    phone: str = Query(..., min_length=1),
+    limit: int = Query(100, le=1000),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Find companies in any zone by primary or dispatch phone number"""
+    try:
+        return await CompanyService.find_companies_by_phone(db, phone, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/{company_id}", response_model=CompanyResponse)
 async def get_company(
     company_id: UUID,
@@ -74,3 +95,33 @@ async def bulk_import_companies(
 ):
     """Bulk import companies"""
     return await CompanyService.bulk_import_companies(db, companies_data, zone_id)
+
+
+@router.post("/resolve-duplicates", response_model=EnrichmentJobResponse, status_code=202)
+async def resolve_duplicates(
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Recluster duplicate listings across all zones in one batch
+
+    Runs in the background; poll GET /resolve-duplicates/{job_id} for the
+    result.
+    """
+    job_id = job_tracker.create('duplicate_resolution', total=1)
+    task = asyncio.create_task(EntityResolutionService.run_resolution_job(job_id))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+    return job_tracker.get(job_id)
+
+
+@router.get("/resolve-duplicates/{job_id}", response_model=EnrichmentJobResponse)
+async def get_resolve_duplicates_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user),
+):
+    """Get progress and result of a duplicate resolution job"""
+    job = job_tracker.get(job_id)
+    if not job or job['kind'] != 'duplicate_resolution':
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -9,8 +9,9 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_admin_user
-from app.database import get_db
+from app.database import get_db, pool_metrics
 from app.services.env_service import EnvService
+from app.services.job_run_service import JobRunService
 
 router = APIRouter()
 
@@ -117,3 +118,31 @@ async def delete_env_var(
     success = await EnvService.delete_env_var(db, key, environment)
     if not success:
         raise HTTPException(status_code=404, detail="Environment variable not found")
+
+
+@router.get("/db-pool")
+async def get_db_pool_metrics(
+    current_user: dict = Depends(get_current_admin_user),
+) -> dict:
+    """
+    Database connection pool metrics (admin only)
+
+    Checkouts, new connections, overflow use and pool exhaustion since startup,
+    for sizing pool_size/max_overflow against the number of workers
+    """
+    return pool_metrics.snapshot()
+
+
+@router.get("/jobs")
+async def get_scheduled_job_stats(
+    since_days: int = Query(7, ge=1, le=90),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_admin_user),
+) -> List[dict]:
+    """
+    Scheduled job run counts and durations (admin only)
+
+    Runs skipped because another instance held the job lock are counted
+    separately; a steady stream of skips means jobs overlap their schedule
+    """
+    return await JobRunService.get_job_stats(db, since_days=since_days)
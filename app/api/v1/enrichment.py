@@ -1,17 +1,27 @@
 """Enrichment API endpoints"""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from typing import Optional
 from app.database import get_db
-from app.schemas.enrichment import EnrichmentSnapshotResponse
+from app.schemas.enrichment import (
+    EnrichmentSnapshotResponse,
+    BatchEnrichmentRequest,
+    EnrichmentJobResponse,
+)
 from app.services.enrichment_service import EnrichmentService
 from app.services.crawl_service import CrawlService
-from app.models.enrichment import EnrichmentSnapshot
+from app.services.lead_scoring_service import LeadScoringService
+from app.services.job_tracker import job_tracker
+from app.services.snapshot_service import SnapshotService
 from app.auth.dependencies import get_current_user
-from sqlalchemy import select
+import asyncio
 
 router = APIRouter()
 
+# Keep references to running background jobs so they aren't garbage collected
+_background_tasks: set = set()
+
 
 @router.post("/company/{company_id}")
 async def enrich_company(
@@ -51,18 +61,60 @@ async def bulk_enrichment(
         await crawl_service.close()
 
 
+@router.post("/batch", response_model=EnrichmentJobResponse, status_code=202)
+async def batch_enrichment(
+    request: BatchEnrichmentRequest,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Enrich many companies in one call
+    
+    Targets are selected by ID list and/or filter. Enrichment runs in the
+    background; poll GET /jobs/{job_id} for progress.
+    """
+    enrichment_service = EnrichmentService()
+    companies = await enrichment_service.load_enrichment_targets(
+        db,
+        company_ids=request.company_ids,
+        zone_id=request.zone_id,
+        only_with_website=request.only_with_website,
+        stale_days=request.stale_days,
+        limit=request.limit
+    )
+    if not companies:
+        raise HTTPException(status_code=404, detail="No companies matched")
+    
+    job_id = job_tracker.create('enrichment', total=len(companies))
+    task = asyncio.create_task(
+        enrichment_service.run_enrichment_job(job_id, [c.id for c in companies])
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    
+    return job_tracker.get(job_id)
+
+
+@router.get("/jobs/{job_id}", response_model=EnrichmentJobResponse)
+async def get_enrichment_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Get progress of a batch enrichment job"""
+    job = job_tracker.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
 @router.get("/snapshots/{company_id}", response_model=list[EnrichmentSnapshotResponse])
 async def get_enrichment_snapshots(
     company_id: UUID,
     current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get enrichment history for a company"""
-    result = await db.execute(
-        select(EnrichmentSnapshot).where(EnrichmentSnapshot.company_id == company_id)
-    )
-    snapshots = result.scalars().all()
-    return snapshots
+    """Get enrichment history for a company, with delta snapshots rebuilt to full state"""
+    return await SnapshotService.get_history(db, company_id)
 
 
 @router.post("/scrape-website/{company_id}")
@@ -102,3 +154,16 @@ async def scrape_websites_for_zone(
     finally:
         await crawl_service.close()
 
+
+
+@router.post("/lead-scores")
+async def rescore_leads(
+    zone_id: Optional[UUID] = Query(None, description="Optional zone filter"),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Recompute lead scores for a zone or all companies in one batch"""
+    try:
+        return await LeadScoringService.rescore_companies(db, zone_id=zone_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -6,6 +6,8 @@ from uuid import UUID
 from app.database import get_db
 from app.services.eqho_service import EqhoService
 from app.services.company_service import CompanyService
+from app.services.outreach_service import OutreachService
+from app.schemas.outreach import EqhoLeadPushRequest
 from app.auth.dependencies import get_current_user
 from app.config import settings
 
@@ -31,40 +33,62 @@ async def upload_leads_to_campaign(
     if not settings.eqho_api_token:
         raise HTTPException(status_code=400, detail="Eqho API token not configured")
     
-    eqho_service = EqhoService()
-    
-    # Get companies
-    companies = []
-    for company_id in company_ids:
-        company = await CompanyService.get_company(db, company_id)
-        if not company:
-            continue
-        
-        companies.append({
-            'first_name': company.name.split()[0] if company.name else 'Business',
-            'last_name': ' '.join(company.name.split()[1:]) if company.name and len(company.name.split()) > 1 else '',
-            'phone': company.phone_primary,
-            'email': company.email,
-            'custom_fields': {
-                'company_name': company.name,
-                'address_city': company.address_city,
-                'address_state': company.address_state,
-                'zone_id': str(company.zone_id) if company.zone_id else None,
-            }
-        })
+    service = OutreachService()
+    try:
+        result = await service.push_campaign_leads(
+            db,
+            campaign_id,
+            company_ids=company_ids,
+            list_id=list_id
+        )
+    finally:
+        await service.eqho_service.close()
     
-    if not companies:
+    if not result['leads_uploaded']:
         raise HTTPException(status_code=404, detail="No valid companies found")
     
-    # Upload to Eqho
-    result = await eqho_service.upload_leads_to_campaign(
-        campaign_id=campaign_id,
-        leads=companies,
-        list_id=list_id
-    )
+    # Companies without a phone, duplicate listings and unknown IDs
+    return {
+        'list_id': result['list_id'],
+        'campaign_id': campaign_id,
+        'leads_uploaded': result['leads_uploaded'],
+        'leads_skipped': len(result['skipped_company_ids']),
+        'skipped_company_ids': result['skipped_company_ids']
+    }
+
+
+@router.post("/campaign/{campaign_id}/push-leads")
+async def push_campaign_leads(
+    campaign_id: str,
+    request: EqhoLeadPushRequest,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Bulk upload every company matching a filter to an Eqho campaign
     
-    await eqho_service.close()
-    return result
+    Leads go to the campaign's lead list in large batches; optionally triggers
+    a call per lead.
+    """
+    if not settings.eqho_api_token:
+        raise HTTPException(status_code=400, detail="Eqho API token not configured")
+    
+    service = OutreachService()
+    try:
+        result = await service.push_campaign_leads(
+            db,
+            campaign_id,
+            zone_id=request.zone_id,
+            has_impound_service=request.has_impound_service,
+            min_lead_score=request.min_lead_score,
+            company_ids=request.company_ids,
+            list_id=request.list_id,
+            trigger_calls=request.trigger_calls
+        )
+    finally:
+        await service.eqho_service.close()
+    
+    return {'campaign_id': campaign_id, **result}
 
 
 @router.post("/trigger-call")
@@ -87,28 +111,16 @@ async def trigger_call(
     
     eqho_service = EqhoService()
     
-    # Prepare lead
-    lead_data = {
-        'first_name': company.name.split()[0] if company.name else 'Business',
-        'last_name': ' '.join(company.name.split()[1:]) if company.name and len(company.name.split()) > 1 else '',
-        'phone': company.phone_primary,
-        'email': company.email,
-        'custom_fields': {
-            'company_name': company.name,
-            'address_city': company.address_city,
-            'address_state': company.address_state,
-        }
-    }
-    
-    # Upload and trigger call
+    # Upload to the campaign's lead list and trigger call
     upload_result = await eqho_service.upload_leads_to_campaign(
         campaign_id=campaign_id,
-        leads=[lead_data]
+        leads=[EqhoService.build_lead(company)]
     )
+    leads = upload_result['upload_result'].get('leads') or [{}]
     
     call_result = await eqho_service.trigger_call_now(
         campaign_id=campaign_id,
-        lead_id=upload_result.get('list_id')
+        lead_id=leads[0].get('id')
     )
     
     await eqho_service.close()
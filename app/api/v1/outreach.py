@@ -135,17 +135,11 @@ async def resume_assignment(
     db: AsyncSession = Depends(get_db)
 ):
     """Resume an outreach assignment"""
-    from app.models.outreach import OutreachAssignment
-    
-    result = await db.execute(
-        select(OutreachAssignment).where(OutreachAssignment.id == assignment_id)
-    )
-    assignment = result.scalar_one_or_none()
+    service = OutreachService()
+    assignment = await service.resume_assignment(db, assignment_id)
     
     if not assignment:
         raise HTTPException(status_code=404, detail="Assignment not found")
     
-    assignment.status = 'active'
-    await db.commit()
     return {"status": "active"}
 
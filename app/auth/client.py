@@ -1,34 +1,142 @@
 """Supabase Auth client initialization"""
-from supabase import create_client, Client
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, lru_cache
 from app.config import settings
-from typing import Optional
+from typing import Optional, Callable, Any, TYPE_CHECKING
+import asyncio
 
-_supabase_client: Optional[Client] = None
+# The supabase package is slow to import, so it's loaded when the first
+# client is built rather than when the API starts
+if TYPE_CHECKING:
+    from supabase import Client
+    from gotrue.http_clients import SyncClient
 
+_supabase_client: Optional["Client"] = None
+_supabase_anon_client: Optional["Client"] = None
+_shared_http_client: Optional["SyncClient"] = None
+_auth_executor: Optional[ThreadPoolExecutor] = None
 
-def get_supabase_client() -> Client:
+
+def get_shared_http_client() -> "SyncClient":
+    """HTTP connection pool shared by every Supabase client's auth calls"""
+    global _shared_http_client
+
+    if _shared_http_client is None:
+        from gotrue.http_clients import SyncClient
+        _shared_http_client = SyncClient(follow_redirects=True, http2=True)
+
+    return _shared_http_client
+
+
+@lru_cache(maxsize=None)
+def pooled_client_class() -> type:
+    """Supabase ``Client`` subclass whose auth API uses the shared connection pool"""
+    from supabase import Client
+    from supabase.lib.client_options import ClientOptions
+    from supabase._sync.auth_client import SyncSupabaseAuthClient
+
+    class PooledClient(Client):
+        """
+        Supabase client whose auth API uses the shared connection pool
+
+        GoTrue sends the API key and bearer token as per-request headers, so one
+        pool can safely serve both the service-role and anon clients.
+        """
+
+        @staticmethod
+        def _init_supabase_auth_client(
+            auth_url: str,
+            client_options: ClientOptions,
+        ) -> SyncSupabaseAuthClient:
+            return SyncSupabaseAuthClient(
+                url=auth_url,
+                auto_refresh_token=client_options.auto_refresh_token,
+                persist_session=client_options.persist_session,
+                storage=client_options.storage,
+                headers=client_options.headers,
+                flow_type=client_options.flow_type,
+                http_client=get_shared_http_client(),
+            )
+
+    return PooledClient
+
+
+def _create_pooled_client(key: str) -> "Client":
+    from supabase.lib.client_options import ClientOptions
+
+    # Fresh options per client: the library default instance is shared, and
+    # each client writes its own Authorization header into it. Server-side
+    # clients are shared across requests, so they must not hold or refresh
+    # a user session of their own.
+    options = ClientOptions(auto_refresh_token=False, persist_session=False)
+    return pooled_client_class().create(settings.supabase_url, key, options)
+
+
+def get_supabase_client() -> "Client":
     """Get or create Supabase client instance"""
     global _supabase_client
-    
+
     if _supabase_client is None:
         if not settings.supabase_url or not settings.supabase_service_role_key:
             raise ValueError("Supabase URL and service role key must be configured")
-        
-        _supabase_client = create_client(
-            settings.supabase_url,
-            settings.supabase_service_role_key
-        )
-    
+
+        _supabase_client = _create_pooled_client(settings.supabase_service_role_key)
+
     return _supabase_client
 
 
-def get_supabase_anon_client() -> Client:
-    """Get Supabase client with anon key (for client-side operations)"""
-    if not settings.supabase_url or not settings.supabase_key:
-        raise ValueError("Supabase URL and anon key must be configured")
-    
-    return create_client(
-        settings.supabase_url,
-        settings.supabase_key
-    )
+def get_supabase_anon_client() -> "Client":
+    """Get or create Supabase client with anon key (for client-side operations)"""
+    global _supabase_anon_client
+
+    if _supabase_anon_client is None:
+        if not settings.supabase_url or not settings.supabase_key:
+            raise ValueError("Supabase URL and anon key must be configured")
+
+        _supabase_anon_client = _create_pooled_client(settings.supabase_key)
+
+    return _supabase_anon_client
+
+
+def get_auth_executor() -> ThreadPoolExecutor:
+    """Bounded thread pool for blocking Supabase Auth calls"""
+    global _auth_executor
+
+    if _auth_executor is None:
+        _auth_executor = ThreadPoolExecutor(
+            max_workers=settings.auth_thread_pool_size,
+            thread_name_prefix="supabase-auth"
+        )
+
+    return _auth_executor
+
+
+async def run_auth_call(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking Supabase client call without stalling the event loop
+
+    The Supabase client is synchronous, so each call is a full network round
+    trip; running it in the auth pool lets other requests proceed meanwhile.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_auth_executor(), partial(func, *args, **kwargs))
+
+
+def shutdown_auth_executor() -> None:
+    """Stop the auth thread pool (app shutdown)"""
+    global _auth_executor
+
+    if _auth_executor is not None:
+        _auth_executor.shutdown(wait=False)
+    _auth_executor = None
+
+
+def reset_supabase_clients() -> None:
+    """Drop cached clients and the shared pool (settings changes, tests)"""
+    global _supabase_client, _supabase_anon_client, _shared_http_client
 
+    if _shared_http_client is not None:
+        _shared_http_client.close()
+    _supabase_client = None
+    _supabase_anon_client = None
+    _shared_http_client = None
@@ -1,13 +1,85 @@
 """FastAPI dependencies for authentication"""
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
+from typing import Optional, Dict, Any
 from app.auth.service import AuthService
+from app.auth.tokens import (
+    TokenCache,
+    UnsupportedTokenError,
+    verify_access_token,
+    user_from_claims,
+    unverified_expiry,
+)
 from app.config import settings
 
 
 security = HTTPBearer()
 
+# Validated tokens, so repeat requests skip verification and the Supabase round trip
+token_cache = TokenCache(
+    ttl=settings.auth_token_cache_ttl,
+    max_size=settings.auth_token_cache_size
+)
+
+
+def _as_user_dict(user_data: Any) -> Dict[str, Any]:
+    """Normalize a Supabase get_user response to the ``{"user": {...}}`` shape"""
+    if isinstance(user_data, dict):
+        return user_data
+    user = getattr(user_data, "user", user_data)
+    if hasattr(user, "model_dump"):
+        user = user.model_dump(mode="json")
+    return {"user": user}
+
+
+async def validate_access_token(access_token: str) -> Dict[str, Any]:
+    """
+    Validate a bearer token, using the token cache and local verification
+    
+    HS256 tokens are verified locally with ``supabase_jwt_secret``. Supabase
+    Auth is only called on a cache miss when the token can't be verified
+    locally or ``supabase_auth_remote_validation`` is enabled.
+    
+    Raises:
+        ValueError: If the token was revoked or local verification rejects it
+        HTTPException: If Supabase Auth rejects the token
+    """
+    if token_cache.is_revoked(access_token):
+        raise ValueError("Token has been revoked")
+    
+    cached = token_cache.get(access_token)
+    if cached is not None:
+        return cached
+    
+    user_data = None
+    token_expires_at = unverified_expiry(access_token)
+    
+    if settings.supabase_jwt_secret:
+        try:
+            claims = verify_access_token(access_token, settings.supabase_jwt_secret)
+        except UnsupportedTokenError:
+            claims = None
+        if claims is not None and not settings.supabase_auth_remote_validation:
+            user_data = user_from_claims(claims)
+    
+    if user_data is None:
+        return await validate_access_token_remote(access_token)
+    
+    token_cache.set(access_token, user_data, token_expires_at)
+    return user_data
+
+
+async def validate_access_token_remote(access_token: str) -> Dict[str, Any]:
+    """Look a token's user up in Supabase Auth and cache the answer for the token"""
+    auth_service = AuthService()
+    user_data = _as_user_dict(await auth_service.get_user(access_token))
+    token_cache.set(access_token, user_data, unverified_expiry(access_token))
+    return user_data
+
+
+def _email_confirmed(user: Dict[str, Any]) -> bool:
+    return bool(user.get("email_confirmed_at") or user.get("email_verified"))
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
@@ -24,12 +96,30 @@ async def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    auth_service = AuthService()
+    try:
+        return await validate_access_token(credentials.credentials)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Could not validate credentials: {str(e)}",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+async def get_current_user_remote(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> dict:
+    """
+    Dependency to get the full Supabase Auth profile for the current user
     
+    Always asks Supabase Auth, for endpoints that need fields access tokens
+    don't carry (e.g. created_at).
+    """
     try:
-        access_token = credentials.credentials
-        user_data = await auth_service.get_user(access_token)
-        return user_data
+        auth_service = AuthService()
+        return _as_user_dict(await auth_service.get_user(credentials.credentials))
     except HTTPException:
         raise
     except Exception as e:
@@ -41,13 +131,15 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> dict:
     """
     Dependency to get current active user
     
     Args:
         current_user: Current user from get_current_user
+        credentials: HTTP Bearer token credentials
         
     Returns:
         Active user dictionary
@@ -56,11 +148,25 @@ async def get_current_active_user(
         HTTPException: If user is not active
     """
     # Check if user is active (Supabase Auth doesn't have is_active by default,
-    # but we can check user metadata or email confirmation status)
+    # but we can check the email confirmation status)
     user = current_user.get("user", {})
     
     # Check email confirmation if required
-    if not user.get("email_confirmed_at") and settings.environment == "production":
+    email_confirmed = _email_confirmed(user)
+    if not email_confirmed and settings.environment == "production" and "claims" in current_user:
+        # Locally verified tokens rarely carry a server-set confirmation claim
+        try:
+            current_user = await validate_access_token_remote(credentials.credentials)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=f"Could not validate credentials: {str(e)}",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        email_confirmed = _email_confirmed(current_user.get("user", {}))
+    if not email_confirmed and settings.environment == "production":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Email not confirmed"
@@ -115,10 +221,7 @@ async def get_optional_user(
         return None
     
     try:
-        auth_service = AuthService()
-        access_token = credentials.credentials
-        user_data = await auth_service.get_user(access_token)
-        return user_data
+        return await validate_access_token(credentials.credentials)
     except Exception:
         return None
 
@@ -1,24 +1,34 @@
 """Authentication service layer"""
-from supabase import Client
-from typing import Optional, Dict, Any
-from app.auth.client import get_supabase_client, get_supabase_anon_client
+from typing import Optional, Dict, Any, TYPE_CHECKING
+from app.auth.client import get_supabase_client, get_supabase_anon_client, run_auth_call
 from app.auth.schemas import UserSignup, UserLogin, TokenResponse
 from app.config import settings
 from fastapi import HTTPException, status
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 
 class AuthService:
     """Service for authentication operations"""
     
-    def __init__(self):
-        self.client: Client = get_supabase_client()
-        self.anon_client: Client = get_supabase_anon_client()
+    # Clients are process-wide singletons, looked up only when a method needs them
+    
+    @property
+    def client(self) -> "Client":
+        """Service-role Supabase client"""
+        return get_supabase_client()
+    
+    @property
+    def anon_client(self) -> "Client":
+        """Anon-key Supabase client"""
+        return get_supabase_anon_client()
     
     async def signup(self, signup_data: UserSignup) -> Dict[str, Any]:
         """Sign up a new user"""
         try:
             # Create user in Supabase Auth
-            response = self.client.auth.sign_up({
+            response = await run_auth_call(self.client.auth.sign_up, {
                 "email": signup_data.email,
                 "password": signup_data.password,
                 "options": {
@@ -47,7 +57,7 @@ class AuthService:
     async def login(self, login_data: UserLogin) -> Dict[str, Any]:
         """Login user with email and password"""
         try:
-            response = self.client.auth.sign_in_with_password({
+            response = await run_auth_call(self.client.auth.sign_in_with_password, {
                 "email": login_data.email,
                 "password": login_data.password
             })
@@ -71,9 +81,8 @@ class AuthService:
     async def logout(self, access_token: str) -> None:
         """Logout user"""
         try:
-            # Set the session for the client
-            self.client.auth.set_session(access_token, "")
-            self.client.auth.sign_out()
+            # Revoke the user's refresh tokens without touching the shared client's session
+            await run_auth_call(self.client.auth.admin.sign_out, access_token)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -83,7 +92,7 @@ class AuthService:
     async def refresh_token(self, refresh_token: str) -> Dict[str, Any]:
         """Refresh access token"""
         try:
-            response = self.client.auth.refresh_session(refresh_token)
+            response = await run_auth_call(self.client.auth.refresh_session, refresh_token)
             
             if not response.session:
                 raise HTTPException(
@@ -103,9 +112,8 @@ class AuthService:
     async def get_user(self, access_token: str) -> Dict[str, Any]:
         """Get user from access token"""
         try:
-            # Set the session to validate the token
-            self.client.auth.set_session(access_token, "")
-            user = self.client.auth.get_user(access_token)
+            # Validates the token against Supabase Auth
+            user = await run_auth_call(self.client.auth.get_user, access_token)
             
             if not user:
                 raise HTTPException(
@@ -0,0 +1,191 @@
+"""Local access token verification and validated-token cache"""
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+# Clock skew tolerated when checking exp/nbf
+JWT_LEEWAY_SECONDS = 30
+
+# Audience Supabase Auth puts on user access tokens
+SUPABASE_TOKEN_AUDIENCE = "authenticated"
+
+# Claims a locally verified token must carry
+REQUIRED_TOKEN_CLAIMS = ("exp", "sub")
+
+
+class UnsupportedTokenError(ValueError):
+    """Token is well-formed but can't be verified locally (e.g. asymmetric alg)"""
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def verify_access_token(
+    token: str,
+    secret: str,
+    audience: Optional[str] = SUPABASE_TOKEN_AUDIENCE,
+    leeway: int = JWT_LEEWAY_SECONDS
+) -> Dict[str, Any]:
+    """
+    Verify an HS256 Supabase access token and return its claims
+
+    Raises:
+        UnsupportedTokenError: If the token uses an algorithm other than HS256
+        ValueError: If the token is malformed, forged, expired, for another
+            audience or missing ``exp`` or ``sub``
+    """
+    try:
+        header_segment, payload_segment, signature_segment = token.split(".")
+        header = json.loads(_b64decode(header_segment))
+        claims = json.loads(_b64decode(payload_segment))
+        signature = _b64decode(signature_segment)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Malformed token: {e}")
+
+    if header.get("alg") != "HS256":
+        raise UnsupportedTokenError(f"Unsupported token algorithm: {header.get('alg')}")
+
+    expected = hmac.new(
+        secret.encode(),
+        f"{header_segment}.{payload_segment}".encode(),
+        hashlib.sha256
+    ).digest()
+    if not hmac.compare_digest(signature, expected):
+        raise ValueError("Invalid token signature")
+
+    # Tokens skip the Supabase round trip and are cached until exp, so both are required
+    for claim in REQUIRED_TOKEN_CLAIMS:
+        if claims.get(claim) is None:
+            raise ValueError(f"Token is missing required claim: {claim}")
+    if not isinstance(claims["exp"], (int, float)) or isinstance(claims["exp"], bool):
+        raise ValueError("Token has an invalid exp claim")
+
+    now = time.time()
+    if now > claims["exp"] + leeway:
+        raise ValueError("Token has expired")
+    if "nbf" in claims and now < claims["nbf"] - leeway:
+        raise ValueError("Token is not yet valid")
+
+    if audience:
+        token_audience = claims.get("aud")
+        audiences = token_audience if isinstance(token_audience, list) else [token_audience]
+        if audience not in audiences:
+            raise ValueError("Token audience mismatch")
+
+    return claims
+
+
+def user_from_claims(claims: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the ``{"user": {...}}`` shape returned by get_current_user from token claims"""
+    app_metadata = claims.get("app_metadata") or {}
+    return {
+        "user": {
+            "id": claims.get("sub"),
+            "aud": claims.get("aud"),
+            "role": claims.get("role"),
+            "email": claims.get("email"),
+            "phone": claims.get("phone"),
+            "app_metadata": app_metadata,
+            "user_metadata": claims.get("user_metadata") or {},
+            # Only server-set claims count as confirmation (users can write
+            # user_metadata). Access tokens usually carry neither, so
+            # get_current_active_user asks Supabase Auth when they're missing
+            "email_confirmed_at": claims.get("email_confirmed_at") or app_metadata.get("email_confirmed_at"),
+            "email_verified": bool(app_metadata.get("email_verified")),
+        },
+        "claims": claims,
+    }
+
+
+def unverified_expiry(token: str) -> Optional[float]:
+    """Read ``exp`` from a token without verifying it (only used to bound cache TTL)"""
+    try:
+        claims = json.loads(_b64decode(token.split(".")[1]))
+        return float(claims["exp"])
+    except (ValueError, TypeError, KeyError, IndexError):
+        return None
+
+
+class TokenCache:
+    """
+    Short-lived LRU of validated tokens
+
+    Keys are SHA-256 hashes of the token so raw bearer tokens aren't held in
+    memory. Entries expire after the TTL or at the token's own ``exp``,
+    whichever comes first. Invalidated tokens are remembered as revoked
+    until their ``exp``, since local verification would accept them again.
+    """
+
+    def __init__(self, ttl: int = 60, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._revoked: "OrderedDict[str, float]" = OrderedDict()
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        """Cache key for a token"""
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Get the cached user for a token, if still fresh"""
+        key = self.token_key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, user_data = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return user_data
+
+    def set(
+        self,
+        token: str,
+        user_data: Dict[str, Any],
+        token_expires_at: Optional[float] = None
+    ) -> None:
+        """Cache a validated token"""
+        if self.ttl <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+
+        key = self.token_key(token)
+        self._entries[key] = (expires_at, user_data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, token: str, token_expires_at: Optional[float] = None) -> None:
+        """Drop a token and, given its expiry, refuse it until then (e.g. on logout)"""
+        key = self.token_key(token)
+        self._entries.pop(key, None)
+        if token_expires_at is not None and token_expires_at > time.time():
+            self._revoked[key] = token_expires_at
+            self._revoked.move_to_end(key)
+            while len(self._revoked) > self.max_size:
+                self._revoked.popitem(last=False)
+
+    def is_revoked(self, token: str) -> bool:
+        """Whether a token was invalidated and hasn't expired yet"""
+        key = self.token_key(token)
+        expires_at = self._revoked.get(key)
+        if expires_at is None:
+            return False
+        if time.time() >= expires_at:
+            del self._revoked[key]
+            return False
+        return True
+
+    def clear(self) -> None:
+        """Drop all cached and revoked tokens"""
+        self._entries.clear()
+        self._revoked.clear()
@@ -15,17 +15,33 @@ class Settings(BaseSettings):
     supabase_service_role_key: Optional[str] = None
     database_url: str = "sqlite+aiosqlite:///:memory:"
     
+    # Database engine pool (ignored for SQLite)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30  # Seconds to wait for a connection before erroring
+    db_pool_recycle: int = 1800  # Seconds; keep below server/pgbouncer idle timeouts
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100  # asyncpg prepared statements cached per connection
+    db_pgbouncer_mode: bool = False  # Transaction-mode pgbouncer: no prepared statement caching
+    db_echo: bool = False  # Log every SQL statement
+    
     # Supabase Auth
     supabase_auth_enabled: bool = True
     supabase_jwt_secret: Optional[str] = None  # JWT secret for token validation
     supabase_auth_url: Optional[str] = None  # Auth URL (usually {supabase_url}/auth/v1)
+    supabase_auth_remote_validation: bool = False  # Confirm every new token with Supabase Auth
+    auth_token_cache_ttl: int = 60  # Seconds a validated token is trusted without re-checking
+    auth_token_cache_size: int = 1024  # Validated tokens kept in memory
+    auth_thread_pool_size: int = 8  # Threads for blocking Supabase Auth calls
     
     # Environment variable management
     use_supabase_env_vars: bool = False  # Enable to fetch env vars from Supabase
     env_cache_ttl: int = 300  # Cache TTL in seconds for env vars
+    env_cache_notify: bool = False  # Use Postgres LISTEN/NOTIFY to invalidate caches across processes
     
     # Apify
     apify_token: str = ""
+    apify_archive_dir: Optional[str] = None  # Local raw dataset archive (e.g. data/apify_archive); unset = no archive
     
     # Eqho.ai Integration
     eqho_api_token: str = ""
@@ -39,12 +55,21 @@ class Settings(BaseSettings):
     sms_provider_api_key: Optional[str] = None
     phone_provider_api_key: Optional[str] = None
     outreach_webhook_url: Optional[str] = None
+    outreach_webhook_batch_size: int = 0  # >0 posts queued messages per channel as arrays of this size
+    outreach_call_cooldown_hours: int = 72  # Don't call a number (E.164) again within this window; 0 disables
     
     # Playwright Configuration
     playwright_headless: bool = True
     playwright_timeout: int = 30000
     website_scrape_concurrent: int = 5
     
+    # Enrichment snapshots
+    enrichment_snapshot_retention_days: int = 90  # Older snapshots are rolled up into one
+    
+    # Scheduler
+    scheduler_in_api: bool = True  # Run scheduled jobs inside the API; set False when running `python -m app.scheduler`
+    scheduler_leader_check_interval: int = 15  # Seconds between leader lock checks/attempts
+    
     # Application
     log_level: str = "INFO"
     environment: str = "development"
@@ -1,15 +1,141 @@
 """Database connection and session management"""
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from typing import Dict, Any
+from uuid import uuid4
 from app.config import settings
 
+
+def build_engine_options(database_url: str) -> Dict[str, Any]:
+    """
+    Engine keyword arguments for a database URL from the pool settings
+    
+    SQLite uses SQLAlchemy's default single-connection pool, so pool sizing
+    only applies to server databases. With ``db_pgbouncer_mode``, asyncpg's and
+    SQLAlchemy's prepared statement caches are disabled and statements get
+    unique names, since a transaction-mode pgbouncer may hand each transaction
+    a different server connection.
+    """
+    options: Dict[str, Any] = {
+        "echo": settings.db_echo,
+        "future": True,
+    }
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return options
+    
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    
+    if url.get_driver_name() == "asyncpg":
+        if settings.db_pgbouncer_mode:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        else:
+            options["connect_args"] = {
+                "statement_cache_size": settings.db_statement_cache_size,
+                "prepared_statement_cache_size": settings.db_statement_cache_size,
+            }
+    return options
+
+
+class PoolMetrics:
+    """
+    Counters for connection pool activity, fed by pool events
+    
+    ``overflow_checkouts`` counts checkouts beyond ``pool_size``;
+    ``exhausted_checkouts`` counts checkouts that took the last available
+    connection, after which further requests wait up to ``db_pool_timeout``.
+    """
+    
+    def __init__(self, engine: AsyncEngine):
+        self.pool = engine.sync_engine.pool
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.overflow_checkouts = 0
+        self.exhausted_checkouts = 0
+        self.peak_checked_out = 0
+        
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "checkout", self._on_checkout)
+        event.listen(sync_engine, "connect", self._on_connect)
+        event.listen(sync_engine, "invalidate", self._on_invalidate)
+    
+    def _capacity(self):
+        size = getattr(self.pool, "size", None)
+        max_overflow = getattr(self.pool, "_max_overflow", None)
+        if not callable(size) or max_overflow is None:
+            return None, None
+        return size(), max_overflow
+    
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+        checked_out = self.pool.checkedout() if hasattr(self.pool, "checkedout") else 0
+        self.peak_checked_out = max(self.peak_checked_out, checked_out)
+        
+        size, max_overflow = self._capacity()
+        if size is None:
+            return
+        if checked_out > size:
+            self.overflow_checkouts += 1
+        if max_overflow >= 0 and checked_out >= size + max_overflow:
+            self.exhausted_checkouts += 1
+    
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.connects += 1
+    
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.invalidations += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current pool state and counters
+        
+        Returns:
+            {
+                'pool': str, 'size': int | None, 'max_overflow': int | None,
+                'checked_out': int | None, 'checked_in': int | None, 'overflow': int | None,
+                'checkouts': int, 'connects': int, 'invalidations': int,
+                'overflow_checkouts': int, 'exhausted_checkouts': int, 'peak_checked_out': int
+            }
+        """
+        size, max_overflow = self._capacity()
+        pool = self.pool
+        return {
+            'pool': type(pool).__name__,
+            'size': size,
+            'max_overflow': max_overflow,
+            'checked_out': pool.checkedout() if hasattr(pool, "checkedout") else None,
+            'checked_in': pool.checkedin() if hasattr(pool, "checkedin") else None,
+            'overflow': pool.overflow() if hasattr(pool, "overflow") else None,
+            'checkouts': self.checkouts,
+            'connects': self.connects,
+            'invalidations': self.invalidations,
+            'overflow_checkouts': self.overflow_checkouts,
+            'exhausted_checkouts': self.exhausted_checkouts,
+            'peak_checked_out': self.peak_checked_out,
+        }
+
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
-    echo=settings.environment == "development",
-    future=True,
+    **build_engine_options(settings.database_url)
 )
 
+pool_metrics = PoolMetrics(engine)
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -30,4 +156,3 @@ async def get_db() -> AsyncSession:
             yield session
         finally:
             await session.close()
-
@@ -0,0 +1,246 @@
+"""Postgres advisory locks for scheduler leader election and job-level locking"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncConnection
+from typing import Callable, Optional, Set, Awaitable, Any
+from datetime import datetime
+from functools import wraps
+import asyncio
+import hashlib
+import os
+import socket
+import time
+
+from app import database
+from app.config import settings
+
+# Lock held by the one scheduler instance allowed to fire jobs
+SCHEDULER_LEADER_LOCK = "scheduler:leader"
+
+# Identifies this process in logs and job run history
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Keys held in this process when the database has no advisory locks (SQLite)
+_local_locks: Set[int] = set()
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit advisory lock key for a lock name"""
+    digest = hashlib.sha256(name.encode()).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+class AdvisoryLock:
+    """
+    Session-level ``pg_try_advisory_lock`` held on a dedicated connection
+
+    Postgres releases the lock when the holding connection ends, so a crashed
+    or partitioned holder can't keep it. The connection must be a real session
+    (direct or session-mode pgbouncer); transaction-mode pooling can't hold
+    session locks. Databases without advisory locks (SQLite in development and
+    tests) fall back to a process-local lock.
+    """
+
+    def __init__(self, engine: AsyncEngine, name: str):
+        self.engine = engine
+        self.name = name
+        self.key = advisory_lock_key(name)
+        self._connection: Optional[AsyncConnection] = None
+        self._held_locally = False
+
+    @property
+    def uses_postgres(self) -> bool:
+        return self.engine.dialect.name == "postgresql"
+
+    async def acquire(self) -> bool:
+        """Try to take the lock without waiting; True if this instance now holds it"""
+        if self.held:
+            return True
+
+        if not self.uses_postgres:
+            if self.key in _local_locks:
+                return False
+            _local_locks.add(self.key)
+            self._held_locally = True
+            return True
+
+        connection = await self.engine.connect()
+        try:
+            result = await connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}
+            )
+            acquired = bool(result.scalar())
+            # The lock is session-level; don't sit idle in a transaction while holding it
+            await connection.commit()
+        except Exception:
+            await connection.close()
+            raise
+
+        if not acquired:
+            await connection.close()
+            return False
+        self._connection = connection
+        return True
+
+    @property
+    def held(self) -> bool:
+        return self._held_locally or self._connection is not None
+
+    async def check(self) -> bool:
+        """
+        Confirm the lock is still held
+
+        A dead holding connection means Postgres has already released the lock
+        and another instance may have taken it.
+        """
+        if self._held_locally:
+            return True
+        if self._connection is None:
+            return False
+        try:
+            await self._connection.execute(text("SELECT 1"))
+            await self._connection.commit()
+            return True
+        except Exception:
+            await self._discard_connection()
+            return False
+
+    async def release(self) -> None:
+        """Release the lock if held"""
+        if self._held_locally:
+            _local_locks.discard(self.key)
+            self._held_locally = False
+            return
+        if self._connection is None:
+            return
+        try:
+            await self._connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": self.key}
+            )
+            await self._connection.commit()
+        except Exception as e:
+            # Closing the connection below releases it anyway
+            print(f"Error releasing advisory lock {self.name}: {e}")
+        await self._discard_connection()
+
+    async def _discard_connection(self) -> None:
+        connection, self._connection = self._connection, None
+        try:
+            await connection.close()
+        except Exception:
+            pass
+
+
+def locked_job(job_id: str) -> Callable[[Callable[[], Awaitable[Any]]], Callable[[], Awaitable[None]]]:
+    """
+    Run a scheduled job under its own advisory lock and record how long it took
+
+    If another instance is still running the job (a slow run overlapping the
+    next trigger, or a leadership handover), the run is skipped. Every run is
+    recorded in ``scheduled_job_runs`` with its status and duration.
+    """
+    def decorator(func: Callable[[], Awaitable[Any]]) -> Callable[[], Awaitable[None]]:
+        @wraps(func)
+        async def wrapper() -> None:
+            lock = AdvisoryLock(database.engine, f"job:{job_id}")
+            started_at = datetime.utcnow()
+            if not await lock.acquire():
+                print(f"Skipping {job_id}: already running on another instance")
+                await _record_run(job_id, 'skipped', started_at)
+                return
+
+            status, error = 'succeeded', None
+            started = time.monotonic()
+            try:
+                await func()
+            except Exception as e:
+                status, error = 'failed', str(e)
+                print(f"Error running {job_id}: {e}")
+            finally:
+                await lock.release()
+
+            duration = time.monotonic() - started
+            print(f"Finished {job_id} ({status}) in {duration:.1f}s")
+            await _record_run(job_id, status, started_at, datetime.utcnow(), error)
+
+        return wrapper
+    return decorator
+
+
+async def _record_run(
+    job_id: str,
+    status: str,
+    started_at: datetime,
+    finished_at: Optional[datetime] = None,
+    error: Optional[str] = None
+) -> None:
+    from app.services.job_run_service import JobRunService
+
+    # Metrics are best-effort: a failed write must not fail the job
+    try:
+        async with database.AsyncSessionLocal() as db:
+            await JobRunService.record_run(
+                db, job_id, INSTANCE_ID, status, started_at, finished_at, error
+            )
+    except Exception as e:
+        print(f"Error recording run of {job_id}: {e}")
+
+
+class SchedulerLeader:
+    """
+    Leader election for scheduler processes
+
+    Every scheduler instance runs this loop; the one holding the leader
+    advisory lock has its jobs resumed, the others stay paused and retry every
+    ``check_interval`` seconds. If the leader's lock connection dies it pauses
+    its jobs, and a standby takes over on its next attempt.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+        lock_name: str = SCHEDULER_LEADER_LOCK,
+        check_interval: Optional[float] = None
+    ):
+        self.lock = AdvisoryLock(engine, lock_name)
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.check_interval = (
+            check_interval if check_interval is not None
+            else settings.scheduler_leader_check_interval
+        )
+        self.is_leader = False
+
+    async def step(self) -> bool:
+        """Run one election round; returns whether this instance is leader"""
+        if not self.is_leader:
+            try:
+                acquired = await self.lock.acquire()
+            except Exception as e:
+                print(f"Error acquiring scheduler leadership: {e}")
+                acquired = False
+            if acquired:
+                self.is_leader = True
+                print(f"Scheduler leadership acquired by {INSTANCE_ID}")
+                self.on_elected()
+        elif not await self.lock.check():
+            self.is_leader = False
+            print(f"Scheduler leadership lost by {INSTANCE_ID}")
+            self.on_demoted()
+        return self.is_leader
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """Contend for leadership until ``stop_event`` is set"""
+        try:
+            while not stop_event.is_set():
+                await self.step()
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=self.check_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self.is_leader:
+                self.is_leader = False
+                self.on_demoted()
+            await self.lock.release()
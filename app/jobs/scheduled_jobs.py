@@ -3,9 +3,15 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from app.database import AsyncSessionLocal
+from app.services.company_service import CompanyService
 from app.services.crawl_service import CrawlService
+from app.services.entity_resolution_service import EntityResolutionService
 from app.services.enrichment_service import EnrichmentService
 from app.services.outreach_service import OutreachService
+from app.services.lead_scoring_service import LeadScoringService
+from app.services.snapshot_service import SnapshotService
+from app.config import settings
+from app.jobs.locks import locked_job
 from app.services.zone_service import ZoneService
 from app.models.zone import Zone
 from sqlalchemy import select
@@ -15,6 +21,7 @@ from datetime import datetime, timedelta
 scheduler = AsyncIOScheduler()
 
 
+@locked_job('daily_zone_crawl')
 async def daily_zone_crawl():
     """Crawl all active zones daily"""
     async with AsyncSessionLocal() as db:
@@ -34,6 +41,7 @@ async def daily_zone_crawl():
             await crawl_service.close()
 
 
+@locked_job('weekly_enrichment_refresh')
 async def weekly_enrichment_refresh():
     """Re-enrich companies older than 7 days"""
     async with AsyncSessionLocal() as db:
@@ -43,7 +51,8 @@ async def weekly_enrichment_refresh():
         cutoff_date = datetime.utcnow() - timedelta(days=7)
         result = await db.execute(
             select(Company).where(
-                Company.website_scraped_at < cutoff_date
+                (Company.website_scraped_at < cutoff_date) &
+                (Company.canonical_company_id == None)  # Duplicates share their canonical's data
             ).limit(100)  # Process in batches
         )
         companies = result.scalars().all()
@@ -60,6 +69,7 @@ async def weekly_enrichment_refresh():
             await enrichment_service.close()
 
 
+@locked_job('daily_website_scraping')
 async def daily_website_scraping():
     """Scrape websites for companies that haven't been scraped or are stale"""
     async with AsyncSessionLocal() as db:
@@ -73,7 +83,8 @@ async def daily_website_scraping():
                     (Company.website_scraped_at == None) |
                     (Company.website_scraped_at < cutoff_date)
                 ) &
-                (Company.website != None)
+                (Company.website != None) &
+                (Company.canonical_company_id == None)
             ).limit(50)  # Process in batches
         )
         companies = result.scalars().all()
@@ -90,6 +101,53 @@ async def daily_website_scraping():
             await enrichment_service.close()
 
 
+@locked_job('daily_company_key_backfill')
+async def daily_company_key_backfill():
+    """Fill normalized website domains and E.164 phones missing after the nightly crawl"""
+    async with AsyncSessionLocal() as db:
+        try:
+            updated = await CompanyService.backfill_derived_columns(db)
+            print(f"Backfilled company match keys: {updated} companies")
+        except Exception as e:
+            print(f"Error backfilling company match keys: {e}")
+
+
+@locked_job('daily_duplicate_resolution')
+async def daily_duplicate_resolution():
+    """Recluster duplicate listings once the match keys are backfilled"""
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await EntityResolutionService.resolve_duplicates(db)
+            print(f"Resolved duplicate listings: {result}")
+        except Exception as e:
+            print(f"Error resolving duplicate listings: {e}")
+
+
+@locked_job('daily_lead_scoring')
+async def daily_lead_scoring():
+    """Rescore every company after the nightly crawl and scrape jobs"""
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await LeadScoringService.rescore_companies(db)
+            print(f"Rescored leads: {result}")
+        except Exception as e:
+            print(f"Error rescoring leads: {e}")
+
+
+@locked_job('weekly_snapshot_compaction')
+async def weekly_snapshot_compaction():
+    """Roll enrichment snapshots older than the retention window into one row"""
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await SnapshotService.compact_snapshots(
+                db, older_than_days=settings.enrichment_snapshot_retention_days
+            )
+            print(f"Compacted enrichment snapshots: {result}")
+        except Exception as e:
+            print(f"Error compacting enrichment snapshots: {e}")
+
+
+@locked_job('process_outreach_queue')
 async def process_outreach_queue():
     """Process pending outreach every 15 minutes"""
     async with AsyncSessionLocal() as db:
@@ -101,38 +159,99 @@ async def process_outreach_queue():
             print(f"Error processing outreach queue: {e}")
 
 
-def start_scheduler():
-    """Start the scheduler with all jobs"""
+def configure_jobs():
+    """Register all jobs on the scheduler"""
+    # One run per job at a time in this process; a trigger missed while the
+    # previous run was still going is folded into a single catch-up run
+    job_defaults = {'max_instances': 1, 'coalesce': True, 'replace_existing': True}
+    
     # Daily zone crawl at 2 AM
     scheduler.add_job(
         daily_zone_crawl,
         trigger=CronTrigger(hour=2, minute=0),
-        id='daily_zone_crawl'
+        id='daily_zone_crawl',
+        **job_defaults
     )
     
     # Weekly enrichment refresh on Sundays at 3 AM
     scheduler.add_job(
         weekly_enrichment_refresh,
         trigger=CronTrigger(day_of_week=6, hour=3, minute=0),
-        id='weekly_enrichment_refresh'
+        id='weekly_enrichment_refresh',
+        **job_defaults
     )
     
     # Daily website scraping at 4 AM
     scheduler.add_job(
         daily_website_scraping,
         trigger=CronTrigger(hour=4, minute=0),
-        id='daily_website_scraping'
+        id='daily_website_scraping',
+        **job_defaults
+    )
+    
+    # Daily match key backfill at 4:30 AM, after crawls
+    scheduler.add_job(
+        daily_company_key_backfill,
+        trigger=CronTrigger(hour=4, minute=30),
+        id='daily_company_key_backfill',
+        **job_defaults
+    )
+    
+    # Daily duplicate resolution at 4:45 AM, after the match key backfill
+    scheduler.add_job(
+        daily_duplicate_resolution,
+        trigger=CronTrigger(hour=4, minute=45),
+        id='daily_duplicate_resolution',
+        **job_defaults
+    )
+    
+    # Daily lead scoring at 5 AM, after crawls and website scraping
+    scheduler.add_job(
+        daily_lead_scoring,
+        trigger=CronTrigger(hour=5, minute=0),
+        id='daily_lead_scoring',
+        **job_defaults
+    )
+    
+    # Weekly snapshot compaction on Sundays at 6 AM
+    scheduler.add_job(
+        weekly_snapshot_compaction,
+        trigger=CronTrigger(day_of_week=6, hour=6, minute=0),
+        id='weekly_snapshot_compaction',
+        **job_defaults
     )
     
     # Process outreach queue every 15 minutes
     scheduler.add_job(
         process_outreach_queue,
         trigger=IntervalTrigger(minutes=15),
-        id='process_outreach_queue'
+        id='process_outreach_queue',
+        **job_defaults
     )
+
+
+def start_scheduler(paused: bool = False):
+    """
+    Start the scheduler with all jobs
     
-    scheduler.start()
-    print("Scheduler started")
+    With ``paused``, jobs are registered but don't fire until
+    ``resume_scheduler`` (used by standby instances awaiting leadership).
+    """
+    configure_jobs()
+    scheduler.start(paused=paused)
+    print("Scheduler started" + (" (paused)" if paused else ""))
+
+
+def resume_scheduler():
+    """Let scheduled jobs fire (this instance became leader)"""
+    scheduler.resume()
+    print("Scheduler resumed")
+
+
+def pause_scheduler():
+    """Stop firing scheduled jobs (this instance lost leadership)"""
+    scheduler.pause()
+    print("Scheduler paused")
 
 
 def stop_scheduler():
@@ -1,10 +1,9 @@
 """FastAPI application entry point"""
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.api.v1 import zones, companies, crawl, enrichment, outreach, eqho, auth, users, config, oidc, apify
-from app.jobs.scheduled_jobs import start_scheduler
-import atexit
 
 app = FastAPI(
     title="TowPilot Lead Scraper API",
@@ -52,19 +51,51 @@ app.include_router(config.router, prefix="/api/v1/config", tags=["configuration"
 # Apify endpoints (protected)
 app.include_router(apify.router, prefix="/api/v1/apify", tags=["apify"])
 
-# Start scheduler on app startup
+# Scheduled jobs run inside the API unless SCHEDULER_IN_API is turned off for a
+# dedicated scheduler process (python -m app.scheduler). Every worker and instance
+# starts the scheduler paused; only the one elected leader fires jobs.
+_scheduler_stop = None
+_scheduler_leader_task = None
+
+
 @app.on_event("startup")
 async def startup_event():
-    start_scheduler()
+    global _scheduler_stop, _scheduler_leader_task
+    if settings.scheduler_in_api:
+        from app.database import engine
+        from app.jobs.locks import SchedulerLeader
+        from app.jobs.scheduled_jobs import start_scheduler, resume_scheduler, pause_scheduler
+        start_scheduler(paused=True)
+        leader = SchedulerLeader(engine, on_elected=resume_scheduler, on_demoted=pause_scheduler)
+        _scheduler_stop = asyncio.Event()
+        _scheduler_leader_task = asyncio.create_task(leader.run(_scheduler_stop))
     
     # Load environment variables from Supabase if enabled
     if settings.use_supabase_env_vars:
         await settings.load_env_from_supabase_async()
+    
+    # Invalidate env config caches when other workers change config
+    if settings.env_cache_notify:
+        from app.database import engine
+        from app.services.env_service import env_change_listener
+        await env_change_listener.start(engine)
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    from app.jobs.scheduled_jobs import stop_scheduler
-    stop_scheduler()
+    global _scheduler_stop, _scheduler_leader_task
+    from app.services.outreach_service import OutreachService
+    from app.auth.client import shutdown_auth_executor
+    from app.services.env_service import env_change_listener
+    if _scheduler_leader_task is not None:
+        from app.jobs.scheduled_jobs import stop_scheduler
+        # Releases leadership so another instance can take over
+        _scheduler_stop.set()
+        await _scheduler_leader_task
+        _scheduler_stop = _scheduler_leader_task = None
+        stop_scheduler()
+    await env_change_listener.stop()
+    await OutreachService.close_http_client()
+    shutdown_auth_executor()
 
 
 @app.get("/")
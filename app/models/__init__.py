@@ -6,6 +6,7 @@ from app.models.outreach import OutreachHistory, OutreachSequence, OutreachAssig
 from app.models.user import User
 from app.models.environment_config import EnvironmentConfig
 from app.models.apify_run import ApifyRun
+from app.models.job_run import JobRun
 
 __all__ = [
     "Zone",
@@ -17,5 +18,6 @@ __all__ = [
     "User",
     "EnvironmentConfig",
     "ApifyRun",
+    "JobRun",
 ]
 
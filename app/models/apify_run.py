@@ -24,6 +24,9 @@ class ApifyRun(Base):
     processing_status = Column(String, nullable=True, default='pending')  # pending, processing, completed, failed
     error_message = Column(Text, nullable=True)
     
+    # Import checkpoint: dataset items committed so far; a restarted import resumes here
+    import_offset = Column(Integer, nullable=False, default=0)
+    
     # Timestamps
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,5 +1,5 @@
 """Company model"""
-from sqlalchemy import Column, String, Boolean, Integer, Float, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Boolean, Integer, Float, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -18,8 +18,11 @@ class Company(Base):
     # Contact information
     phone_primary = Column(String, nullable=False)
     phone_dispatch = Column(String, nullable=True)
+    phone_primary_e164 = Column(String, nullable=True, index=True)  # normalize_phone(phone_primary), set by CompanyService
+    phone_dispatch_e164 = Column(String, nullable=True, index=True)  # normalize_phone(phone_dispatch), set by CompanyService
     email = Column(String, nullable=True)
     website = Column(String, nullable=True)
+    website_domain = Column(String, nullable=True, index=True)  # normalize_domain(website), set by CompanyService
     facebook_page = Column(String, nullable=True)
     google_business_url = Column(String, nullable=False)
     
@@ -28,6 +31,8 @@ class Company(Base):
     address_city = Column(String, nullable=False)
     address_state = Column(String, nullable=False)
     address_zip = Column(String, nullable=False)
+    latitude = Column(Float, nullable=True)  # From Google Maps
+    longitude = Column(Float, nullable=True)
     
     # Business details
     is_24_7 = Column(Boolean, nullable=True)
@@ -35,6 +40,7 @@ class Company(Base):
     fleet_size = Column(String, nullable=True)  # 'small', 'medium', 'large'
     review_count = Column(Integer, nullable=True)
     rating = Column(Float, nullable=True)
+    lead_score = Column(Float, nullable=True, index=True)  # 0-100, set by LeadScoringService
     
     # Hours and services
     hours = Column(JSON, nullable=True)  # From Google/Facebook
@@ -48,6 +54,10 @@ class Company(Base):
     website_scrape_status = Column(String, nullable=True)  # 'pending', 'success', 'failed', 'no_website'
     scraping_stage = Column(String, nullable=True)  # 'initial', 'google_maps', 'website_scraped', 'facebook_scraped', 'fully_enriched', 'failed'
     
+    # Duplicate listings, set by EntityResolutionService
+    canonical_company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=True, index=True)  # Null for canonical companies
+    duplicate_score = Column(Float, nullable=True)  # 0.0-1.0, best match to another cluster member
+    
     # Metadata
     source = Column(String, default="apify_google_maps", nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -58,4 +68,8 @@ class Company(Base):
     enrichment_snapshots = relationship("EnrichmentSnapshot", back_populates="company")
     outreach_history = relationship("OutreachHistory", back_populates="company")
     outreach_assignments = relationship("OutreachAssignment", back_populates="company")
-
+    
+    __table_args__ = (
+        # Upsert key for imports (INSERT ... ON CONFLICT in CompanyLoader)
+        Index("ux_companies_google_business_url", "google_business_url", unique=True),
+    )
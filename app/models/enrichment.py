@@ -1,5 +1,5 @@
 """Enrichment models"""
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -13,10 +13,18 @@ class EnrichmentSnapshot(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False)
-    snapshot_data = Column(JSON, nullable=False)
+    snapshot_data = Column(JSON, nullable=False)  # Full state, or {'set': {...}, 'unset': [...]} for deltas
+    snapshot_type = Column(String, default='full', nullable=False)  # 'full', 'delta'
+    content_hash = Column(String, nullable=True)  # sha256 of the full state after this snapshot
+    chain_seq = Column(Integer, default=0, nullable=False)  # Position in the company/source chain, increasing
     enrichment_source = Column(String, nullable=False)  # 'facebook', 'google', 'website', 'manual'
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
     company = relationship("Company", back_populates="enrichment_snapshots")
+    
+    __table_args__ = (
+        Index("ix_enrichment_snapshots_company_created", "company_id", "created_at"),
+        Index("ix_enrichment_snapshots_chain", "company_id", "enrichment_source", "chain_seq"),
+    )
 
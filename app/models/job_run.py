@@ -0,0 +1,25 @@
+"""Scheduled job run model"""
+from sqlalchemy import Column, String, Float, DateTime, Text, Index
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+import uuid
+from app.database import Base
+
+
+class JobRun(Base):
+    """One execution (or skipped execution) of a scheduled job"""
+    __tablename__ = "scheduled_job_runs"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_id = Column(String, nullable=False)  # e.g. 'daily_zone_crawl'
+    instance_id = Column(String, nullable=False)  # host:pid of the scheduler that ran it
+    status = Column(String, nullable=False)  # 'succeeded', 'failed', 'skipped'
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_scheduled_job_runs_job_started", "job_id", "started_at"),
+    )
@@ -1,5 +1,5 @@
 """Outreach models"""
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -26,6 +26,10 @@ class OutreachHistory(Base):
     
     # Relationships
     company = relationship("Company", back_populates="outreach_history")
+    
+    __table_args__ = (
+        Index("ix_outreach_history_company_channel_sent", "company_id", "channel", "sent_at"),
+    )
 
 
 class OutreachSequence(Base):
@@ -52,8 +56,9 @@ class OutreachAssignment(Base):
     company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False)
     sequence_id = Column(UUID(as_uuid=True), ForeignKey("outreach_sequences.id"), nullable=False)
     current_step = Column(Integer, default=0, nullable=False)
-    status = Column(String, nullable=False)  # 'pending', 'active', 'paused', 'completed', 'opted_out'
+    status = Column(String, nullable=False)  # 'pending', 'active', 'paused', 'completed', 'opted_out', 'skipped'
     started_at = Column(DateTime, nullable=True)
+    next_step_due_at = Column(DateTime, nullable=True)  # When current_step should be sent
     completed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -61,4 +66,8 @@ class OutreachAssignment(Base):
     # Relationships
     company = relationship("Company", back_populates="outreach_assignments")
     sequence = relationship("OutreachSequence", back_populates="assignments")
+    
+    __table_args__ = (
+        Index("ix_outreach_assignments_status_due", "status", "next_step_due_at"),
+    )
 
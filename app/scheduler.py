@@ -0,0 +1,47 @@
+"""Scheduler process entry point (python -m app.scheduler)"""
+import asyncio
+import signal
+from app.config import settings
+from app.database import engine
+from app.jobs.locks import SchedulerLeader
+from app.jobs.scheduled_jobs import start_scheduler, stop_scheduler, resume_scheduler, pause_scheduler
+
+
+async def run_scheduler():
+    """
+    Run scheduled jobs until the process receives SIGINT or SIGTERM
+    
+    Any number of scheduler processes can run; they elect a leader through a
+    Postgres advisory lock and only the leader's jobs fire.
+    """
+    if settings.use_supabase_env_vars:
+        await settings.load_env_from_supabase_async()
+
+    if settings.env_cache_notify:
+        from app.services.env_service import env_change_listener
+        await env_change_listener.start(engine)
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    start_scheduler(paused=True)
+    leader = SchedulerLeader(engine, on_elected=resume_scheduler, on_demoted=pause_scheduler)
+    try:
+        await leader.run(stop_event)
+    finally:
+        from app.services.outreach_service import OutreachService
+        from app.services.env_service import env_change_listener
+        stop_scheduler()
+        await env_change_listener.stop()
+        await OutreachService.close_http_client()
+        await engine.dispose()
+
+
+def main():
+    asyncio.run(run_scheduler())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
 """Pydantic schemas for API"""
 from app.schemas.zone import ZoneCreate, ZoneUpdate, ZoneResponse
 from app.schemas.company import CompanyCreate, CompanyUpdate, CompanyResponse
-from app.schemas.enrichment import EnrichmentSnapshotResponse
+from app.schemas.enrichment import (
+    EnrichmentSnapshotResponse,
+    BatchEnrichmentRequest,
+    EnrichmentJobResponse,
+)
 from app.schemas.outreach import (
     OutreachSequenceCreate,
     OutreachSequenceResponse,
     OutreachAssignmentCreate,
     OutreachHistoryResponse,
+    EqhoLeadPushRequest,
 )
 
 __all__ = [
@@ -17,9 +22,12 @@ __all__ = [
     "CompanyUpdate",
     "CompanyResponse",
     "EnrichmentSnapshotResponse",
+    "BatchEnrichmentRequest",
+    "EnrichmentJobResponse",
     "OutreachSequenceCreate",
     "OutreachSequenceResponse",
     "OutreachAssignmentCreate",
     "OutreachHistoryResponse",
+    "EqhoLeadPushRequest",
 ]
 
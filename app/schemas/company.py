@@ -63,6 +63,9 @@ class CompanyResponse(CompanyBase):
     fleet_size: Optional[str] = None
     review_count: Optional[int] = None
     rating: Optional[float] = None
+    lead_score: Optional[float] = None
+    canonical_company_id: Optional[UUID] = None
+    duplicate_score: Optional[float] = None
     hours: Optional[Dict[str, Any]] = None
     hours_website: Optional[Dict[str, Any]] = None
     services: Optional[List[str]] = None
@@ -1,6 +1,6 @@
 """Enrichment schemas"""
-from pydantic import BaseModel
-from typing import Dict, Any
+from pydantic import BaseModel, Field
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -10,8 +10,30 @@ class EnrichmentSnapshotResponse(BaseModel):
     company_id: UUID
     snapshot_data: Dict[str, Any]
     enrichment_source: str
+    content_hash: Optional[str] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+
+class BatchEnrichmentRequest(BaseModel):
+    company_ids: Optional[List[UUID]] = None
+    zone_id: Optional[UUID] = None
+    only_with_website: bool = True
+    stale_days: Optional[int] = Field(None, ge=0)
+    limit: int = Field(500, ge=1, le=10000)
+
+
+class EnrichmentJobResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str  # 'pending', 'running', 'completed', 'failed'
+    total: int
+    processed: int
+    succeeded: int
+    failed: int
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None  # Summary for single-batch jobs, e.g. duplicate resolution
+    created_at: datetime
+    finished_at: Optional[datetime] = None
@@ -54,3 +54,11 @@ class OutreachHistoryResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class EqhoLeadPushRequest(BaseModel):
+    zone_id: Optional[UUID] = None
+    has_impound_service: Optional[bool] = None
+    min_lead_score: Optional[float] = None
+    company_ids: Optional[List[UUID]] = None
+    list_id: Optional[str] = None
+    trigger_calls: bool = False
@@ -0,0 +1,306 @@
+"""Apify item mapping: single items and process-pool batch mapping"""
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from collections import deque
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+import os
+from app.utils.normalization import normalize_domain, normalize_phone
+
+# Keys of mapped records, in MappedCompany slot order
+MAPPED_COLUMNS: Tuple[str, ...] = (
+    "name", "phone_primary", "phone_primary_e164", "website", "website_domain", "google_business_url",
+    "address_street", "address_city", "address_state", "address_zip",
+    "rating", "review_count", "hours", "source",
+    "latitude", "longitude", "photos", "category", "description", "reviews",
+)
+
+# Keys only present in a mapped record when the item has them
+OPTIONAL_COLUMNS = frozenset(("latitude", "longitude", "photos", "category", "description", "reviews"))
+
+# Mapped keys with no Company column
+NON_COMPANY_COLUMNS = frozenset(("photos", "category", "description", "reviews"))
+
+# Mapped keys that are Company columns
+COMPANY_COLUMNS: Tuple[str, ...] = tuple(key for key in MAPPED_COLUMNS if key not in NON_COMPANY_COLUMNS)
+
+# Bad items kept per batch (and per summary) for inspection
+ERROR_SAMPLE_SIZE = 5
+
+# Characters of a bad item kept in its sample
+ERROR_SAMPLE_ITEM_CHARS = 500
+
+
+class MappedCompany:
+    """
+    A mapped company, one slot per MAPPED_COLUMNS key (None when absent)
+
+    Produced once by the mapper and passed as-is to
+    CompanyService.bulk_upsert_companies and CompanyLoader, which read
+    company_values(). A batch of these holds roughly half the memory of the
+    equivalent dicts (scripts/benchmark_record_memory.py), and each record
+    pickles as a plain tuple.
+    """
+
+    __slots__ = MAPPED_COLUMNS
+
+    def __init__(self, **values: Any):
+        for key in MAPPED_COLUMNS:
+            setattr(self, key, values.pop(key, None))
+        if values:
+            raise TypeError(f"Unknown mapped company fields: {', '.join(values)}")
+
+    @classmethod
+    def from_row(cls, row: Tuple[Any, ...]) -> "MappedCompany":
+        record = cls.__new__(cls)
+        for key, value in zip(MAPPED_COLUMNS, row):
+            setattr(record, key, value)
+        return record
+
+    def as_row(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, key) for key in MAPPED_COLUMNS)
+
+    def __reduce__(self):
+        return (MappedCompany.from_row, (self.as_row(),))
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, MappedCompany) and self.as_row() == other.as_row()
+
+    def __repr__(self) -> str:
+        return f"MappedCompany(name={self.name!r}, google_business_url={self.google_business_url!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style read, so code written for mapped dicts keeps working"""
+        value = getattr(self, key, None) if key in MAPPED_COLUMNS else None
+        return default if value is None else value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The record as map_apify_item's dict (optional keys only when set)"""
+        return {
+            key: getattr(self, key) for key in MAPPED_COLUMNS
+            if key not in OPTIONAL_COLUMNS or getattr(self, key) is not None
+        }
+
+    def company_values(self) -> Dict[str, Any]:
+        """Non-null values of Company columns, ready for the bulk upsert paths"""
+        values = {}
+        for key in COMPANY_COLUMNS:
+            value = getattr(self, key)
+            if value is not None:
+                values[key] = value
+        return values
+
+
+def map_apify_record(item: Dict[str, Any]) -> Optional["MappedCompany"]:
+    """
+    Map an Apify Google Maps item to our company schema
+
+    Returns None if the item has no title or URL; raises on malformed items
+    (e.g. a non-numeric rating).
+    """
+    # Extract basic information
+    title = item.get("title", "")
+    address = item.get("address", "")
+    phone = item.get("phone", "")
+    website = item.get("website", "")
+    google_maps_url = item.get("url", "")
+
+    # Extract images/photos
+    images = item.get("images", [])
+    photos = []
+    if images:
+        photos = [img.get("url", "") for img in images if img.get("url")]
+
+    # Extract location coordinates
+    location = item.get("location", {})
+    latitude = location.get("lat") if location else None
+    longitude = location.get("lng") if location else None
+
+    # Extract rating and reviews
+    rating = item.get("rating")
+    review_count = item.get("reviewsCount", 0)
+    reviews = item.get("reviews", [])
+
+    # Validate required fields - need at least title and google_maps_url
+    if not title or not google_maps_url:
+        return None
+
+    # Parse address components
+    address_parts = address.split(",") if address else []
+    street = address_parts[0].strip() if address_parts else ""
+    city = address_parts[1].strip() if len(address_parts) > 1 else ""
+    state_zip = address_parts[2].strip() if len(address_parts) > 2 else ""
+
+    # Try to extract state and zip
+    state = ""
+    zip_code = ""
+    if state_zip:
+        parts = state_zip.split()
+        if len(parts) >= 2:
+            state = parts[0]
+            zip_code = parts[-1]
+
+    # Extract hours
+    hours = item.get("openingHours", {})
+
+    # Extract additional data
+    category = item.get("category", "")
+    description = item.get("description", "")
+
+    return MappedCompany(
+        name=title,
+        phone_primary=phone or "",
+        phone_primary_e164=normalize_phone(phone),
+        website=website,
+        website_domain=normalize_domain(website),
+        google_business_url=google_maps_url,
+        address_street=street,
+        address_city=city,
+        address_state=state,
+        address_zip=zip_code,
+        rating=float(rating) if rating else None,
+        review_count=int(review_count) if review_count else None,
+        hours=hours if hours else None,
+        source="apify_google_maps",
+        latitude=latitude if latitude and longitude else None,
+        longitude=longitude if latitude and longitude else None,
+        photos=photos or None,
+        category=category or None,
+        description=description or None,
+        reviews=reviews[:5] if reviews else None,  # Store first 5 reviews
+    )
+
+
+def map_apify_item(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """map_apify_record as a dict (optional keys only when present)"""
+    record = map_apify_record(item)
+    return record.to_dict() if record is not None else None
+
+
+class MappedBatch:
+    """
+    Mapped companies of one chunk of items
+
+    ``invalid`` counts items without a title or URL, ``errors`` items that
+    failed to map; ``error_samples`` keeps the first few failures as
+    {'offset', 'error', 'item'}.
+    """
+
+    __slots__ = ("offset", "items", "companies", "invalid", "errors", "error_samples")
+
+    def __init__(self, offset: int = 0):
+        self.offset = offset
+        self.items = 0
+        self.companies: List[MappedCompany] = []
+        self.invalid = 0
+        self.errors = 0
+        self.error_samples: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.companies)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Mapped companies as dicts, shaped like map_apify_item's output"""
+        for company in self.companies:
+            yield company.to_dict()
+
+
+def map_items(
+    items: List[Dict[str, Any]],
+    offset: int = 0,
+    sample_size: int = ERROR_SAMPLE_SIZE
+) -> MappedBatch:
+    """Map a chunk of items (starting at dataset ``offset``) without printing"""
+    batch = MappedBatch(offset)
+    batch.items = len(items)
+    for index, item in enumerate(items, offset):
+        try:
+            record = map_apify_record(item)
+        except Exception as e:
+            batch.errors += 1
+            if len(batch.error_samples) < sample_size:
+                batch.error_samples.append({
+                    "offset": index,
+                    "error": f"{type(e).__name__}: {e}",
+                    "item": repr(item)[:ERROR_SAMPLE_ITEM_CHARS],
+                })
+            continue
+        if record is None:
+            batch.invalid += 1
+            continue
+        batch.companies.append(record)
+    return batch
+
+
+def map_chunk_file(path: str, sample_size: int = ERROR_SAMPLE_SIZE) -> MappedBatch:
+    """Map one dataset archive chunk file (named by its dataset offset)"""
+    from app.utils.dataset_archive import DatasetArchive
+    offset = int(Path(path).name.split(".")[0])
+    return map_items(DatasetArchive.read_chunk(Path(path)), offset, sample_size)
+
+
+def _map_chunk(chunk: Tuple[int, List[Dict[str, Any]]], sample_size: int) -> MappedBatch:
+    offset, items = chunk
+    return map_items(items, offset, sample_size)
+
+
+def _ordered_map(executor: Executor, func: Callable[[Any], MappedBatch], inputs: Iterable[Any], window: int) -> Iterator[MappedBatch]:
+    """Like Executor.map, but with at most ``window`` inputs in flight so a long stream isn't read up front"""
+    pending: Deque[Future] = deque()
+    for value in inputs:
+        pending.append(executor.submit(func, value))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class MappingSummary:
+    """Totals over mapped batches, with a capped sample of bad items"""
+
+    def __init__(self, sample_size: int = ERROR_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.items = 0
+        self.mapped = 0
+        self.invalid = 0
+        self.errors = 0
+        self.error_samples: List[Dict[str, Any]] = []
+
+    def add(self, batch: MappedBatch) -> None:
+        self.items += batch.items
+        self.mapped += len(batch)
+        self.invalid += batch.invalid
+        self.errors += batch.errors
+        room = self.sample_size - len(self.error_samples)
+        if room > 0:
+            self.error_samples.extend(batch.error_samples[:room])
+
+
+class BatchMapper:
+    """
+    Maps item chunks in a process pool
+
+    ``workers=1`` maps in the calling process. Batches come back in input
+    order, with a bounded number of chunks in flight; the pool is created
+    per call, so use one call per large job.
+    """
+
+    def __init__(self, workers: Optional[int] = None, sample_size: int = ERROR_SAMPLE_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.sample_size = sample_size
+
+    def _map(self, func: Callable[..., MappedBatch], inputs: Iterable[Any]) -> Iterator[MappedBatch]:
+        func = partial(func, sample_size=self.sample_size)
+        if self.workers == 1:
+            yield from map(func, inputs)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            yield from _ordered_map(executor, func, inputs, self.workers * 2)
+
+    def map_chunks(self, chunks: Iterable[Tuple[int, List[Dict[str, Any]]]]) -> Iterator[MappedBatch]:
+        """Map (offset, items) chunks, e.g. from DatasetArchive.iter_chunks"""
+        return self._map(_map_chunk, chunks)
+
+    def map_files(self, paths: Iterable[Path]) -> Iterator[MappedBatch]:
+        """Map archive chunk files; workers read the files themselves"""
+        return self._map(map_chunk_file, (str(path) for path in paths))
@@ -0,0 +1,117 @@
+"""Apify run tracking and import checkpoints"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import Optional
+from uuid import UUID
+from datetime import datetime
+from app.models.apify_run import ApifyRun
+
+
+class ApifyRunService:
+    """
+    Service for ApifyRun processing state
+
+    Imports page through a run's dataset in chunks and record the next dataset
+    offset after each one (``import_offset``), in the same transaction as the
+    chunk's writes where the writer allows it. A restarted import resumes from
+    that offset; at worst the last chunk is applied again, which is harmless
+    because company and enrichment writes are keyed upserts.
+    """
+
+    @staticmethod
+    async def get_run(db: AsyncSession, run_id: str) -> Optional[ApifyRun]:
+        """Get a tracked run by Apify run ID"""
+        result = await db.execute(select(ApifyRun).where(ApifyRun.run_id == run_id))
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_or_create_run(
+        db: AsyncSession,
+        run_id: str,
+        zone_id: Optional[UUID] = None,
+        query: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> ApifyRun:
+        """Get the tracked run, creating it (pending) on first sight"""
+        run = await ApifyRunService.get_run(db, run_id)
+        if run:
+            return run
+
+        run = ApifyRun(
+            run_id=run_id,
+            zone_id=zone_id,
+            query=query,
+            status=status,
+            processing_status='pending',
+            import_offset=0,
+        )
+        db.add(run)
+        await db.commit()
+        await db.refresh(run)
+        return run
+
+    @staticmethod
+    async def start_import(db: AsyncSession, run: ApifyRun, restart: bool = False) -> int:
+        """
+        Mark a run as processing and return the dataset offset to resume from
+
+        ``restart`` discards the checkpoint and starts from the first item.
+        """
+        if restart:
+            run.import_offset = 0
+        run.processing_status = 'processing'
+        run.error_message = None
+        await db.commit()
+        return run.import_offset or 0
+
+    @staticmethod
+    def record_chunk(run: ApifyRun, next_offset: int) -> None:
+        """Advance the checkpoint; committed with the caller's chunk writes"""
+        run.import_offset = next_offset
+
+    @staticmethod
+    async def complete_import(db: AsyncSession, run: ApifyRun, items_count: Optional[int] = None) -> None:
+        """Mark a run's import as completed"""
+        run.processing_status = 'completed'
+        run.processed_at = datetime.utcnow()
+        if items_count is not None:
+            run.items_count = items_count
+        await db.commit()
+
+    @staticmethod
+    async def end_import(
+        db: AsyncSession,
+        run: ApifyRun,
+        offset: int,
+        limit: Optional[int] = None
+    ) -> bool:
+        """
+        Finish an import that read the dataset up to ``offset``
+
+        Without an item ``limit`` the reader stops only at the end of the
+        dataset, and with one it ends early when fewer than ``limit`` items
+        exist; either way the run is completed. An import that stopped at its
+        limit goes back to pending with its checkpoint, so a later import
+        without the limit resumes it instead of skipping the rest.
+
+        Returns:
+            Whether the run was completed
+        """
+        if limit is None or offset < limit:
+            await ApifyRunService.complete_import(db, run, items_count=offset)
+            return True
+        run.processing_status = 'pending'
+        await db.commit()
+        return False
+
+    @staticmethod
+    async def fail_import(db: AsyncSession, run: ApifyRun, error: str) -> None:
+        """
+        Roll back the failed chunk and mark the run's import as failed
+
+        The checkpoint stays at the last committed chunk for the next attempt.
+        """
+        await db.rollback()
+        run.processing_status = 'failed'
+        run.error_message = error
+        await db.commit()
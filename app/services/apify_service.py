@@ -1,15 +1,29 @@
 """Apify service for Google Maps scraping"""
-import httpx
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+import logging
 from app.config import settings
+from app.utils.dataset_archive import DatasetArchive
+from app.services.apify_mapper import map_apify_item, map_items
+
+logger = logging.getLogger(__name__)
 
 
 class ApifyService:
-    """Service for interacting with Apify API"""
+    """
+    Service for interacting with Apify API
+    
+    With an archive (``APIFY_ARCHIVE_DIR`` or the ``archive`` argument),
+    dataset items are read from local storage when archived and archived as
+    they're downloaded, so reprocessing a run doesn't download it again.
+    """
     
-    def __init__(self):
+    def __init__(self, archive: Optional[DatasetArchive] = None):
+        if archive is None and settings.apify_archive_dir:
+            archive = DatasetArchive(settings.apify_archive_dir)
+        self.archive = archive
         self.api_token = settings.apify_token
         self.base_url = "https://api.apify.com/v2"
+        import httpx
         self.client = httpx.AsyncClient(
             headers={
                 "Content-Type": "application/json",
@@ -68,16 +82,9 @@ class ApifyService:
         results_response.raise_for_status()
         results = results_response.json()
         
-        # Map Apify results to our company schema
-        companies = []
         # Results can be a list directly or wrapped in items
         items = results if isinstance(results, list) else results.get("items", [])
-        for item in items:
-            company = self._map_apify_result(item)
-            if company:
-                companies.append(company)
-        
-        return companies
+        return self._map_results(items)
     
     async def _wait_for_run_completion(self, run_id: str, max_wait: int = 600):
         """Wait for Apify run to complete"""
@@ -102,97 +109,26 @@ class ApifyService:
         
         raise TimeoutError(f"Apify run timed out after {max_wait} seconds")
     
-    def _map_apify_result(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Map Apify Google Maps result to our company schema"""
+    @staticmethod
+    def _map_apify_result(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Map Apify Google Maps result to our company schema (None if it can't be mapped)"""
         try:
-            # Extract basic information
-            title = item.get("title", "")
-            address = item.get("address", "")
-            phone = item.get("phone", "")
-            website = item.get("website", "")
-            google_maps_url = item.get("url", "")
-            
-            # Extract images/photos
-            images = item.get("images", [])
-            photos = []
-            if images:
-                photos = [img.get("url", "") for img in images if img.get("url")]
-            
-            # Extract location coordinates
-            location = item.get("location", {})
-            latitude = location.get("lat") if location else None
-            longitude = location.get("lng") if location else None
-            
-            # Extract rating and reviews
-            rating = item.get("rating")
-            review_count = item.get("reviewsCount", 0)
-            reviews = item.get("reviews", [])
-            
-            # Validate required fields - need at least title and google_maps_url
-            if not title or not google_maps_url:
-                return None
-            
-            # Parse address components
-            address_parts = address.split(",") if address else []
-            street = address_parts[0].strip() if address_parts else ""
-            city = address_parts[1].strip() if len(address_parts) > 1 else ""
-            state_zip = address_parts[2].strip() if len(address_parts) > 2 else ""
-            
-            # Try to extract state and zip
-            state = ""
-            zip_code = ""
-            if state_zip:
-                parts = state_zip.split()
-                if len(parts) >= 2:
-                    state = parts[0]
-                    zip_code = parts[-1]
-            
-            # Extract hours
-            hours = item.get("openingHours", {})
-            
-            # Extract additional data
-            category = item.get("category", "")
-            description = item.get("description", "")
-            
-            # Build result with all available data
-            result = {
-                "name": title,
-                "phone_primary": phone or "",
-                "website": website,
-                "google_business_url": google_maps_url,
-                "address_street": street,
-                "address_city": city,
-                "address_state": state,
-                "address_zip": zip_code,
-                "rating": float(rating) if rating else None,
-                "review_count": int(review_count) if review_count else None,
-                "hours": hours if hours else None,
-                "source": "apify_google_maps",
-            }
-            
-            # Add optional fields if available
-            if latitude and longitude:
-                result["latitude"] = latitude
-                result["longitude"] = longitude
-            
-            if photos:
-                result["photos"] = photos
-            
-            if category:
-                result["category"] = category
-            
-            if description:
-                result["description"] = description
-            
-            if reviews:
-                result["reviews"] = reviews[:5]  # Store first 5 reviews
-            
-            return result
-        except Exception as e:
-            # Log error and skip this item
-            print(f"Error mapping Apify result: {e}")
+            return map_apify_item(item)
+        except Exception:
+            logger.debug("Error mapping Apify result", exc_info=True)
             return None
     
+    @staticmethod
+    def _map_results(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Map Apify Google Maps results, logging one summary of the items that failed"""
+        batch = map_items(items)
+        if batch.errors:
+            logger.warning(
+                "%d of %d Apify results failed to map, e.g. %s",
+                batch.errors, batch.items, batch.error_samples[:3]
+            )
+        return list(batch.records())
+    
     async def list_runs(
         self,
         actor_id: Optional[str] = None,
@@ -251,59 +187,121 @@ class ApifyService:
         response.raise_for_status()
         return response.json()
     
-    async def download_run_data(
-        self,
-        run_id: str,
-        limit: Optional[int] = None,
-        offset: int = 0,
-    ) -> List[Dict[str, Any]]:
-        """
-        Download data from a completed run
-        
-        Args:
-            run_id: Apify run ID
-            limit: Maximum number of items to return (None = all)
-            offset: Number of items to skip
-        
-        Returns:
-            List of company data dictionaries
-        """
-        # First check if run is completed
+    async def get_run_dataset_id(self, run_id: str) -> str:
+        """Dataset ID of a completed run; raises ValueError if it isn't SUCCEEDED or has no dataset"""
         run_details = await self.get_run_details(run_id)
         run_status = run_details["data"]["status"]
         
         if run_status != "SUCCEEDED":
             raise ValueError(f"Run {run_id} is not completed. Status: {run_status}")
         
-        # Get dataset ID from run
         dataset_id = run_details["data"].get("defaultDatasetId")
         if not dataset_id:
             raise ValueError(f"Run {run_id} has no dataset")
-        
-        # Download dataset items
-        params = {"offset": offset}
+        return dataset_id
+    
+    async def get_dataset_items(
+        self,
+        dataset_id: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Raw (unmapped) dataset items"""
+        params = {"offset": offset, "token": self.api_token}
         if limit:
             params["limit"] = limit
         
-        # Add token to params
-        params["token"] = self.api_token
-        
         response = await self.client.get(
             f"{self.base_url}/datasets/{dataset_id}/items",
             params=params
         )
         response.raise_for_status()
         results = response.json()
+        return results if isinstance(results, list) else results.get("items", [])
+    
+    async def iter_run_items(
+        self,
+        run_id: str,
+        offset: int = 0,
+        chunk_size: int = 1000,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Page through a completed run's raw dataset items
         
-        # Map Apify results to our company schema
-        items = results if isinstance(results, list) else results.get("items", [])
-        companies = []
-        for item in items:
-            company = self._map_apify_result(item)
-            if company:
-                companies.append(company)
+        Args:
+            run_id: Apify run ID
+            offset: Dataset offset to start from (e.g. a saved import checkpoint)
+            chunk_size: Items per request
+            limit: Only read the first ``limit`` items of the dataset (None = all)
+        
+        Yields:
+            (offset, items) for each chunk, where offset is the dataset
+            position of the chunk's first item
+        """
+        entry = self.archive.get_run(run_id) if self.archive else None
+        if entry:
+            for chunk_offset, items in self.archive.iter_chunks(run_id, offset, limit):
+                yield chunk_offset, items
+                offset = chunk_offset + len(items)
+            if entry["complete"] or (limit is not None and offset >= limit):
+                return
+            dataset_id = entry["dataset_id"]
+        else:
+            dataset_id = await self.get_run_dataset_id(run_id)
+        
+        while limit is None or offset < limit:
+            size = chunk_size if limit is None else min(chunk_size, limit - offset)
+            items = await self.get_dataset_items(dataset_id, limit=size, offset=offset)
+            if self.archive:
+                self.archive.write_chunk(run_id, dataset_id, offset, items)
+                # A short page is the end of the dataset; the archive is complete
+                # if it holds everything up to here
+                archived = self.archive.get_run(run_id)
+                if len(items) < size and archived and archived["items"] == offset + len(items):
+                    self.archive.mark_complete(run_id)
+            if not items:
+                return
+            yield offset, items
+            offset += len(items)
+            if len(items) < size:
+                return
+    
+    async def archive_run(self, run_id: str, chunk_size: int = 1000) -> int:
+        """Download a run's whole dataset into the archive; returns the item count"""
+        if not self.archive:
+            raise ValueError("No dataset archive configured (set APIFY_ARCHIVE_DIR)")
+        count = 0
+        async for _, items in self.iter_run_items(run_id, chunk_size=chunk_size):
+            count += len(items)
+        return count
+    
+    async def download_run_data(
+        self,
+        run_id: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Download data from a completed run
         
-        return companies
+        Args:
+            run_id: Apify run ID
+            limit: Maximum number of items to return (None = all)
+            offset: Number of items to skip
+        
+        Returns:
+            List of company data dictionaries
+        """
+        items = []
+        async for _, chunk in self.iter_run_items(
+            run_id,
+            offset=offset,
+            limit=offset + limit if limit else None
+        ):
+            items.extend(chunk)
+        
+        return self._map_results(items)
     
     async def list_all_towing_runs(
         self,
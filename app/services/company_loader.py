@@ -0,0 +1,289 @@
+"""Fast bulk company loader: stage with COPY, merge with one INSERT ... ON CONFLICT"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    Table, Column, MetaData, BigInteger, JSON, DateTime, Float, Integer, Boolean,
+    text, bindparam, insert,
+)
+from sqlalchemy.schema import CreateTable
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+from uuid import UUID, uuid4
+from datetime import datetime
+from itertools import islice
+import json
+from app.models.company import Company
+from app.models.zone import Zone
+from app.services.company_service import (
+    COMPANY_IMPORT_COLUMNS, COMPANY_REQUIRED_FIELDS, company_import_values,
+)
+
+if TYPE_CHECKING:
+    from app.services.apify_mapper import MappedCompany
+
+STAGING_TABLE = "company_staging"
+
+# Rows per COPY command (Postgres) or executemany batch (other databases)
+LOAD_CHUNK_SIZE = 10000
+
+DEFAULT_SCRAPING_STAGE = "google_maps"
+
+# Staged company columns, in a fixed order for COPY
+LOAD_COLUMNS: Tuple[str, ...] = tuple(
+    column.key for column in Company.__table__.columns if column.key in COMPANY_IMPORT_COLUMNS
+)
+
+
+def _staging_name(db: AsyncSession) -> str:
+    """Staging table name for SQL; schema-qualified on Postgres so a real table is never touched"""
+    if db.bind.dialect.name == "postgresql":
+        return f"pg_temp.{STAGING_TABLE}"
+    return STAGING_TABLE
+
+
+def _differs_sql(db: AsyncSession, key: str) -> str:
+    """SQL true when the incoming (EXCLUDED) value of ``key`` is set and differs from the stored one"""
+    incoming, stored = f"EXCLUDED.{key}", f"companies.{key}"
+    if db.bind.dialect.name == "postgresql":
+        if isinstance(Company.__table__.c[key].type, JSON):
+            # json has no equality operator; jsonb compares by content
+            incoming, stored = f"{incoming}::jsonb", f"{stored}::jsonb"
+        return f"({incoming} IS NOT NULL AND {incoming} IS DISTINCT FROM {stored})"
+    return f"({incoming} IS NOT NULL AND {incoming} IS NOT {stored})"
+
+
+def _chunks(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class CompanyLoader:
+    """
+    Loader for large company imports
+
+    Mapped companies are streamed into a temporary staging table (``COPY`` on
+    Postgres, executemany elsewhere) and merged into ``companies`` with a
+    single ``INSERT ... SELECT ... ON CONFLICT (google_business_url)``. Zone
+    assignment, de-duplication (the last staged row per URL wins), required
+    field checks and the ``scraping_stage`` default all happen in that SQL.
+    Updates keep stored values where the incoming value is null, like
+    CompanyService.create_or_update_company.
+    """
+
+    @staticmethod
+    def staging_table() -> Table:
+        """Temporary staging table mirroring the importable company columns"""
+        columns = [
+            Column("seq", BigInteger, nullable=False),
+            Column("id", Company.__table__.c.id.type, nullable=False),
+        ]
+        columns += [Column(key, Company.__table__.c[key].type) for key in LOAD_COLUMNS]
+        return Table(STAGING_TABLE, MetaData(), *columns, prefixes=["TEMPORARY"])
+
+    @staticmethod
+    def _staging_row(seq: int, company_data: Union[Dict[str, Any], "MappedCompany"]) -> Dict[str, Any]:
+        values = company_import_values(company_data)
+        row = {key: values.get(key) for key in LOAD_COLUMNS}
+        row["seq"] = seq
+        row["id"] = uuid4()
+        return row
+
+    @staticmethod
+    def _copy_record(row: Dict[str, Any], table: Table) -> Tuple[Any, ...]:
+        """Row as a COPY record, with values coerced to what asyncpg encodes per column type"""
+        record = []
+        for column in table.columns:
+            value = row[column.key]
+            if value is not None:
+                if isinstance(column.type, JSON):
+                    value = json.dumps(value)
+                elif isinstance(column.type, DateTime) and isinstance(value, str):
+                    value = datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+                elif isinstance(column.type, Float):
+                    value = float(value)
+                elif isinstance(column.type, Integer) and not isinstance(column.type, BigInteger):
+                    value = int(value)
+                elif isinstance(column.type, Boolean):
+                    value = bool(value)
+            record.append(value)
+        return tuple(record)
+
+    @staticmethod
+    async def _stage_rows(
+        db: AsyncSession,
+        table: Table,
+        companies: Iterable[Union[Dict[str, Any], "MappedCompany"]],
+        chunk_size: int
+    ) -> int:
+        """Write companies to the staging table; returns the number staged"""
+        rows = (
+            CompanyLoader._staging_row(seq, company_data)
+            for seq, company_data in enumerate(companies)
+        )
+        staged = 0
+
+        if db.bind.dialect.name == "postgresql":
+            connection = await db.connection()
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            column_names = [column.key for column in table.columns]
+            for chunk in _chunks(rows, chunk_size):
+                await driver_connection.copy_records_to_table(
+                    STAGING_TABLE,
+                    schema_name="pg_temp",
+                    records=[CompanyLoader._copy_record(row, table) for row in chunk],
+                    columns=column_names,
+                )
+                staged += len(chunk)
+        else:
+            for chunk in _chunks(rows, chunk_size):
+                await db.execute(insert(table), chunk)
+                staged += len(chunk)
+        return staged
+
+    @staticmethod
+    async def _create_missing_state_zones(db: AsyncSession) -> int:
+        """Create state zones for staged states that don't have one yet"""
+        staging = _staging_name(db)
+        result = await db.execute(text(
+            f"SELECT DISTINCT s.address_state FROM {staging} s "
+            "WHERE s.address_state IS NOT NULL AND length(s.address_state) = 2 "
+            "AND NOT EXISTS (SELECT 1 FROM zones z "
+            "WHERE z.zone_type = 'state' AND z.state = s.address_state)"
+        ))
+        states = [row[0] for row in result.all()]
+        if states:
+            await db.execute(insert(Zone), [
+                {'name': f'{state} State', 'zone_type': 'state', 'state': state}
+                for state in states
+            ])
+        return len(states)
+
+    @staticmethod
+    def _merge_source_sql(staging: str, zone_id: Optional[UUID]) -> str:
+        """Deduplicated, zoned, complete staged rows (the merge's SELECT source)"""
+        if zone_id is not None:
+            zone_expression = ":zone_id"
+        else:
+            zone_expression = (
+                "(SELECT z.id FROM zones z WHERE z.zone_type = 'state' "
+                "AND z.state = s.address_state ORDER BY z.created_at LIMIT 1)"
+            )
+        required = " AND ".join(f"s.{field} IS NOT NULL" for field in COMPANY_REQUIRED_FIELDS)
+        # Updates may be partial; only new companies need every required field
+        return (
+            f"SELECT s.*, {zone_expression} AS resolved_zone_id FROM {staging} s "
+            f"WHERE s.seq IN (SELECT MAX(seq) FROM {staging} GROUP BY google_business_url) "
+            f"AND ({required} OR EXISTS (SELECT 1 FROM companies c "
+            "WHERE c.google_business_url = s.google_business_url))"
+        )
+
+    @staticmethod
+    async def load_companies(
+        db: AsyncSession,
+        companies: Iterable[Union[Dict[str, Any], "MappedCompany"]],
+        zone_id: Optional[UUID] = None,
+        reassign_zone: bool = True,
+        default_scraping_stage: str = DEFAULT_SCRAPING_STAGE,
+        chunk_size: int = LOAD_CHUNK_SIZE
+    ) -> Dict[str, int]:
+        """
+        Load mapped companies in bulk and commit
+
+        ``companies`` may be any iterable (e.g. a streaming reader) of dicts or
+        MappedCompany records; it is consumed in chunks of ``chunk_size``. With ``zone_id`` every company
+        goes into that zone; otherwise each goes into the state zone for its
+        ``address_state``, created if missing. ``reassign_zone`` moves existing
+        companies to the resolved zone.
+
+        Returns:
+            {'staged': int, 'created': int, 'updated': int, 'unchanged': int,
+             'skipped': int, 'zones_created': int}
+            where ``unchanged`` counts existing companies the load wouldn't
+            change (left unwritten, ``updated_at`` included) and ``skipped`` counts staged rows not written: new companies
+            missing required fields, rows without a zone, and rows superseded
+            by a later row for the same URL
+        """
+        table = CompanyLoader.staging_table()
+        staging = _staging_name(db)
+        zone_type = Company.__table__.c.zone_id.type
+
+        await db.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+        await db.execute(CreateTable(table))
+        staged = await CompanyLoader._stage_rows(db, table, companies, chunk_size)
+
+        zones_created = 0
+        if zone_id is None:
+            zones_created = await CompanyLoader._create_missing_state_zones(db)
+
+        source = CompanyLoader._merge_source_sql(staging, zone_id)
+        params = {"zone_id": zone_id} if zone_id is not None else {}
+        bind_zone = [bindparam("zone_id", type_=zone_type)] if zone_id is not None else []
+
+        counts = await db.execute(
+            text(
+                f"SELECT count(*) AS valid, count(c.id) AS existing FROM ({source}) m "
+                "LEFT JOIN companies c ON c.google_business_url = m.google_business_url "
+                "WHERE m.resolved_zone_id IS NOT NULL"
+            ).bindparams(*bind_zone),
+            params
+        )
+        valid, existing = counts.one()
+
+        insert_columns = [key for key in LOAD_COLUMNS if key not in ("scraping_stage", "source")]
+        # NOT NULL is checked on the proposed row before ON CONFLICT applies, so
+        # partial updates take missing required values from the stored company
+        select_columns = ", ".join(
+            f"COALESCE(m.{key}, c.{key})" if key in COMPANY_REQUIRED_FIELDS else f"m.{key}"
+            for key in insert_columns
+        )
+        updated_columns = [key for key in LOAD_COLUMNS if key not in ("google_business_url", "scraping_stage")]
+        updates = [f"{key} = COALESCE(EXCLUDED.{key}, companies.{key})" for key in updated_columns]
+        updates.append("scraping_stage = COALESCE(companies.scraping_stage, EXCLUDED.scraping_stage)")
+        updates.append("updated_at = EXCLUDED.updated_at")
+        # Existing companies are only written (and updated_at bumped) when something changes
+        changed = [_differs_sql(db, key) for key in updated_columns]
+        changed.append("(companies.scraping_stage IS NULL AND EXCLUDED.scraping_stage IS NOT NULL)")
+        if reassign_zone:
+            updates.append("zone_id = EXCLUDED.zone_id")
+            changed.append(_differs_sql(db, "zone_id"))
+
+        merged = await db.execute(
+            text(
+                f"INSERT INTO companies (id, zone_id, {', '.join(insert_columns)}, "
+                "scraping_stage, source, created_at, updated_at) "
+                f"SELECT m.id, m.resolved_zone_id, {select_columns}, "
+                "COALESCE(m.scraping_stage, :default_stage), "
+                "COALESCE(m.source, :default_source), :now, :now "
+                f"FROM ({source}) m "
+                "LEFT JOIN companies c ON c.google_business_url = m.google_business_url "
+                "WHERE m.resolved_zone_id IS NOT NULL "
+                "ON CONFLICT (google_business_url) DO UPDATE SET "
+                + ", ".join(updates)
+                + " WHERE " + " OR ".join(changed)
+            ).bindparams(*bind_zone, bindparam("now", type_=DateTime)),
+            {
+                **params,
+                "default_stage": default_scraping_stage,
+                "default_source": Company.__table__.c.source.default.arg,
+                "now": datetime.utcnow(),
+            }
+        )
+
+        # Counts inserted rows and updated ones, not those the WHERE left alone
+        written = merged.rowcount
+        created = valid - existing
+
+        await db.execute(text(f"DROP TABLE {staging}"))
+        await db.commit()
+
+        return {
+            'staged': staged,
+            'created': created,
+            'updated': written - created,
+            'unchanged': existing - (written - created),
+            'skipped': staged - valid,
+            'zones_created': zones_created,
+        }
@@ -1,10 +1,82 @@
 """Company service"""
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
-from typing import List, Optional, Dict, Any
+from sqlalchemy import select, insert, update, and_, or_, JSON
+from typing import List, Optional, Dict, Any, Iterable, Tuple, Union, TYPE_CHECKING
 from uuid import UUID
+import json
 from app.models.company import Company
 from app.schemas.company import CompanyCreate, CompanyUpdate
+from app.utils.normalization import normalize_domain, normalize_phone
+
+if TYPE_CHECKING:
+    from app.services.apify_mapper import MappedCompany
+
+# Columns that can be written from imported company data
+COMPANY_IMPORT_COLUMNS = frozenset(
+    column.key for column in Company.__table__.columns
+    if column.key not in ('id', 'zone_id', 'created_at', 'updated_at')
+)
+
+# Every company column
+COMPANY_COLUMN_KEYS = frozenset(column.key for column in Company.__table__.columns)
+
+# Non-null columns a new company must have (source has a default)
+COMPANY_REQUIRED_FIELDS = (
+    'name', 'phone_primary', 'google_business_url',
+    'address_street', 'address_city', 'address_state', 'address_zip',
+)
+
+
+# Normalized match keys: source column -> (derived column, normalizer)
+DERIVED_COLUMNS = {
+    'website': ('website_domain', normalize_domain),
+    'phone_primary': ('phone_primary_e164', normalize_phone),
+    'phone_dispatch': ('phone_dispatch_e164', normalize_phone),
+}
+
+
+def with_derived_columns(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the match keys derived from written values (see DERIVED_COLUMNS)"""
+    for source, (derived, normalize) in DERIVED_COLUMNS.items():
+        if source in values:
+            values[derived] = normalize(values[source])
+    return values
+
+
+def _comparable(column_type: Any, value: Any) -> Any:
+    """A stored or incoming value in a form where equal content compares equal"""
+    if value is None:
+        return None
+    if isinstance(column_type, JSON):
+        return json.dumps(value, sort_keys=True, default=str)
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def changed_company_fields(company: Company, values: Dict[str, Any]) -> List[str]:
+    """Keys of ``values`` whose value differs from the company's (JSON by content)"""
+    columns = Company.__table__.columns
+    return [
+        key for key, value in values.items()
+        if _comparable(columns[key].type, getattr(company, key)) != _comparable(columns[key].type, value)
+    ]
+
+
+def company_import_values(company_data: Union[Dict[str, Any], "MappedCompany"]) -> Dict[str, Any]:
+    """
+    Non-null company column values of an imported record, with DERIVED_COLUMNS
+    
+    Dicts get their derived columns here; MappedCompany records already
+    carry them from the mapper.
+    """
+    if not isinstance(company_data, dict):
+        return company_data.company_values()
+    values = with_derived_columns({
+        key: value for key, value in company_data.items()
+        if key in COMPANY_IMPORT_COLUMNS and value is not None
+    })
+    return {key: value for key, value in values.items() if value is not None}
 
 
 class CompanyService:
@@ -16,9 +88,44 @@ class CompanyService:
         company_data: Dict[str, Any], 
         zone_id: UUID
     ) -> Company:
-        """Create or update company based on Google Business URL"""
+        """Create or update company based on Google Business URL (see upsert_company)"""
+        company, _ = await CompanyService.upsert_company(db, company_data, zone_id)
+        return company
+    
+    @staticmethod
+    async def upsert_company(
+        db: AsyncSession,
+        company_data: Dict[str, Any],
+        zone_id: UUID,
+        defaults: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Company, Optional[List[str]]]:
+        """
+        Create or update a company keyed on Google Business URL, writing only what changed
+        
+        Incoming nulls keep the stored value and keys that aren't company
+        columns are ignored. The remaining fields, JSON ones like ``hours``
+        included, are compared to the stored company and only the differing
+        ones are set, so re-crawling an unchanged company issues no UPDATE
+        and leaves ``updated_at`` alone. ``defaults`` fill columns that are
+        empty on both the incoming and stored company (e.g. ``scraping_stage``)
+        and are written in the same commit.
+        
+        Returns:
+            (company, names of the changed fields), with None instead of the
+            names for a new company
+        """
+        values = {key: value for key, value in company_data.items() if key in COMPANY_COLUMN_KEYS}
+        # Null values are skipped on update, so only derive from the ones written
+        derived = with_derived_columns({
+            key: value for key, value in values.items()
+            if key in DERIVED_COLUMNS and value is not None
+        })
+        values.update(derived)
+        values["zone_id"] = zone_id
+        defaults = {key: value for key, value in (defaults or {}).items() if values.get(key) is None}
+        
         # Try to find existing company by google_business_url
-        google_url = company_data.get("google_business_url")
+        google_url = values.get("google_business_url")
         if google_url:
             result = await db.execute(
                 select(Company).where(Company.google_business_url == google_url)
@@ -26,22 +133,26 @@ class CompanyService:
             existing = result.scalar_one_or_none()
             
             if existing:
-                # Update existing company
-                for key, value in company_data.items():
-                    if value is not None:
-                        setattr(existing, key, value)
-                existing.zone_id = zone_id
-                await db.commit()
-                await db.refresh(existing)
-                return existing
+                for key, value in defaults.items():
+                    if getattr(existing, key) is None:
+                        values[key] = value
+                changed = changed_company_fields(existing, {
+                    key: value for key, value in values.items()
+                    if value is not None or key in derived
+                })
+                if changed:
+                    for key in changed:
+                        setattr(existing, key, values[key])
+                    await db.commit()
+                    await db.refresh(existing)
+                return existing, changed
         
         # Create new company
-        company_data["zone_id"] = zone_id
-        company = Company(**company_data)
+        company = Company(**{**values, **defaults})
         db.add(company)
         await db.commit()
         await db.refresh(company)
-        return company
+        return company, None
     
     @staticmethod
     async def get_company(db: AsyncSession, company_id: UUID) -> Optional[Company]:
@@ -49,6 +160,29 @@ class CompanyService:
         result = await db.execute(select(Company).where(Company.id == company_id))
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def find_companies_by_phone(
+        db: AsyncSession,
+        phone: str,
+        limit: int = 100
+    ) -> List[Company]:
+        """
+        Companies in any zone whose primary or dispatch number is ``phone``
+        
+        Matches on the indexed E.164 columns, so formatting doesn't matter.
+        Raises ValueError if ``phone`` isn't a valid number.
+        """
+        e164 = normalize_phone(phone)
+        if not e164:
+            raise ValueError(f"Invalid phone number: {phone}")
+        result = await db.execute(
+            select(Company)
+            .where(or_(Company.phone_primary_e164 == e164, Company.phone_dispatch_e164 == e164))
+            .order_by(Company.created_at)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+    
     @staticmethod
     async def search_companies(
         db: AsyncSession,
@@ -92,7 +226,7 @@ class CompanyService:
         if not company:
             return None
         
-        update_data = company_data.model_dump(exclude_unset=True)
+        update_data = with_derived_columns(company_data.model_dump(exclude_unset=True))
         for field, value in update_data.items():
             setattr(company, field, value)
         
@@ -100,6 +234,46 @@ class CompanyService:
         await db.refresh(company)
         return company
     
+    @staticmethod
+    async def backfill_derived_columns(db: AsyncSession, batch_size: int = 1000) -> int:
+        """
+        Fill DERIVED_COLUMNS on companies that have a source value but no derived one
+        
+        Covers rows written before a derived column existed or by paths that
+        bypass this service. Walks those companies by ID in batches, writing
+        each batch with one executemany UPDATE and committing it. Values that
+        don't normalize stay null. Returns the number of companies updated.
+        """
+        columns = [getattr(Company, key) for key in DERIVED_COLUMNS]
+        columns += [getattr(Company, derived) for derived, _ in DERIVED_COLUMNS.values()]
+        missing = or_(*(
+            and_(getattr(Company, source).isnot(None), getattr(Company, derived).is_(None))
+            for source, (derived, _) in DERIVED_COLUMNS.items()
+        ))
+        updated = 0
+        last_id = None
+        while True:
+            query = select(Company.id, *columns).where(missing)
+            if last_id is not None:
+                query = query.where(Company.id > last_id)
+            result = await db.execute(query.order_by(Company.id).limit(batch_size))
+            rows = result.all()
+            if not rows:
+                return updated
+            last_id = rows[-1].id
+            
+            values = []
+            for row in rows:
+                derived = with_derived_columns({source: getattr(row, source) for source in DERIVED_COLUMNS})
+                row_values = {key: derived[key] for key, _ in DERIVED_COLUMNS.values()}
+                # Skip rows whose missing values still don't normalize
+                if any(value is not None and getattr(row, key) is None for key, value in row_values.items()):
+                    values.append({"id": row.id, **row_values})
+            if values:
+                await db.execute(update(Company), values)
+                await db.commit()
+                updated += len(values)
+    
     @staticmethod
     async def bulk_import_companies(
         db: AsyncSession,
@@ -114,4 +288,88 @@ class CompanyService:
             )
             companies.append(company)
         return companies
-
+    
+    @staticmethod
+    async def bulk_upsert_companies(
+        db: AsyncSession,
+        companies_data: Iterable[Union[Dict[str, Any], "MappedCompany"]],
+        zone_id: UUID,
+        defaults: Optional[Dict[str, Any]] = None,
+        reassign_zone: bool = True
+    ) -> Dict[str, int]:
+        """
+        Create or update a batch of companies keyed on Google Business URL
+        
+        Existing companies are found with one SELECT and updated with one bulk
+        UPDATE (non-null fields only, like create_or_update_company); only the
+        fields that differ from the stored row are written, and companies with
+        none are left alone (``updated_at`` included) and counted as unchanged. New ones
+        are written with one bulk INSERT. Records may be dicts (keys that aren't
+        company columns are ignored) or MappedCompany records from the Apify
+        mapper, read without copying to a dict first. Later duplicates of a URL in the batch win. ``defaults``
+        fill columns that are empty on both the incoming and stored row (e.g.
+        ``scraping_stage``). The caller commits.
+        
+        Returns:
+            {'created': int, 'updated': int, 'unchanged': int, 'skipped': int}
+        """
+        defaults = defaults or {}
+        by_url: Dict[str, Dict[str, Any]] = {}
+        skipped = 0
+        for company_data in companies_data:
+            values = company_import_values(company_data)
+            google_url = values.get('google_business_url')
+            if not google_url:
+                skipped += 1
+                continue
+            by_url[google_url] = values
+        
+        if not by_url:
+            return {'created': 0, 'updated': 0, 'unchanged': 0, 'skipped': skipped}
+        
+        compared = {key for values in by_url.values() for key in values}
+        compared.update(defaults)
+        compared.add('zone_id')
+        compared.discard('google_business_url')
+        compared_columns = [getattr(Company, key) for key in sorted(compared)]
+        result = await db.execute(
+            select(Company.id, Company.google_business_url, *compared_columns)
+            .where(Company.google_business_url.in_(list(by_url)))
+        )
+        existing = {row.google_business_url: row for row in result.all()}
+        
+        updates = []
+        inserts = []
+        unchanged = 0
+        for google_url, values in by_url.items():
+            row = existing.get(google_url)
+            if row is not None:
+                for key, value in defaults.items():
+                    if key not in values and getattr(row, key) is None:
+                        values[key] = value
+                if reassign_zone:
+                    values['zone_id'] = zone_id
+                changed = changed_company_fields(row, values)
+                if changed:
+                    updates.append({'id': row.id, **{key: values[key] for key in changed}})
+                else:
+                    unchanged += 1
+                continue
+            
+            values = {**defaults, **values, 'zone_id': zone_id}
+            if any(values.get(field) is None for field in COMPANY_REQUIRED_FIELDS):
+                skipped += 1
+                continue
+            inserts.append(values)
+        
+        if updates:
+            await db.execute(update(Company), updates)
+        if inserts:
+            await db.execute(insert(Company), inserts)
+        
+        return {
+            'created': len(inserts),
+            'updated': len(updates),
+            'unchanged': unchanged,
+            'skipped': skipped,
+        }
@@ -0,0 +1,174 @@
+"""Apply Apify Contact Details Scraper results to companies with one join and one bulk update"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Table, Column, MetaData, String, JSON, select, update, bindparam, func, text
+from sqlalchemy.schema import CreateTable
+from typing import Dict, Any, List
+from app.models.company import Company
+from app.utils.normalization import normalize_domain, normalize_phone
+
+STAGING_TABLE = "contact_enrichment_staging"
+
+# Contact lists kept from each scraper item
+CONTACT_KEYS = ("emails", "phones", "facebooks", "linkedIns", "instagrams", "twitters", "youtubes")
+
+# Scraper list -> key of the social link stored in Company.services
+SOCIAL_KEYS = {
+    "linkedIns": "linkedin",
+    "instagrams": "instagram",
+    "twitters": "twitter",
+    "youtubes": "youtube",
+}
+
+ENRICHED_COLUMNS = ("email", "phone_dispatch", "phone_dispatch_e164", "facebook_page", "services")
+
+
+def _null_bind_type(column_type: Any) -> Any:
+    """Column type that binds None as SQL NULL (JSON binds it as JSON 'null' by default)"""
+    return JSON(none_as_null=True) if isinstance(column_type, JSON) else column_type
+
+
+def new_enrichment_stats() -> Dict[str, int]:
+    return {
+        'records': 0,
+        'matched': 0,
+        'updated': 0,
+        'emails_added': 0,
+        'phones_added': 0,
+        'facebook_added': 0,
+        'other_social_added': 0
+    }
+
+
+class ContactEnrichmentLoader:
+    """
+    Matches scraper items to companies by website domain
+
+    A chunk of items is staged in a temporary table keyed by
+    normalize_domain(item['url']) (the last item per domain wins) and joined
+    to ``companies.website_domain``, which is indexed. Only the matched
+    companies' contact columns are read back. Values are only filled in
+    where the company has none (social links are merged into ``services``),
+    and all changes go out as one executemany UPDATE.
+    """
+
+    @staticmethod
+    def staging_table() -> Table:
+        return Table(
+            STAGING_TABLE, MetaData(),
+            Column("domain", String, primary_key=True),
+            Column("contacts", JSON, nullable=False),
+            prefixes=["TEMPORARY"],
+        )
+
+    @staticmethod
+    def staging_rows(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One row per domain with the item's contact lists"""
+        by_domain: Dict[str, Dict[str, Any]] = {}
+        for item in items:
+            domain = normalize_domain(item.get('url'))
+            if domain:
+                by_domain[domain] = {key: item[key] for key in CONTACT_KEYS if item.get(key)}
+        return [{"domain": domain, "contacts": contacts} for domain, contacts in by_domain.items()]
+
+    @staticmethod
+    def company_updates(
+        company: Any,
+        contacts: Dict[str, Any],
+        enrichment_stats: Dict[str, int]
+    ) -> Dict[str, Any]:
+        """Contact columns to fill on a matched company (a row with ENRICHED_COLUMNS and phone_primary)"""
+        updates = {}
+
+        if contacts.get('emails') and not company.email:
+            # Use first email, skipping the scraper's placeholder domain
+            email = contacts['emails'][0]
+            if '@' in email and not email.endswith('@legit.com'):
+                updates['email'] = email
+                enrichment_stats['emails_added'] += 1
+
+        if contacts.get('phones') and not company.phone_dispatch:
+            # First valid phone that isn't the primary number becomes the dispatch line
+            current_phone = normalize_phone(company.phone_primary)
+            for phone in contacts['phones']:
+                normalized = normalize_phone(phone)
+                if normalized and normalized != current_phone:
+                    updates['phone_dispatch'] = phone
+                    updates['phone_dispatch_e164'] = normalized
+                    enrichment_stats['phones_added'] += 1
+                    break
+
+        if contacts.get('facebooks') and not company.facebook_page:
+            updates['facebook_page'] = contacts['facebooks'][0]
+            enrichment_stats['facebook_added'] += 1
+
+        social_links = {}
+        for contact_key, service_key in SOCIAL_KEYS.items():
+            if contacts.get(contact_key):
+                social_links[service_key] = contacts[contact_key][0]
+                enrichment_stats['other_social_added'] += 1
+        if social_links:
+            current_services = company.services if isinstance(company.services, dict) else {}
+            updates['services'] = {**current_services, **social_links}
+
+        return updates
+
+    @staticmethod
+    async def enrich_chunk(
+        db: AsyncSession,
+        items: List[Dict[str, Any]],
+        enrichment_stats: Dict[str, int],
+        dry_run: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Match one chunk of scraper items and apply the updates (the caller commits)
+
+        Returns:
+            [{'id': UUID, 'name': str, 'updates': dict}] for each company
+            that gets (or, with ``dry_run``, would get) new values
+        """
+        enrichment_stats['records'] += len(items)
+        rows = ContactEnrichmentLoader.staging_rows(items)
+        if not rows:
+            return []
+
+        table = ContactEnrichmentLoader.staging_table()
+        # Schema-qualified on Postgres so a permanent table of that name is never dropped
+        staging = f"pg_temp.{STAGING_TABLE}" if db.bind.dialect.name == "postgresql" else STAGING_TABLE
+        await db.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+        await db.execute(CreateTable(table))
+        await db.execute(table.insert(), rows)
+
+        result = await db.execute(
+            select(
+                Company.id, Company.name, Company.phone_primary,
+                *(getattr(Company, key) for key in ENRICHED_COLUMNS),
+                table.c.contacts,
+            ).join(table, table.c.domain == Company.website_domain)
+        )
+        changes = []
+        for company in result.all():
+            enrichment_stats['matched'] += 1
+            updates = ContactEnrichmentLoader.company_updates(company, company.contacts, enrichment_stats)
+            if updates:
+                changes.append({"id": company.id, "name": company.name, "updates": updates})
+
+        await db.execute(text(f"DROP TABLE {staging}"))
+
+        if changes and not dry_run:
+            # Every row binds every column; NULL keeps the stored value
+            columns = Company.__table__.c
+            await db.execute(
+                update(Company.__table__)
+                .where(columns.id == bindparam("b_id"))
+                .values({
+                    key: func.coalesce(bindparam(f"b_{key}", type_=_null_bind_type(columns[key].type)), columns[key])
+                    for key in ENRICHED_COLUMNS
+                }),
+                [
+                    {"b_id": change["id"], **{f"b_{key}": change["updates"].get(key) for key in ENRICHED_COLUMNS}}
+                    for change in changes
+                ]
+            )
+        if not dry_run:
+            enrichment_stats['updated'] += len(changes)
+        return changes
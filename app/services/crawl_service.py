@@ -5,7 +5,6 @@ from uuid import UUID
 from app.services.apify_service import ApifyService
 from app.services.company_service import CompanyService
 from app.services.enrichment_service import EnrichmentService
-from app.services.zone_service import ZoneService
 from app.models.company import Company
 
 
@@ -36,6 +35,8 @@ class CrawlService:
                 'companies_found': int,
                 'companies_new': int,
                 'companies_updated': int,
+                'companies_unchanged': int,
+                'fields_changed': dict,
                 'websites_scraped': int,
                 'websites_failed': int,
                 'profiles_scraped': int,
@@ -58,7 +59,12 @@ class CrawlService:
         zone_id: UUID
     ) -> Dict[str, Any]:
         """Batch scrape websites for all companies in a zone"""
-        companies = await ZoneService.get_companies_by_zone(db, zone_id)
+        companies = await self.enrichment_service.load_enrichment_targets(
+            db,
+            zone_id=zone_id,
+            only_with_website=False,
+            limit=None
+        )
         
         # Filter companies with websites
         companies_with_websites = [c for c in companies if c.website]
@@ -70,13 +76,13 @@ class CrawlService:
                 'websites_failed': 0
             }
         
-        # Use orchestrator's batch scraping
-        results = await self.orchestrator._scrape_websites_batch(db, companies_with_websites)
+        # Concurrent scrape with bulk writes
+        results = await self.enrichment_service.enrich_companies(db, companies_with_websites)
         
         return {
             'companies_processed': len(companies),
-            'websites_scraped': results['success'],
-            'websites_failed': results['failed']
+            'websites_scraped': results['websites_scraped'],
+            'websites_failed': results['websites_failed']
         }
     
     async def scrape_company_website(
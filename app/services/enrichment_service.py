@@ -1,12 +1,20 @@
 """Enrichment service"""
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any, Optional
+from sqlalchemy import select, update, and_, or_
+from typing import Dict, Any, Optional, List
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta
+import asyncio
 from app.models.company import Company
-from app.models.enrichment import EnrichmentSnapshot
 from app.services.company_service import CompanyService
 from app.services.website_scraper_service import WebsiteScraperService
+from app.services.lead_scoring_service import LARGE_FLEET_MIN_REVIEWS, MEDIUM_FLEET_MIN_REVIEWS
+from app.services.job_tracker import job_tracker
+from app.services.snapshot_service import SnapshotService
+from app.config import settings
+
+# Companies scraped and written per bulk UPDATE/INSERT round
+ENRICHMENT_BATCH_SIZE = 100
 
 
 class EnrichmentService:
@@ -21,11 +29,33 @@ class EnrichmentService:
         if not company:
             raise ValueError(f"Company {company_id} not found")
         
+        website_data = None
+        if company.website:
+            website_data = await self.website_scraper.scrape_website(company.website)
+        enrichment_data = self.build_enrichment_data(company, website_data)
+        
+        # Update company
+        for key, value in enrichment_data.items():
+            setattr(company, key, value)
+        
+        await db.commit()
+        await db.refresh(company)
+        
+        # Store snapshot
+        await self._store_snapshot(db, company_id, enrichment_data, 'website')
+        
+        return company
+    
+    def build_enrichment_data(
+        self,
+        company: Company,
+        website_data: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Turn a website scrape result plus heuristics into company field updates"""
         enrichment_data = {}
         
         # Enrich from website
-        if company.website:
-            website_data = await self.website_scraper.scrape_website(company.website)
+        if website_data:
             if website_data['status'] == 'success':
                 enrichment_data['hours_website'] = website_data['hours']
                 enrichment_data['has_impound_service'] = website_data['has_impound']
@@ -45,25 +75,148 @@ class EnrichmentService:
         if has_dispatch:
             enrichment_data['phone_dispatch'] = company.phone_dispatch
         
-        # Update company
-        for key, value in enrichment_data.items():
-            setattr(company, key, value)
+        return enrichment_data
+    
+    async def load_enrichment_targets(
+        self,
+        db: AsyncSession,
+        company_ids: Optional[List[UUID]] = None,
+        zone_id: Optional[UUID] = None,
+        only_with_website: bool = True,
+        stale_days: Optional[int] = None,
+        limit: Optional[int] = 500,
+        include_duplicates: bool = False
+    ) -> List[Company]:
+        """
+        Load every company matching an ID list and/or filter in one query
         
-        await db.commit()
-        await db.refresh(company)
+        Duplicate listings (see EntityResolutionService) are left out unless
+        ``include_duplicates`` is set; their canonical company is enriched instead.
+        """
+        conditions = []
+        if not include_duplicates:
+            conditions.append(Company.canonical_company_id == None)
+        if company_ids:
+            conditions.append(Company.id.in_(company_ids))
+        if zone_id:
+            conditions.append(Company.zone_id == zone_id)
+        if only_with_website:
+            conditions.append(Company.website != None)
+        if stale_days is not None:
+            cutoff_date = datetime.utcnow() - timedelta(days=stale_days)
+            conditions.append(
+                or_(
+                    Company.website_scraped_at == None,
+                    Company.website_scraped_at < cutoff_date
+                )
+            )
         
-        # Store snapshot
-        await self._store_snapshot(db, company_id, enrichment_data, 'website')
+        query = select(Company)
+        if conditions:
+            query = query.where(and_(*conditions))
+        if limit:
+            query = query.limit(limit)
         
-        return company
+        result = await db.execute(query)
+        return list(result.scalars().all())
+    
+    async def enrich_companies(
+        self,
+        db: AsyncSession,
+        companies: List[Company],
+        job_id: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Enrich many already-loaded companies
+        
+        Websites are scraped concurrently (bounded by ``website_scrape_concurrent``).
+        Each batch is written with one bulk UPDATE and one bulk snapshot INSERT.
+        
+        Returns:
+            {'companies_processed': int, 'websites_scraped': int, 'websites_failed': int}
+        """
+        semaphore = asyncio.Semaphore(settings.website_scrape_concurrent)
+        stats = {'companies_processed': 0, 'websites_scraped': 0, 'websites_failed': 0}
+        
+        async def scrape_with_limit(company: Company) -> Optional[Dict[str, Any]]:
+            if not company.website:
+                return None
+            async with semaphore:
+                return await self.website_scraper.scrape_website(company.website)
+        
+        for start in range(0, len(companies), ENRICHMENT_BATCH_SIZE):
+            batch = companies[start:start + ENRICHMENT_BATCH_SIZE]
+            website_results = await asyncio.gather(
+                *(scrape_with_limit(company) for company in batch),
+                return_exceptions=True
+            )
+            
+            company_updates = []
+            snapshots = []
+            scraped = 0
+            failed = 0
+            for company, website_data in zip(batch, website_results):
+                if isinstance(website_data, Exception):
+                    print(f"Error scraping website for company {company.id}: {website_data}")
+                    website_data = {'status': 'failed'}
+                
+                enrichment_data = self.build_enrichment_data(company, website_data)
+                scrape_status = enrichment_data.get('website_scrape_status')
+                if scrape_status == 'success':
+                    enrichment_data['scraping_stage'] = 'website_scraped'
+                    scraped += 1
+                elif scrape_status:
+                    failed += 1
+                
+                if enrichment_data:
+                    company_updates.append({'id': company.id, **enrichment_data})
+                snapshots.append((company.id, enrichment_data))
+            
+            if company_updates:
+                await db.execute(update(Company), company_updates)
+            await SnapshotService.store_snapshots(db, snapshots, 'website')
+            await db.commit()
+            
+            stats['companies_processed'] += len(batch)
+            stats['websites_scraped'] += scraped
+            stats['websites_failed'] += failed
+            if job_id:
+                job_tracker.advance(job_id, succeeded=len(batch) - failed, failed=failed)
+        
+        return stats
+    
+    async def run_enrichment_job(
+        self,
+        job_id: str,
+        company_ids: List[UUID]
+    ) -> None:
+        """Background entry point: enrich the given companies and record progress"""
+        from app.database import AsyncSessionLocal
+        
+        job_tracker.start(job_id)
+        try:
+            async with AsyncSessionLocal() as db:
+                companies = await self.load_enrichment_targets(
+                    db,
+                    company_ids=company_ids,
+                    only_with_website=False,
+                    limit=len(company_ids)
+                )
+                await self.enrich_companies(db, companies, job_id=job_id)
+            job_tracker.finish(job_id)
+        except Exception as e:
+            print(f"Error running enrichment job {job_id}: {e}")
+            job_tracker.finish(job_id, error=str(e))
+        finally:
+            await self.close()
     
     def detect_fleet_size(self, company: Company) -> Optional[str]:
         """Detect fleet size based on heuristics"""
         # Simple heuristic based on review count and rating
         if company.review_count:
-            if company.review_count > 500:
+            if company.review_count > LARGE_FLEET_MIN_REVIEWS:
                 return 'large'
-            elif company.review_count > 100:
+            elif company.review_count > MEDIUM_FLEET_MIN_REVIEWS:
                 return 'medium'
             else:
                 return 'small'
@@ -81,13 +234,8 @@ class EnrichmentService:
         snapshot_data: Dict[str, Any],
         source: str
     ):
-        """Store enrichment snapshot"""
-        snapshot = EnrichmentSnapshot(
-            company_id=company_id,
-            snapshot_data=snapshot_data,
-            enrichment_source=source
-        )
-        db.add(snapshot)
+        """Store enrichment snapshot (skipped when nothing changed since the last one)"""
+        await SnapshotService.store_snapshots(db, [(company_id, snapshot_data)], source)
         await db.commit()
     
     async def enrich_from_facebook(self, db: AsyncSession, company: Company) -> Dict[str, Any]:
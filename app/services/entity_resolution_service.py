@@ -0,0 +1,331 @@
+"""Duplicate listing detection: blocking, pair scoring and clustering"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, bindparam
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
+from datetime import datetime
+import logging
+import math
+from app.models.company import Company
+from app.models.outreach import OutreachAssignment
+from app.services.job_tracker import job_tracker
+from app.utils.normalization import geohash, name_tokens
+
+logger = logging.getLogger(__name__)
+
+# Relative weight of each signal in a pair's score (capped at 1.0)
+DUPLICATE_SCORE_WEIGHTS: Dict[str, float] = {
+    'phone': 0.5,
+    'domain': 0.4,
+    'name': 0.4,  # times the Jaccard similarity of the name tokens
+    'nearby': 0.2,
+}
+
+# Pairs scoring at least this are the same business
+DUPLICATE_THRESHOLD = 0.6
+
+# Listings within this distance count as the same location
+NEARBY_KM = 1.0
+
+# Geohash precision of the location blocks (about 4.9 x 4.9 km cells)
+BLOCK_GEOHASH_PRECISION = 5
+
+# Larger blocks (answering services, directory domains) are skipped
+MAX_BLOCK_SIZE = 50
+
+# Website hosts shared by unrelated businesses
+SHARED_DOMAINS = frozenset((
+    "facebook.com", "m.facebook.com", "instagram.com", "google.com", "sites.google.com",
+    "business.site", "yelp.com", "linktr.ee",
+))
+
+# Assignments that still send outreach
+OPEN_ASSIGNMENT_STATUSES = ('pending', 'active', 'paused')
+
+RESOLUTION_COLUMNS = (
+    Company.id,
+    Company.name,
+    Company.phone_primary_e164,
+    Company.phone_dispatch_e164,
+    Company.website_domain,
+    Company.latitude,
+    Company.longitude,
+    Company.review_count,
+    Company.created_at,
+    Company.canonical_company_id,
+    Company.duplicate_score,
+)
+
+
+class ListingRecord:
+    """The matching inputs of one company"""
+
+    __slots__ = ("id", "phones", "domain", "tokens", "latitude", "longitude", "review_count", "created_at")
+
+    def __init__(self, row: Any):
+        self.id = row.id
+        self.phones = frozenset(filter(None, (row.phone_primary_e164, row.phone_dispatch_e164)))
+        self.domain = row.website_domain if row.website_domain not in SHARED_DOMAINS else None
+        self.tokens = name_tokens(row.name)
+        has_location = row.latitude is not None and row.longitude is not None
+        self.latitude = row.latitude if has_location else None
+        self.longitude = row.longitude if has_location else None
+        self.review_count = row.review_count or 0
+        self.created_at = row.created_at
+
+    def blocking_keys(self) -> Iterator[Tuple[str, ...]]:
+        for phone in self.phones:
+            yield ('phone', phone)
+        if self.domain:
+            yield ('domain', self.domain)
+        if self.latitude is not None:
+            cell = geohash(self.latitude, self.longitude, BLOCK_GEOHASH_PRECISION)
+            for token in self.tokens:
+                yield ('geo', cell, token)
+
+
+def distance_km(a: ListingRecord, b: ListingRecord) -> Optional[float]:
+    """Great-circle distance between two listings, None if either has no location"""
+    if a.latitude is None or b.latitude is None:
+        return None
+    lat1, lng1, lat2, lng2 = map(math.radians, (a.latitude, a.longitude, b.latitude, b.longitude))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(min(1.0, h)))
+
+
+class EntityResolutionService:
+    """Service for finding listings of the same business across zones and URLs"""
+
+    @staticmethod
+    def candidate_pairs(records: List[ListingRecord]) -> Tuple[Set[Tuple[int, int]], int]:
+        """
+        Index pairs that share a blocking key
+
+        Keys are each normalized phone, the website domain, and the location
+        cell plus each distinctive name token, so only listings with something
+        in common are compared instead of all pairs.
+
+        Returns:
+            (pairs as (i, j) with i < j, number of blocks skipped for size)
+        """
+        blocks: Dict[Tuple[str, ...], List[int]] = {}
+        for index, record in enumerate(records):
+            for key in record.blocking_keys():
+                blocks.setdefault(key, []).append(index)
+
+        pairs: Set[Tuple[int, int]] = set()
+        oversized = 0
+        for members in blocks.values():
+            if len(members) > MAX_BLOCK_SIZE:
+                oversized += 1
+                continue
+            for position, i in enumerate(members):
+                for j in members[position + 1:]:
+                    pairs.add((i, j) if i < j else (j, i))
+        return pairs, oversized
+
+    @staticmethod
+    def score_pair(a: ListingRecord, b: ListingRecord) -> float:
+        """Likelihood (0.0-1.0) that two listings are the same business"""
+        score = 0.0
+        if a.phones & b.phones:
+            score += DUPLICATE_SCORE_WEIGHTS['phone']
+        if a.domain and a.domain == b.domain:
+            score += DUPLICATE_SCORE_WEIGHTS['domain']
+        if a.tokens and b.tokens:
+            similarity = len(a.tokens & b.tokens) / len(a.tokens | b.tokens)
+            score += DUPLICATE_SCORE_WEIGHTS['name'] * similarity
+        distance = distance_km(a, b)
+        if distance is not None and distance <= NEARBY_KM:
+            score += DUPLICATE_SCORE_WEIGHTS['nearby']
+        return min(1.0, round(score, 3))
+
+    @staticmethod
+    def cluster(
+        records: List[ListingRecord],
+        matches: List[Tuple[int, int, float]]
+    ) -> Dict[int, Tuple[int, float]]:
+        """
+        Group matched pairs into clusters (union-find) and pick each canonical
+
+        The canonical listing has the most reviews, then the earliest creation.
+
+        Returns:
+            {index of each duplicate: (index of its canonical, best match score)}
+        """
+        parent = list(range(len(records)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        best_score: Dict[int, float] = {}
+        for i, j, score in matches:
+            parent[find(i)] = find(j)
+            best_score[i] = max(best_score.get(i, 0.0), score)
+            best_score[j] = max(best_score.get(j, 0.0), score)
+
+        clusters: Dict[int, List[int]] = {}
+        for index in best_score:
+            clusters.setdefault(find(index), []).append(index)
+
+        def canonical_order(index: int) -> Tuple[int, datetime, str]:
+            record = records[index]
+            return (-record.review_count, record.created_at or datetime.max, str(record.id))
+
+        duplicates = {}
+        for members in clusters.values():
+            canonical = min(members, key=canonical_order)
+            for index in members:
+                if index != canonical:
+                    duplicates[index] = (canonical, best_score[index])
+        return duplicates
+
+    @staticmethod
+    async def move_duplicate_assignments(db: AsyncSession) -> Tuple[int, int]:
+        """
+        Hand open outreach assignments of duplicates to their canonical company
+
+        An assignment moves to the canonical company unless that company
+        already has an open assignment for the same sequence, in which case
+        it's marked ``skipped``. The oldest assignment wins among duplicates.
+        The caller commits.
+
+        Returns:
+            (moved, skipped)
+        """
+        canonical_ids = select(Company.canonical_company_id).where(Company.canonical_company_id != None)
+        result = await db.execute(
+            select(OutreachAssignment.company_id, OutreachAssignment.sequence_id)
+            .where(
+                OutreachAssignment.company_id.in_(canonical_ids),
+                OutreachAssignment.status.in_(OPEN_ASSIGNMENT_STATUSES)
+            )
+        )
+        taken = {(row.company_id, row.sequence_id) for row in result.all()}
+
+        result = await db.execute(
+            select(OutreachAssignment.id, OutreachAssignment.sequence_id, Company.canonical_company_id)
+            .join(Company, OutreachAssignment.company_id == Company.id)
+            .where(
+                Company.canonical_company_id != None,
+                OutreachAssignment.status.in_(OPEN_ASSIGNMENT_STATUSES)
+            )
+            .order_by(OutreachAssignment.created_at, OutreachAssignment.id)
+        )
+        moves = []
+        skips = []
+        for row in result.all():
+            key = (row.canonical_company_id, row.sequence_id)
+            if key in taken:
+                skips.append({'b_id': row.id})
+            else:
+                taken.add(key)
+                moves.append({'b_id': row.id, 'b_company_id': row.canonical_company_id})
+
+        table = OutreachAssignment.__table__
+        if moves:
+            await db.execute(
+                update(table)
+                .where(table.c.id == bindparam('b_id'))
+                .values(company_id=bindparam('b_company_id', type_=table.c.company_id.type)),
+                moves
+            )
+        if skips:
+            await db.execute(
+                update(table)
+                .where(table.c.id == bindparam('b_id'))
+                .values(status='skipped', next_step_due_at=None),
+                skips
+            )
+        return len(moves), len(skips)
+
+    @staticmethod
+    async def resolve_duplicates(db: AsyncSession) -> Dict[str, int]:
+        """
+        Find duplicate listings across all zones and record their clusters
+
+        Candidate pairs come from the blocking keys, are scored, and pairs at
+        DUPLICATE_THRESHOLD or above are merged into clusters. Each duplicate
+        gets ``canonical_company_id`` and ``duplicate_score``; canonical and
+        unmatched companies get nulls. Only changed rows are written, with one
+        executemany UPDATE that leaves ``updated_at`` alone. Open outreach
+        assignments of duplicates then move to their canonical company (see
+        move_duplicate_assignments). Run it after the match key backfill so
+        every listing has its phone and domain keys.
+
+        Returns:
+            {
+                'companies': int,
+                'candidate_pairs': int,
+                'duplicate_pairs': int,
+                'oversized_blocks': int,
+                'clusters': int,
+                'duplicates': int,
+                'updated': int,
+                'assignments_moved': int,
+                'assignments_skipped': int
+            }
+        """
+        result = await db.execute(select(*RESOLUTION_COLUMNS))
+        rows = result.all()
+        records = [ListingRecord(row) for row in rows]
+
+        pairs, oversized = EntityResolutionService.candidate_pairs(records)
+        matches = []
+        for i, j in pairs:
+            score = EntityResolutionService.score_pair(records[i], records[j])
+            if score >= DUPLICATE_THRESHOLD:
+                matches.append((i, j, score))
+        duplicates = EntityResolutionService.cluster(records, matches)
+
+        params = []
+        for index, row in enumerate(rows):
+            canonical, score = duplicates.get(index, (None, None))
+            canonical_id = records[canonical].id if canonical is not None else None
+            if (canonical_id, score) != (row.canonical_company_id, row.duplicate_score):
+                params.append({'b_id': row.id, 'b_canonical_id': canonical_id, 'b_score': score})
+
+        if params:
+            table = Company.__table__
+            await db.execute(
+                update(table)
+                .where(table.c.id == bindparam('b_id'))
+                .values(
+                    canonical_company_id=bindparam('b_canonical_id', type_=table.c.canonical_company_id.type),
+                    duplicate_score=bindparam('b_score'),
+                    updated_at=table.c.updated_at,
+                ),
+                params
+            )
+        assignments_moved, assignments_skipped = await EntityResolutionService.move_duplicate_assignments(db)
+        await db.commit()
+
+        return {
+            'companies': len(records),
+            'candidate_pairs': len(pairs),
+            'duplicate_pairs': len(matches),
+            'oversized_blocks': oversized,
+            'clusters': len({canonical for canonical, _ in duplicates.values()}),
+            'duplicates': len(duplicates),
+            'updated': len(params),
+            'assignments_moved': assignments_moved,
+            'assignments_skipped': assignments_skipped,
+        }
+
+    @staticmethod
+    async def run_resolution_job(job_id: str) -> None:
+        """Background entry point: resolve duplicates and record the result on the job"""
+        from app.database import AsyncSessionLocal
+
+        job_tracker.start(job_id)
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await EntityResolutionService.resolve_duplicates(db)
+            job_tracker.advance(job_id, succeeded=1)
+            job_tracker.finish(job_id, result=result)
+        except Exception as e:
+            logger.exception(f"Error running duplicate resolution job {job_id}")
+            job_tracker.advance(job_id, failed=1)
+            job_tracker.finish(job_id, error=str(e))
@@ -1,15 +1,204 @@
 """Environment configuration service"""
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional, Dict
+from sqlalchemy import select, text
+from typing import List, Optional, Dict, Tuple
 from uuid import UUID
 from app.models.environment_config import EnvironmentConfig
 from app.config import settings
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Postgres NOTIFY channel carrying the name of a changed environment
+ENV_CHANGE_CHANNEL = "environment_config_changed"
+
+# Seconds between health checks of the LISTEN connection
+ENV_LISTEN_CHECK_SECONDS = 30.0
+
+# Reconnect backoff of the LISTEN connection (doubles up to the maximum)
+ENV_LISTEN_RETRY_SECONDS = 1.0
+ENV_LISTEN_MAX_RETRY_SECONDS = 60.0
+
+
+class EnvCache:
+    """
+    Per-environment cache of all config values
+    
+    Each environment is loaded whole and kept for ``env_cache_ttl`` seconds, so
+    individual reads are dict lookups. Writes through EnvService invalidate the
+    environment locally and, with ``env_cache_notify``, in other processes.
+    """
+    
+    def __init__(self):
+        self._entries: Dict[str, Tuple[float, Dict[str, str]]] = {}
+    
+    def get(self, environment: str) -> Optional[Dict[str, str]]:
+        """Cached values for an environment, if still fresh"""
+        entry = self._entries.get(environment)
+        if entry is None:
+            return None
+        expires_at, values = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(environment, None)
+            return None
+        return values
+    
+    def set(self, environment: str, values: Dict[str, str]) -> None:
+        """Cache the values for an environment"""
+        if settings.env_cache_ttl <= 0:
+            return
+        self._entries[environment] = (time.monotonic() + settings.env_cache_ttl, values)
+    
+    def invalidate(self, environment: Optional[str] = None) -> None:
+        """Drop one environment, or everything"""
+        if environment is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(environment, None)
+
+
+env_cache = EnvCache()
+
+
+class EnvChangeListener:
+    """
+    Invalidates env_cache when another process changes config (Postgres only)
+    
+    A background task holds one connection open with LISTEN on
+    ENV_CHANGE_CHANNEL and checks it every ``ENV_LISTEN_CHECK_SECONDS``. When
+    the connection drops, every cached environment is invalidated (changes
+    may be missed meanwhile) and the task reconnects with exponential backoff.
+    LISTEN needs a real session, so with ``db_pgbouncer_mode`` (transaction
+    pooling) the listener doesn't start and caches rely on ``env_cache_ttl``.
+    """
+    
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.connected = asyncio.Event()
+    
+    def _on_notify(self, connection, pid, channel, payload):
+        env_cache.invalidate(payload or None)
+    
+    async def start(self, engine) -> bool:
+        """Start listening; returns False when the database can't notify"""
+        if self._task is not None:
+            return True
+        if engine.dialect.name != "postgresql" or engine.dialect.driver != "asyncpg":
+            return False
+        if settings.db_pgbouncer_mode:
+            logger.warning(
+                "env_cache_notify is ignored with db_pgbouncer_mode (LISTEN needs a session "
+                "connection); env caches expire after env_cache_ttl only"
+            )
+            return False
+        
+        self._task = asyncio.create_task(self._run(engine))
+        return True
+    
+    async def _listen(self, engine) -> None:
+        """Listen on one connection until it fails"""
+        async with engine.connect() as connection:
+            raw = await connection.get_raw_connection()
+            driver_connection = raw.driver_connection
+            lost = asyncio.Event()
+            driver_connection.add_termination_listener(lambda _: lost.set())
+            await driver_connection.add_listener(ENV_CHANGE_CHANNEL, self._on_notify)
+            try:
+                # Changes made while not listening were missed
+                env_cache.invalidate()
+                self.connected.set()
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=ENV_LISTEN_CHECK_SECONDS)
+                    except asyncio.TimeoutError:
+                        try:
+                            await asyncio.wait_for(
+                                driver_connection.execute("SELECT 1"), timeout=ENV_LISTEN_CHECK_SECONDS
+                            )
+                        except Exception:
+                            lost.set()
+                            raise
+            finally:
+                self.connected.clear()
+                if lost.is_set():
+                    await connection.invalidate()
+                else:
+                    await driver_connection.remove_listener(ENV_CHANGE_CHANNEL, self._on_notify)
+    
+    async def _run(self, engine) -> None:
+        """Keep a listening connection open, reconnecting with backoff"""
+        delay = ENV_LISTEN_RETRY_SECONDS
+        while True:
+            started = time.monotonic()
+            try:
+                await self._listen(engine)
+                error = "connection closed"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = str(e)
+            env_cache.invalidate()
+            if time.monotonic() - started > ENV_LISTEN_MAX_RETRY_SECONDS:
+                # It was up for a while; start the backoff over
+                delay = ENV_LISTEN_RETRY_SECONDS
+            logger.warning(f"Env change listener lost ({error}); reconnecting in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, ENV_LISTEN_MAX_RETRY_SECONDS)
+    
+    async def stop(self) -> None:
+        """Stop listening and return the connection to the pool"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._task = None
+
+
+env_change_listener = EnvChangeListener()
 
 
 class EnvService:
     """Service for environment variable management"""
     
+    @staticmethod
+    async def get_env_vars(
+        db: AsyncSession,
+        environment: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        All values for an environment, served from env_cache when fresh
+        
+        The returned dict is shared with the cache; don't mutate it.
+        """
+        env = environment or settings.environment
+        
+        values = env_cache.get(env)
+        if values is None:
+            result = await db.execute(
+                select(EnvironmentConfig.key, EnvironmentConfig.value)
+                .where(EnvironmentConfig.environment == env)
+            )
+            values = {row.key: row.value for row in result.all()}
+            env_cache.set(env, values)
+        return values
+    
+    @staticmethod
+    async def _notify_change(db: AsyncSession, env: str) -> None:
+        """Invalidate an environment here and, if enabled, in other processes"""
+        env_cache.invalidate(env)
+        if settings.env_cache_notify and db.bind.dialect.name == "postgresql":
+            # Delivered to listeners when the transaction commits
+            await db.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {'channel': ENV_CHANGE_CHANNEL, 'payload': env}
+            )
+    
     @staticmethod
     async def get_env_var(
         db: AsyncSession,
@@ -17,21 +206,9 @@ class EnvService:
         environment: Optional[str] = None
     ) -> Optional[str]:
         """Get environment variable value"""
-        env = environment or settings.environment
-        
-        result = await db.execute(
-            select(EnvironmentConfig)
-            .where(
-                EnvironmentConfig.key == key,
-                EnvironmentConfig.environment == env
-            )
-        )
-        config = result.scalar_one_or_none()
-        
-        if config:
-            # In production, decrypt if encrypted
-            return config.value
-        return None
+        # In production, decrypt if encrypted
+        values = await EnvService.get_env_vars(db, environment)
+        return values.get(key)
     
     @staticmethod
     async def set_env_var(
@@ -76,7 +253,10 @@ class EnvService:
             )
             db.add(config)
         
+        await EnvService._notify_change(db, env)
         await db.commit()
+        # Drop anything a concurrent reader cached between invalidate and commit
+        env_cache.invalidate(env)
         await db.refresh(config)
         return config
     
@@ -100,7 +280,9 @@ class EnvService:
         
         if config:
             await db.delete(config)
+            await EnvService._notify_change(db, env)
             await db.commit()
+            env_cache.invalidate(env)
             return True
         return False
     
@@ -142,14 +324,5 @@ class EnvService:
         environment: Optional[str] = None
     ) -> Dict[str, str]:
         """Load all environment variables as dictionary"""
-        env = environment or settings.environment
-        
-        result = await db.execute(
-            select(EnvironmentConfig).where(
-                EnvironmentConfig.environment == env
-            )
-        )
-        configs = result.scalars().all()
-        
-        return {config.key: config.value for config in configs}
+        return dict(await EnvService.get_env_vars(db, environment))
 
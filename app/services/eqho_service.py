@@ -1,18 +1,35 @@
 """Eqho.ai integration service for voice AI outreach"""
-import httpx
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from app.config import settings
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Leads sent per upload request on the bulk path
+EQHO_LEAD_UPLOAD_BATCH_SIZE = 1000
+
+# Concurrent call triggers on the bulk path
+EQHO_CALL_CONCURRENCY = 10
+
+# Seconds a campaign's lead list ID is reused before it is looked up again
+EQHO_CAMPAIGN_LIST_TTL_SECONDS = 3600
+
 
 class EqhoService:
     """Service for integrating with Eqho.ai API"""
     
+    # Lead list used per campaign as (list_id, cached at), shared across
+    # instances so lists are reused; the lock is shared too, so concurrent
+    # instances don't each create a list
+    _campaign_lists: Dict[str, Tuple[str, float]] = {}
+    _campaign_lists_lock = asyncio.Lock()
+    
     def __init__(self):
         self.api_token = settings.eqho_api_token
         self.base_url = settings.eqho_api_url or "https://api.eqho.ai/v1"
+        import httpx
         self.client = httpx.AsyncClient(
             headers={
                 "Authorization": f"Bearer {self.api_token}",
@@ -21,6 +38,56 @@ class EqhoService:
             timeout=60.0
         )
     
+    @staticmethod
+    def build_lead(company: Any) -> Dict[str, Any]:
+        """Build an Eqho lead payload from a company (entity or row)"""
+        name_parts = company.name.split() if company.name else []
+        return {
+            'first_name': name_parts[0] if name_parts else 'Business',
+            'last_name': ' '.join(name_parts[1:]),
+            'phone': company.phone_primary,
+            'email': company.email,
+            'custom_fields': {
+                'company_id': str(company.id),
+                'company_name': company.name,
+                'address_city': company.address_city,
+                'address_state': company.address_state,
+                'zone_id': str(company.zone_id) if company.zone_id else None,
+                'source': company.source
+            }
+        }
+    
+    @classmethod
+    def _cached_campaign_list(cls, campaign_id: str) -> Optional[str]:
+        cached = cls._campaign_lists.get(campaign_id)
+        if cached and time.monotonic() - cached[1] < EQHO_CAMPAIGN_LIST_TTL_SECONDS:
+            return cached[0]
+        return None
+    
+    async def get_campaign_list(self, campaign_id: str) -> str:
+        """Get the lead list for a campaign, creating it on first use"""
+        list_id = self._cached_campaign_list(campaign_id)
+        if list_id:
+            return list_id
+        
+        async with EqhoService._campaign_lists_lock:
+            list_id = self._cached_campaign_list(campaign_id)
+            if not list_id:
+                list_data = await self.create_lead_list(
+                    name=f"TowPilot Leads - {campaign_id}",
+                    description="Leads from TowPilot scraper"
+                )
+                list_id = list_data.get('id')
+                EqhoService._campaign_lists[campaign_id] = (list_id, time.monotonic())
+        return list_id
+    
+    @classmethod
+    def forget_campaign_list(cls, campaign_id: str, list_id: Optional[str] = None) -> None:
+        """Drop a campaign's cached lead list (only if it is ``list_id``, when given)"""
+        cached = cls._campaign_lists.get(campaign_id)
+        if cached and (list_id is None or cached[0] == list_id):
+            del cls._campaign_lists[campaign_id]
+    
     async def upload_leads_to_campaign(
         self,
         campaign_id: str,
@@ -38,21 +105,23 @@ class EqhoService:
                 - phone (required)
                 - email (optional)
                 - custom_fields (optional dict)
-            list_id: Optional existing lead list ID, otherwise creates new list
+            list_id: Optional existing lead list ID, otherwise the campaign's list
         
         Returns:
             Dict with list_id and upload status
         """
-        # Create or use existing lead list
-        if not list_id:
-            list_data = await self.create_lead_list(
-                name=f"TowPilot Leads - {campaign_id}",
-                description="Leads from TowPilot scraper"
-            )
-            list_id = list_data.get('id')
+        # Reuse the campaign's lead list unless one is given
+        cached = not list_id
+        if cached:
+            list_id = await self.get_campaign_list(campaign_id)
         
-        # Upload leads
-        upload_result = await self.upload_leads(list_id, leads)
+        # Upload leads; a failed upload may mean the cached list is gone
+        try:
+            upload_result = await self.upload_leads(list_id, leads)
+        except Exception:
+            if cached:
+                self.forget_campaign_list(campaign_id, list_id)
+            raise
         
         return {
             'list_id': list_id,
@@ -81,12 +150,25 @@ class EqhoService:
         list_id: str,
         leads: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
-        """Upload leads to a lead list"""
+        """
+        Upload leads to a lead list in one request
+        
+        Returns:
+            Dict with 'leads': one entry per created lead with its 'id' and the
+            'company_id' from its custom fields
+        """
         # Note: Using MCP tool pattern - in production, this would be an HTTP API call
         logger.info(f"Uploading {len(leads)} leads to list {list_id}")
         return {
             'success': True,
-            'leads_count': len(leads)
+            'leads_count': len(leads),
+            'leads': [
+                {
+                    'id': 'pending_api_integration',
+                    'company_id': (lead.get('custom_fields') or {}).get('company_id')
+                }
+                for lead in leads
+            ]
         }
     
     async def trigger_call(
@@ -131,6 +213,29 @@ class EqhoService:
         logger.info(f"Triggering immediate call for lead {lead_id}")
         return await self.trigger_call(campaign_id, lead_id)
     
+    async def trigger_calls(
+        self,
+        campaign_id: str,
+        lead_ids: List[str],
+        concurrency: int = EQHO_CALL_CONCURRENCY
+    ) -> List[Any]:
+        """
+        Trigger calls for many leads with bounded concurrency
+        
+        Returns:
+            Call result or raised exception per lead, in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def trigger(lead_id: str):
+            async with semaphore:
+                return await self.trigger_call_now(campaign_id, lead_id)
+        
+        return await asyncio.gather(
+            *(trigger(lead_id) for lead_id in lead_ids),
+            return_exceptions=True
+        )
+    
     async def get_call_status(
         self,
         call_id: str
@@ -0,0 +1,98 @@
+"""Scheduled job run history and duration metrics"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, case
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta
+from app.models.job_run import JobRun
+
+
+class JobRunService:
+    """Service for recording scheduled job runs and summarizing their durations"""
+
+    @staticmethod
+    async def record_run(
+        db: AsyncSession,
+        job_id: str,
+        instance_id: str,
+        status: str,
+        started_at: datetime,
+        finished_at: Optional[datetime] = None,
+        error: Optional[str] = None
+    ) -> JobRun:
+        """Record one job run ('succeeded', 'failed' or 'skipped')"""
+        duration = None
+        if finished_at is not None:
+            duration = (finished_at - started_at).total_seconds()
+
+        run = JobRun(
+            job_id=job_id,
+            instance_id=instance_id,
+            status=status,
+            started_at=started_at,
+            finished_at=finished_at,
+            duration_seconds=duration,
+            error=error,
+        )
+        db.add(run)
+        await db.commit()
+        return run
+
+    @staticmethod
+    async def get_job_stats(db: AsyncSession, since_days: int = 7) -> List[Dict[str, Any]]:
+        """
+        Per-job run counts and durations over the last ``since_days`` days
+
+        Skipped runs (another instance held the job lock) are counted but don't
+        contribute to durations.
+
+        Returns:
+            [{
+                'job_id': str, 'runs': int, 'succeeded': int, 'failed': int, 'skipped': int,
+                'avg_duration_seconds': float | None, 'max_duration_seconds': float | None,
+                'last_started_at': datetime, 'last_status': str,
+                'last_duration_seconds': float | None
+            }]
+        """
+        since = datetime.utcnow() - timedelta(days=since_days)
+
+        def count_status(status: str):
+            return func.sum(case((JobRun.status == status, 1), else_=0))
+
+        result = await db.execute(
+            select(
+                JobRun.job_id,
+                func.count(JobRun.id).label('runs'),
+                count_status('succeeded').label('succeeded'),
+                count_status('failed').label('failed'),
+                count_status('skipped').label('skipped'),
+                func.avg(JobRun.duration_seconds).label('avg_duration_seconds'),
+                func.max(JobRun.duration_seconds).label('max_duration_seconds'),
+                func.max(JobRun.started_at).label('last_started_at'),
+            )
+            .where(JobRun.started_at >= since)
+            .group_by(JobRun.job_id)
+            .order_by(JobRun.job_id)
+        )
+        stats = [dict(row._mapping) for row in result.all()]
+
+        # Latest run per job, for its status and duration
+        latest = (
+            select(JobRun.job_id, func.max(JobRun.started_at).label('started_at'))
+            .where(JobRun.started_at >= since)
+            .group_by(JobRun.job_id)
+            .subquery()
+        )
+        result = await db.execute(
+            select(JobRun.job_id, JobRun.status, JobRun.duration_seconds)
+            .join(
+                latest,
+                (JobRun.job_id == latest.c.job_id) & (JobRun.started_at == latest.c.started_at)
+            )
+        )
+        last_runs = {row.job_id: row for row in result.all()}
+
+        for entry in stats:
+            last = last_runs.get(entry['job_id'])
+            entry['last_status'] = last.status if last else None
+            entry['last_duration_seconds'] = last.duration_seconds if last else None
+        return stats
@@ -0,0 +1,80 @@
+"""In-process tracker for long-running background jobs"""
+from typing import Dict, Any, Optional
+from datetime import datetime
+from uuid import uuid4
+
+
+class JobTracker:
+    """
+    Tracks progress of background jobs started from API endpoints
+
+    State lives in the worker process that started the job, so progress must be
+    polled from the same instance (fine for single-worker deployments).
+    """
+
+    MAX_JOBS = 500
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    def create(self, kind: str, total: int) -> str:
+        """Register a new job and return its ID"""
+        if len(self._jobs) >= self.MAX_JOBS:
+            self._evict_finished()
+
+        job_id = str(uuid4())
+        self._jobs[job_id] = {
+            'job_id': job_id,
+            'kind': kind,
+            'status': 'pending',
+            'total': total,
+            'processed': 0,
+            'succeeded': 0,
+            'failed': 0,
+            'error': None,
+            'result': None,
+            'created_at': datetime.utcnow(),
+            'finished_at': None,
+        }
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of the job state"""
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    def start(self, job_id: str) -> None:
+        """Mark a job as running"""
+        self._jobs[job_id]['status'] = 'running'
+
+    def advance(self, job_id: str, succeeded: int = 0, failed: int = 0) -> None:
+        """Record progress for a job"""
+        job = self._jobs[job_id]
+        job['succeeded'] += succeeded
+        job['failed'] += failed
+        job['processed'] += succeeded + failed
+
+    def finish(
+        self,
+        job_id: str,
+        error: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Mark a job as completed or failed, with an optional result summary"""
+        job = self._jobs[job_id]
+        job['status'] = 'failed' if error else 'completed'
+        job['error'] = error
+        job['result'] = result
+        job['finished_at'] = datetime.utcnow()
+
+    def _evict_finished(self) -> None:
+        """Drop the oldest finished jobs to keep memory bounded"""
+        finished = sorted(
+            (job for job in self._jobs.values() if job['finished_at']),
+            key=lambda job: job['finished_at']
+        )
+        for job in finished[:len(finished) // 2 or 1]:
+            self._jobs.pop(job['job_id'], None)
+
+
+job_tracker = JobTracker()
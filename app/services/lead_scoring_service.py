@@ -0,0 +1,190 @@
+"""Vectorized lead scoring service"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, bindparam, func
+from typing import Dict, Any, Optional, TYPE_CHECKING
+from uuid import UUID
+from app.models.company import Company
+
+# NumPy is imported inside the scoring methods so API startup doesn't load it
+if TYPE_CHECKING:
+    import numpy as np
+
+# Relative weight of each signal in the composite score (sums to 1.0)
+LEAD_SCORE_WEIGHTS: Dict[str, float] = {
+    'rating': 0.20,
+    'review_count': 0.20,
+    'impound': 0.25,
+    'is_24_7': 0.15,
+    'website': 0.10,
+    'email': 0.10,
+}
+
+# Review count at which the review signal saturates
+REVIEW_COUNT_SATURATION = 1000
+
+# Fleet size thresholds, shared with EnrichmentService.detect_fleet_size
+LARGE_FLEET_MIN_REVIEWS = 500
+MEDIUM_FLEET_MIN_REVIEWS = 100
+
+SCORING_COLUMNS = (
+    Company.id,
+    Company.rating,
+    Company.review_count,
+    Company.has_impound_service,
+    Company.impound_confidence,
+    Company.is_24_7,
+    Company.website,
+    Company.email,
+)
+
+
+class LeadScoringService:
+    """Service for batch lead scoring over the company table"""
+
+    @staticmethod
+    async def load_scoring_columns(
+        db: AsyncSession,
+        zone_id: Optional[UUID] = None
+    ) -> Dict[str, "np.ndarray"]:
+        """
+        Load the scoring inputs for a zone (or all companies) as columnar arrays
+
+        Only the columns needed for scoring are selected, so no ORM objects are built.
+
+        Returns:
+            Dict of column name -> NumPy array, all of equal length
+        """
+        import numpy as np
+
+        query = select(*SCORING_COLUMNS)
+        if zone_id:
+            query = query.where(Company.zone_id == zone_id)
+
+        result = await db.execute(query)
+        rows = result.all()
+        count = len(rows)
+
+        ids = np.empty(count, dtype=object)
+        rating = np.full(count, np.nan)
+        review_count = np.zeros(count)
+        impound = np.zeros(count)
+        is_24_7 = np.zeros(count, dtype=bool)
+        has_website = np.zeros(count, dtype=bool)
+        has_email = np.zeros(count, dtype=bool)
+
+        for i, row in enumerate(rows):
+            ids[i] = row.id
+            if row.rating is not None:
+                rating[i] = row.rating
+            if row.review_count:
+                review_count[i] = row.review_count
+            if row.has_impound_service and row.impound_confidence is not None:
+                impound[i] = row.impound_confidence
+            is_24_7[i] = bool(row.is_24_7)
+            has_website[i] = bool(row.website)
+            has_email[i] = bool(row.email)
+
+        return {
+            'id': ids,
+            'rating': rating,
+            'review_count': review_count,
+            'impound': impound,
+            'is_24_7': is_24_7,
+            'website': has_website,
+            'email': has_email,
+        }
+
+    @staticmethod
+    def compute_scores(columns: Dict[str, "np.ndarray"]) -> "np.ndarray":
+        """
+        Compute composite lead scores (0-100) from columnar inputs
+
+        Missing ratings count as zero. Review counts are log-scaled so a handful
+        of very large operators don't flatten everyone else.
+        """
+        import numpy as np
+
+        rating = np.nan_to_num(columns['rating'], nan=0.0)
+        rating_signal = np.clip(rating / 5.0, 0.0, 1.0)
+
+        review_signal = np.clip(
+            np.log1p(columns['review_count']) / np.log1p(REVIEW_COUNT_SATURATION),
+            0.0,
+            1.0
+        )
+        impound_signal = np.clip(columns['impound'], 0.0, 1.0)
+
+        score = (
+            LEAD_SCORE_WEIGHTS['rating'] * rating_signal
+            + LEAD_SCORE_WEIGHTS['review_count'] * review_signal
+            + LEAD_SCORE_WEIGHTS['impound'] * impound_signal
+            + LEAD_SCORE_WEIGHTS['is_24_7'] * columns['is_24_7']
+            + LEAD_SCORE_WEIGHTS['website'] * columns['website']
+            + LEAD_SCORE_WEIGHTS['email'] * columns['email']
+        )
+        return np.round(score * 100.0, 1)
+
+    @staticmethod
+    def classify_fleet_sizes(review_count: "np.ndarray") -> "np.ndarray":
+        """Vectorized equivalent of EnrichmentService.detect_fleet_size"""
+        import numpy as np
+
+        return np.select(
+            [
+                review_count > LARGE_FLEET_MIN_REVIEWS,
+                review_count > MEDIUM_FLEET_MIN_REVIEWS,
+                review_count > 0,
+            ],
+            ['large', 'medium', 'small'],
+            default=None
+        )
+
+    @staticmethod
+    async def rescore_companies(
+        db: AsyncSession,
+        zone_id: Optional[UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        Recompute lead scores and fleet sizes for a zone or the whole table
+
+        Scores are written back with a single executemany UPDATE keyed on
+        primary key. ``updated_at`` is left untouched since scores are derived data.
+
+        Returns:
+            {
+                'companies_scored': int,
+                'mean_score': float | None,
+                'max_score': float | None
+            }
+        """
+        columns = await LeadScoringService.load_scoring_columns(db, zone_id)
+        ids = columns['id']
+        if len(ids) == 0:
+            return {'companies_scored': 0, 'mean_score': None, 'max_score': None}
+
+        scores = LeadScoringService.compute_scores(columns)
+        fleet_sizes = LeadScoringService.classify_fleet_sizes(columns['review_count'])
+
+        table = Company.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam('b_id'))
+            .values(
+                lead_score=bindparam('b_score'),
+                # Keep the stored fleet size when there's no review signal
+                fleet_size=func.coalesce(bindparam('b_fleet_size'), table.c.fleet_size),
+                updated_at=table.c.updated_at,
+            )
+        )
+        params = [
+            {'b_id': company_id, 'b_score': float(score), 'b_fleet_size': fleet_size}
+            for company_id, score, fleet_size in zip(ids, scores, fleet_sizes)
+        ]
+        await db.execute(stmt, params)
+        await db.commit()
+
+        return {
+            'companies_scored': len(ids),
+            'mean_score': round(float(scores.mean()), 1),
+            'max_score': float(scores.max()),
+        }
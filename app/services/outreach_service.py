@@ -1,27 +1,71 @@
 """Outreach service with Eqho.ai integration"""
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any, List, Optional
+from sqlalchemy import select, update, insert, and_, or_
+from sqlalchemy.orm import selectinload
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
 from uuid import UUID
 from datetime import datetime, timedelta
-from jinja2 import Template
 from app.models.outreach import OutreachSequence, OutreachAssignment, OutreachHistory
 from app.models.company import Company
 from app.services.company_service import CompanyService
-from app.services.eqho_service import EqhoService
+from app.services.eqho_service import EqhoService, EQHO_LEAD_UPLOAD_BATCH_SIZE
 from app.config import settings
-import httpx
+from app.utils.templates import template_renderer
+import asyncio
 import logging
 
+# httpx is imported when the first client is built, keeping it out of API startup
+if TYPE_CHECKING:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
+# Due assignments sent and written per bulk INSERT/UPDATE round
+OUTREACH_QUEUE_BATCH_SIZE = 500
+
+# Concurrent outbound sends while draining the queue
+OUTREACH_SEND_CONCURRENCY = 20
+
+# How long to wait before retrying an assignment whose send raised
+OUTREACH_RETRY_DELAY = timedelta(minutes=15)
+
+# Company columns needed to build Eqho lead payloads
+EQHO_LEAD_COLUMNS = (
+    Company.id,
+    Company.name,
+    Company.phone_primary,
+    Company.phone_primary_e164,
+    Company.email,
+    Company.address_city,
+    Company.address_state,
+    Company.zone_id,
+    Company.source,
+)
+
+# Connection pool shared by all webhook deliveries (httpx.Limits arguments)
+OUTREACH_HTTP_LIMITS: Dict[str, Any] = {
+    'max_connections': OUTREACH_SEND_CONCURRENCY,
+    'max_keepalive_connections': OUTREACH_SEND_CONCURRENCY,
+    'keepalive_expiry': 60.0,
+}
+OUTREACH_HTTP_TIMEOUT = 30.0
+
 
 class OutreachService:
     """Service for managing outreach campaigns with Eqho.ai integration"""
     
+    # Pooled webhook client shared across service instances (see get_http_client)
+    _http_client: Optional["httpx.AsyncClient"] = None
+    _http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+    
     def __init__(self):
         self.webhook_url = settings.outreach_webhook_url
+        # Batch mode only applies when messages go to a webhook
+        self.webhook_batch_size = settings.outreach_webhook_batch_size if self.webhook_url else 0
         self.eqho_service = EqhoService() if settings.eqho_api_token else None
         self.default_campaign_id = settings.eqho_default_campaign_id
+        cooldown_hours = settings.outreach_call_cooldown_hours
+        self.call_cooldown = timedelta(hours=cooldown_hours) if cooldown_hours > 0 else None
     
     async def create_sequence(
         self,
@@ -78,18 +122,35 @@ class OutreachService:
         if not company:
             raise ValueError(f"Company {company_id} not found")
         
-        # Generate message content
-        message_content = self.generate_message_content(company, message_template, channel)
-        
-        # Create outreach history record
-        outreach = OutreachHistory(
-            company_id=company_id,
-            channel=channel,
-            status='pending',
-            message_content=message_content
+        history_data = await self._deliver(
+            company, channel, message_template, subject, campaign_id
         )
+        outreach = OutreachHistory(**history_data)
         db.add(outreach)
         await db.commit()
+        await db.refresh(outreach)
+        return outreach
+    
+    async def _deliver(
+        self,
+        company: Company,
+        channel: str,
+        message_template: str,
+        subject: Optional[str] = None,
+        campaign_id: Optional[str] = None,
+        message_content: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Render and send one message to an already-loaded company
+        
+        Pass ``message_content`` when the message was already rendered in bulk.
+        
+        Returns:
+            Column values for the OutreachHistory row (not persisted)
+        """
+        # Generate message content
+        if message_content is None:
+            message_content = self.generate_message_content(company, message_template, channel)
         
         # Send via appropriate channel
         try:
@@ -99,19 +160,35 @@ class OutreachService:
             else:
                 # Use webhook or legacy API
                 result = await self._send_message(channel, company, message_content, subject)
-            
-            outreach.status = 'sent'
-            outreach.sent_at = datetime.utcnow()
-            outreach.external_id = result.get('id') or result.get('call_id')
-            outreach.outreach_metadata = result
         except Exception as e:
             logger.error(f"Error sending outreach: {e}", exc_info=True)
-            outreach.status = 'failed'
-            outreach.outreach_metadata = {'error': str(e)}
+            return self._build_history_row(company, channel, message_content, error=e)
         
-        await db.commit()
-        await db.refresh(outreach)
-        return outreach
+        return self._build_history_row(company, channel, message_content, result=result)
+    
+    @staticmethod
+    def _build_history_row(
+        company: Company,
+        channel: str,
+        message_content: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """Column values for an OutreachHistory row from a send result or error"""
+        history_data = {
+            'company_id': company.id,
+            'channel': channel,
+            'message_content': message_content,
+        }
+        if error is not None:
+            history_data['status'] = 'failed'
+            history_data['outreach_metadata'] = {'error': str(error)}
+        else:
+            history_data['status'] = 'sent'
+            history_data['sent_at'] = datetime.utcnow()
+            history_data['external_id'] = result.get('id') or result.get('call_id')
+            history_data['outreach_metadata'] = result
+        return history_data
     
     async def _send_via_eqho(
         self,
@@ -125,31 +202,17 @@ class OutreachService:
         if not company.phone_primary:
             raise ValueError(f"Company {company.id} has no phone number")
         
-        # Prepare lead data for Eqho
-        lead_data = {
-            'first_name': company.name.split()[0] if company.name else 'Business',
-            'last_name': ' '.join(company.name.split()[1:]) if company.name and len(company.name.split()) > 1 else '',
-            'phone': company.phone_primary,
-            'email': company.email,
-            'custom_fields': {
-                'company_name': company.name,
-                'address_city': company.address_city,
-                'address_state': company.address_state,
-                'zone_id': str(company.zone_id) if company.zone_id else None,
-                'source': company.source
-            }
-        }
-        
-        # Upload lead and trigger call
+        # Upload lead to the campaign's list and trigger call
         upload_result = await self.eqho_service.upload_leads_to_campaign(
             campaign_id=campaign_id,
-            leads=[lead_data]
+            leads=[self.eqho_service.build_lead(company)]
         )
+        leads = upload_result['upload_result'].get('leads') or [{}]
         
         # Trigger immediate call
         call_result = await self.eqho_service.trigger_call_now(
             campaign_id=campaign_id,
-            lead_id=upload_result.get('list_id')  # In production, would use actual lead_id
+            lead_id=leads[0].get('id')
         )
         
         return {
@@ -158,6 +221,206 @@ class OutreachService:
             'method': 'eqho_ai'
         }
     
+    @staticmethod
+    async def recently_called_phones(
+        db: AsyncSession,
+        phones: Iterable[str],
+        since: datetime
+    ) -> Set[str]:
+        """
+        E.164 numbers among ``phones`` with a sent phone outreach since ``since``
+        
+        Any company listing the number counts, so duplicate listings of one
+        business share the check. Uses the phone_primary_e164 index and
+        outreach_history's (company_id, channel, sent_at) index.
+        """
+        phones = list(set(phones))
+        if not phones:
+            return set()
+        result = await db.execute(
+            select(Company.phone_primary_e164)
+            .distinct()
+            .join(OutreachHistory, OutreachHistory.company_id == Company.id)
+            .where(
+                Company.phone_primary_e164.in_(phones),
+                OutreachHistory.channel == 'phone',
+                OutreachHistory.status == 'sent',
+                OutreachHistory.sent_at >= since
+            )
+        )
+        return set(result.scalars().all())
+    
+    async def _blocked_calls(
+        self,
+        db: AsyncSession,
+        phones: List[Optional[str]],
+        called: Set[str],
+        now: datetime
+    ) -> Set[int]:
+        """
+        Positions in ``phones`` (E.164 or None) that must not be called now
+        
+        A number is blocked if it was called within ``call_cooldown`` or is
+        already in ``called``, the numbers handled earlier in this run, which
+        is updated with the ones left to call. Numbers that don't normalize
+        aren't checked. Nothing is blocked when the cooldown is disabled.
+        """
+        if self.call_cooldown is None:
+            return set()
+        recent = await self.recently_called_phones(
+            db, (phone for phone in phones if phone and phone not in called), now - self.call_cooldown
+        )
+        blocked = set()
+        for index, phone in enumerate(phones):
+            if not phone:
+                continue
+            if phone in called or phone in recent:
+                blocked.add(index)
+            else:
+                called.add(phone)
+        return blocked
+    
+    async def push_campaign_leads(
+        self,
+        db: AsyncSession,
+        campaign_id: str,
+        zone_id: Optional[UUID] = None,
+        has_impound_service: Optional[bool] = None,
+        min_lead_score: Optional[float] = None,
+        company_ids: Optional[List[UUID]] = None,
+        list_id: Optional[str] = None,
+        trigger_calls: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Upload every matching company to an Eqho campaign in bulk
+        
+        Companies are streamed from the database in chunks of
+        EQHO_LEAD_UPLOAD_BATCH_SIZE and each chunk is uploaded in one request to
+        the campaign's lead list; duplicate listings are left out in favor of
+        their canonical company. With ``trigger_calls``, calls are triggered with
+        bounded concurrency and recorded as phone OutreachHistory rows; companies
+        whose number was called within ``outreach_call_cooldown_hours`` (or
+        earlier in this push, e.g. a duplicate listing) are left out. Calls are
+        matched to companies by the company ID Eqho returns with each lead; a
+        company without a returned lead counts as a failed call.
+        
+        Returns:
+            {
+                'list_id': str,
+                'leads_uploaded': int,
+                'upload_requests': int,
+                'calls_triggered': int,
+                'calls_failed': int,
+                'calls_skipped': int,
+                'skipped_company_ids': list  # of ``company_ids`` not uploaded
+                                             # (no phone, duplicate, missing)
+            }
+        """
+        if not self.eqho_service:
+            raise ValueError("Eqho service not configured")
+        
+        conditions = [
+            Company.phone_primary != None,
+            Company.phone_primary != '',
+            Company.canonical_company_id == None
+        ]
+        if zone_id:
+            conditions.append(Company.zone_id == zone_id)
+        if has_impound_service is not None:
+            conditions.append(Company.has_impound_service == has_impound_service)
+        if min_lead_score is not None:
+            conditions.append(Company.lead_score >= min_lead_score)
+        if company_ids:
+            conditions.append(Company.id.in_(company_ids))
+        
+        query = (
+            select(*EQHO_LEAD_COLUMNS)
+            .where(and_(*conditions))
+            .order_by(Company.id)
+            .execution_options(yield_per=EQHO_LEAD_UPLOAD_BATCH_SIZE)
+        )
+        
+        cached_list = not list_id
+        list_id = list_id or await self.eqho_service.get_campaign_list(campaign_id)
+        uploaded_ids: Set[str] = set()
+        stats = {
+            'list_id': list_id,
+            'leads_uploaded': 0,
+            'upload_requests': 0,
+            'calls_triggered': 0,
+            'calls_failed': 0,
+            'calls_skipped': 0,
+        }
+        
+        call_note = f"Eqho campaign {campaign_id} call"
+        called: Set[str] = set()
+        now = datetime.utcnow()
+        result = await db.stream(query)
+        async for chunk in result.partitions():
+            if trigger_calls:
+                blocked = await self._blocked_calls(
+                    db, [company.phone_primary_e164 for company in chunk], called, now
+                )
+                if blocked:
+                    stats['calls_skipped'] += len(blocked)
+                    chunk = [company for index, company in enumerate(chunk) if index not in blocked]
+                    if not chunk:
+                        continue
+            
+            leads = [self.eqho_service.build_lead(company) for company in chunk]
+            try:
+                upload_result = await self.eqho_service.upload_leads(list_id, leads)
+            except Exception:
+                if cached_list:
+                    self.eqho_service.forget_campaign_list(campaign_id, list_id)
+                raise
+            stats['leads_uploaded'] += len(leads)
+            stats['upload_requests'] += 1
+            if company_ids:
+                uploaded_ids.update(str(company.id) for company in chunk)
+            
+            if not trigger_calls:
+                continue
+            
+            lead_ids = {
+                lead.get('company_id'): lead.get('id')
+                for lead in upload_result.get('leads', [])
+                if lead.get('id')
+            }
+            called_companies = [company for company in chunk if str(company.id) in lead_ids]
+            call_results = await self.eqho_service.trigger_calls(
+                campaign_id, [lead_ids[str(company.id)] for company in called_companies]
+            )
+            results_by_id = {
+                str(company.id): call_result
+                for company, call_result in zip(called_companies, call_results)
+            }
+            history_rows = []
+            for company in chunk:
+                call_result = results_by_id.get(
+                    str(company.id), ValueError("Eqho returned no lead for this company")
+                )
+                if isinstance(call_result, Exception):
+                    stats['calls_failed'] += 1
+                    row = self._build_history_row(company, 'phone', call_note, error=call_result)
+                else:
+                    stats['calls_triggered'] += 1
+                    row = self._build_history_row(
+                        company, 'phone', call_note,
+                        result={**call_result, 'eqho_list_id': list_id, 'method': 'eqho_ai'}
+                    )
+                history_rows.append(row)
+            if history_rows:
+                await db.execute(insert(OutreachHistory), history_rows)
+        
+        if trigger_calls:
+            await db.commit()
+        stats['skipped_company_ids'] = [
+            str(company_id) for company_id in company_ids or []
+            if str(company_id) not in uploaded_ids
+        ]
+        return stats
+    
     def generate_message_content(
         self,
         company: Company,
@@ -165,12 +428,24 @@ class OutreachService:
         channel: str
     ) -> str:
         """Generate message content from template"""
-        jinja_template = Template(template)
-        return jinja_template.render(
+        return template_renderer.render(
+            template,
             company=company,
             channel=channel
         )
     
+    def generate_message_contents(
+        self,
+        companies: List[Company],
+        template: str,
+        channel: str
+    ) -> List[str]:
+        """Generate message content for many companies from one template"""
+        return template_renderer.render_many(
+            template,
+            ({'company': company, 'channel': channel} for company in companies)
+        )
+    
     async def _send_message(
         self,
         channel: str,
@@ -180,23 +455,115 @@ class OutreachService:
     ) -> Dict[str, Any]:
         """Send message via webhook or API"""
         if self.webhook_url:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.webhook_url,
-                    json={
-                        'channel': channel,
-                        'to': self._get_contact_info(company, channel),
-                        'message': message,
-                        'subject': subject,
-                        'company_id': str(company.id)
-                    }
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self.get_http_client().post(
+                self.webhook_url,
+                json={
+                    'channel': channel,
+                    'to': self._get_contact_info(company, channel),
+                    'message': message,
+                    'subject': subject,
+                    'company_id': str(company.id)
+                }
+            )
+            response.raise_for_status()
+            return response.json()
         else:
             # Stub implementation - just return success
             return {'id': 'stub', 'status': 'sent'}
     
+    async def _send_message_batch(
+        self,
+        channel: str,
+        entries: List[Tuple[Company, str, Optional[str]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Send many messages on one channel as a single webhook request
+        
+        Each message carries a ``ref``; the webhook replies with
+        ``{"results": [{"ref": ..., "id": ..., "status": ..., "error": ...}]}``.
+        Results are matched by ``ref``, falling back to position.
+        
+        Args:
+            entries: (company, message, subject) per message
+        
+        Returns:
+            OutreachHistory column values per entry, in order (not persisted)
+        """
+        payload = {
+            'channel': channel,
+            'messages': [
+                {
+                    'ref': str(index),
+                    'to': self._get_contact_info(company, channel),
+                    'message': message,
+                    'subject': subject,
+                    'company_id': str(company.id)
+                }
+                for index, (company, message, subject) in enumerate(entries)
+            ]
+        }
+        
+        try:
+            response = await self.get_http_client().post(self.webhook_url, json=payload)
+            response.raise_for_status()
+            results = response.json().get('results', [])
+        except Exception as e:
+            logger.error(f"Error sending {len(entries)} {channel} messages: {e}")
+            return [
+                self._build_history_row(company, channel, message, error=e)
+                for company, message, _ in entries
+            ]
+        
+        by_ref = {str(result['ref']): result for result in results if 'ref' in result}
+        rows = []
+        for index, (company, message, _) in enumerate(entries):
+            result = by_ref.get(str(index))
+            if result is None and not by_ref and index < len(results):
+                result = results[index]
+            
+            if result is None:
+                rows.append(self._build_history_row(
+                    company, channel, message, error='No result returned by webhook'
+                ))
+            elif result.get('status') == 'failed' or result.get('error'):
+                rows.append(self._build_history_row(
+                    company, channel, message, error=result.get('error') or 'failed'
+                ))
+            else:
+                rows.append(self._build_history_row(company, channel, message, result=result))
+        return rows
+    
+    @classmethod
+    def get_http_client(cls) -> "httpx.AsyncClient":
+        """
+        Shared pooled client for webhook delivery
+        
+        Created on first use and reused across sends so connections stay alive
+        (HTTP/2 where the webhook supports it). Recreated if the event loop changed.
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            cls._http_client is None
+            or cls._http_client.is_closed
+            or cls._http_client_loop is not loop
+        ):
+            import httpx
+            cls._http_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(**OUTREACH_HTTP_LIMITS),
+                timeout=OUTREACH_HTTP_TIMEOUT
+            )
+            cls._http_client_loop = loop
+        return cls._http_client
+    
+    @classmethod
+    async def close_http_client(cls) -> None:
+        """Close the shared webhook client"""
+        if cls._http_client is not None and not cls._http_client.is_closed:
+            await cls._http_client.aclose()
+        cls._http_client = None
+        cls._http_client_loop = None
+    
     def _get_contact_info(self, company: Company, channel: str) -> str:
         """Get contact information based on channel"""
         if channel == 'email':
@@ -205,77 +572,321 @@ class OutreachService:
             return company.phone_primary
         return ''
     
-    async def process_outreach_queue(self, db: AsyncSession) -> Dict[str, int]:
-        """Process pending outreach assignments"""
-        from sqlalchemy import select, and_
+    @staticmethod
+    def compute_next_step_due_at(
+        started_at: Optional[datetime],
+        steps: List[Dict[str, Any]],
+        step_index: int
+    ) -> Optional[datetime]:
+        """
+        When a sequence step becomes due
+        
+        Step delays are offsets from the assignment's start. An assignment that
+        hasn't started is due immediately; a finished one has no due time.
+        """
+        if step_index >= len(steps):
+            return None
+        if not started_at:
+            return datetime.utcnow()
+        return started_at + timedelta(hours=steps[step_index].get('delay_hours', 0))
+    
+    async def resume_assignment(
+        self,
+        db: AsyncSession,
+        assignment_id: UUID
+    ) -> Optional[OutreachAssignment]:
+        """Activate an assignment and schedule its current step"""
+        result = await db.execute(
+            select(OutreachAssignment)
+            .where(OutreachAssignment.id == assignment_id)
+            .options(selectinload(OutreachAssignment.sequence))
+        )
+        assignment = result.scalar_one_or_none()
+        if not assignment:
+            return None
+        
+        assignment.status = 'active'
+        assignment.next_step_due_at = self.compute_next_step_due_at(
+            assignment.started_at,
+            assignment.sequence.steps,
+            assignment.current_step
+        )
+        await db.commit()
+        return assignment
+    
+    async def _claim_due_assignments(
+        self,
+        db: AsyncSession,
+        tick_time: datetime,
+        limit: int
+    ) -> List[OutreachAssignment]:
+        """
+        Lock and load the next batch of due assignments
         
-        # Get active assignments that need processing
+        Uses ``FOR UPDATE SKIP LOCKED`` so concurrent workers claim disjoint rows.
+        Rows without a due time (created before it was persisted) are claimed
+        too so they get backfilled. Assignments of duplicate listings aren't
+        claimed while the listing has a canonical company.
+        """
         result = await db.execute(
-            select(OutreachAssignment).where(
+            select(OutreachAssignment)
+            .join(OutreachSequence)
+            .join(Company, OutreachAssignment.company_id == Company.id)
+            .where(
                 and_(
                     OutreachAssignment.status == 'active',
+                    Company.canonical_company_id == None,
+                    or_(
+                        OutreachAssignment.next_step_due_at <= tick_time,
+                        OutreachAssignment.next_step_due_at == None
+                    ),
                     OutreachSequence.is_active == True
                 )
-            ).join(OutreachSequence)
+            )
+            .order_by(OutreachAssignment.next_step_due_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True, of=OutreachAssignment)
+            .options(
+                selectinload(OutreachAssignment.sequence),
+                selectinload(OutreachAssignment.company)
+            )
         )
-        assignments = result.scalars().all()
+        return list(result.scalars().all())
+    
+    def _render_due_steps(
+        self,
+        due: List[Tuple[OutreachAssignment, Dict[str, Any]]]
+    ) -> List[Any]:
+        """
+        Render messages for due steps, one batch per (template, channel)
+        
+        Returns:
+            Message per entry in ``due``, or the exception raised rendering it
+        """
+        messages: List[Any] = [None] * len(due)
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, (assignment, step) in enumerate(due):
+            if assignment.company is None:
+                messages[index] = ValueError(f"Company {assignment.company_id} not found")
+                continue
+            groups.setdefault((step['template'], step['channel']), []).append(index)
+        
+        for (template, channel), indexes in groups.items():
+            try:
+                rendered = self.generate_message_contents(
+                    [due[index][0].company for index in indexes], template, channel
+                )
+            except Exception as e:
+                rendered = [e] * len(indexes)
+            for index, message in zip(indexes, rendered):
+                messages[index] = message
+        return messages
+    
+    async def _deliver_due_steps(
+        self,
+        due: List[Tuple[OutreachAssignment, Dict[str, Any]]],
+        messages: List[Any],
+        deliver_step,
+        semaphore: asyncio.Semaphore
+    ) -> List[Any]:
+        """
+        Deliver rendered steps, batching webhook messages per channel when enabled
+        
+        Returns:
+            History row values or the raised exception, per entry in ``due``
+        """
+        outcomes: List[Any] = [None] * len(due)
+        individual: List[int] = []
+        batched: Dict[str, List[int]] = {}
+        for index, (assignment, step) in enumerate(due):
+            channel = step['channel']
+            if (
+                self.webhook_batch_size
+                and not isinstance(messages[index], Exception)
+                and not (channel == 'phone' and self.eqho_service)
+            ):
+                batched.setdefault(channel, []).append(index)
+            else:
+                individual.append(index)
+        
+        async def deliver_chunk(channel: str, indexes: List[int]):
+            async with semaphore:
+                rows = await self._send_message_batch(
+                    channel,
+                    [
+                        (due[index][0].company, messages[index], due[index][1].get('subject'))
+                        for index in indexes
+                    ]
+                )
+            for index, row in zip(indexes, rows):
+                outcomes[index] = row
+        
+        chunks = [
+            (channel, indexes[start:start + self.webhook_batch_size])
+            for channel, indexes in batched.items()
+            for start in range(0, len(indexes), self.webhook_batch_size)
+        ]
+        results = await asyncio.gather(
+            *(deliver_step(*due[index], messages[index]) for index in individual),
+            *(deliver_chunk(channel, indexes) for channel, indexes in chunks),
+            return_exceptions=True
+        )
+        for index, result in zip(individual, results):
+            outcomes[index] = result
+        for (channel, indexes), result in zip(chunks, results[len(individual):]):
+            if isinstance(result, Exception):
+                for index in indexes:
+                    outcomes[index] = result
+        return outcomes
+    
+    async def process_outreach_queue(self, db: AsyncSession) -> Dict[str, int]:
+        """
+        Process due outreach assignments
+        
+        Only rows whose ``next_step_due_at`` has passed are claimed, in batches,
+        with their sequence and company loaded eagerly. Messages are rendered in
+        one pass per template from the compiled-template cache. Sends run with bounded
+        concurrency over the pooled client, posted as per-channel arrays when
+        ``outreach_webhook_batch_size`` is set, and each batch's history rows and assignment advances are
+        written with one bulk INSERT and one bulk UPDATE. Each assignment sends
+        at most one step per run. Phone steps to a number called within
+        ``outreach_call_cooldown_hours`` or already due in this run are deferred
+        by the cooldown instead of sent.
+        """
+        tick_time = datetime.utcnow()
+        # Anything rescheduled during this run lands after tick_time, so it
+        # won't be claimed again until the next run
+        earliest_next_due = tick_time + timedelta(seconds=1)
         
         processed = 0
         sent = 0
         failed = 0
+        deferred = 0
+        called: Set[str] = set()
+        semaphore = asyncio.Semaphore(OUTREACH_SEND_CONCURRENCY)
         
-        for assignment in assignments:
-            try:
-                # Get sequence and company
-                sequence = assignment.sequence
-                company = await CompanyService.get_company(db, assignment.company_id)
+        async def deliver_step(
+            assignment: OutreachAssignment,
+            step: Dict[str, Any],
+            message_content: str
+        ):
+            if isinstance(message_content, Exception):
+                raise message_content
+            async with semaphore:
+                return await self._deliver(
+                    assignment.company,
+                    step['channel'],
+                    step['template'],
+                    step.get('subject'),
+                    message_content=message_content
+                )
+        
+        while True:
+            assignments = await self._claim_due_assignments(
+                db, tick_time, OUTREACH_QUEUE_BATCH_SIZE
+            )
+            if not assignments:
+                break
+            
+            assignment_updates = []
+            due: List[Tuple[OutreachAssignment, Dict[str, Any]]] = []
+            
+            for assignment in assignments:
+                steps = assignment.sequence.steps
                 
-                if not company or not sequence:
+                if assignment.current_step >= len(steps):
+                    assignment_updates.append({
+                        'id': assignment.id,
+                        'status': 'completed',
+                        'completed_at': tick_time,
+                        'next_step_due_at': None
+                    })
                     continue
                 
-                # Get current step
-                if assignment.current_step >= len(sequence.steps):
-                    assignment.status = 'completed'
-                    assignment.completed_at = datetime.utcnow()
-                    await db.commit()
-                    continue
+                # Backfill rows that predate next_step_due_at
+                if assignment.next_step_due_at is None and assignment.started_at:
+                    due_at = self.compute_next_step_due_at(
+                        assignment.started_at, steps, assignment.current_step
+                    )
+                    if due_at > tick_time:
+                        assignment_updates.append({
+                            'id': assignment.id,
+                            'next_step_due_at': due_at
+                        })
+                        continue
                 
-                step = sequence.steps[assignment.current_step]
+                due.append((assignment, steps[assignment.current_step]))
+            
+            phone_due = [
+                index for index, (assignment, step) in enumerate(due)
+                if step['channel'] == 'phone' and assignment.company is not None
+            ]
+            blocked = await self._blocked_calls(
+                db, [due[index][0].company.phone_primary_e164 for index in phone_due], called, tick_time
+            )
+            if blocked:
+                blocked_due = {phone_due[index] for index in blocked}
+                for index in blocked_due:
+                    deferred += 1
+                    assignment_updates.append({
+                        'id': due[index][0].id,
+                        'next_step_due_at': tick_time + self.call_cooldown
+                    })
+                due = [entry for index, entry in enumerate(due) if index not in blocked_due]
+            
+            messages = self._render_due_steps(due)
+            outcomes = await self._deliver_due_steps(due, messages, deliver_step, semaphore)
+            
+            history_rows = []
+            for (assignment, step), outcome in zip(due, outcomes):
+                processed += 1
+                if isinstance(outcome, Exception):
+                    logger.error(
+                        f"Error processing outreach assignment {assignment.id}: {outcome}"
+                    )
+                    failed += 1
+                    assignment_updates.append({
+                        'id': assignment.id,
+                        'next_step_due_at': tick_time + OUTREACH_RETRY_DELAY
+                    })
+                    continue
                 
-                # Check if it's time to send this step
-                if assignment.started_at:
-                    delay = timedelta(hours=step.get('delay_hours', 0))
-                    if datetime.utcnow() < assignment.started_at + delay:
-                        continue
+                history_rows.append(outcome)
+                if outcome['status'] == 'sent':
+                    sent += 1
                 else:
-                    assignment.started_at = datetime.utcnow()
-                
-                # Send outreach
-                await self.send_outreach(
-                    db,
-                    assignment.company_id,
-                    step['channel'],
-                    step['template'],
-                    step.get('subject')
-                )
+                    failed += 1
                 
                 # Move to next step
-                assignment.current_step += 1
-                if assignment.current_step >= len(sequence.steps):
-                    assignment.status = 'completed'
-                    assignment.completed_at = datetime.utcnow()
-                
-                await db.commit()
-                sent += 1
-                processed += 1
-            except Exception as e:
-                print(f"Error processing outreach assignment {assignment.id}: {e}")
-                failed += 1
-                processed += 1
+                steps = assignment.sequence.steps
+                started_at = assignment.started_at or tick_time
+                next_step = assignment.current_step + 1
+                advance = {
+                    'id': assignment.id,
+                    'current_step': next_step,
+                    'started_at': started_at
+                }
+                if next_step >= len(steps):
+                    advance['status'] = 'completed'
+                    advance['completed_at'] = datetime.utcnow()
+                    advance['next_step_due_at'] = None
+                else:
+                    advance['next_step_due_at'] = max(
+                        self.compute_next_step_due_at(started_at, steps, next_step),
+                        earliest_next_due
+                    )
+                assignment_updates.append(advance)
+            
+            if history_rows:
+                await db.execute(insert(OutreachHistory), history_rows)
+            if assignment_updates:
+                await db.execute(update(OutreachAssignment), assignment_updates)
+            # Committing releases the row locks for this batch
+            await db.commit()
         
         return {
             'processed': processed,
             'sent': sent,
-            'failed': failed
+            'failed': failed,
+            'deferred': deferred
         }
-
@@ -67,6 +67,8 @@ class ScrapingOrchestrator:
                 'companies_found': int,
                 'companies_new': int,
                 'companies_updated': int,
+                'companies_unchanged': int,
+                'fields_changed': dict,
                 'websites_scraped': int,
                 'websites_failed': int,
                 'profiles_scraped': int,
@@ -90,6 +92,8 @@ class ScrapingOrchestrator:
             'companies_found': len(companies_data),
             'companies_new': 0,
             'companies_updated': 0,
+            'companies_unchanged': 0,
+            'fields_changed': {},
             'websites_scraped': 0,
             'websites_failed': 0,
             'profiles_scraped': 0,
@@ -105,26 +109,22 @@ class ScrapingOrchestrator:
         companies_to_scrape = []
         
         for company_data in companies_data:
-            # Check if company exists
-            google_url = company_data.get('google_business_url', '')
-            existing = None
-            
-            if google_url:
-                result = await db.execute(
-                    select(Company).where(Company.google_business_url == google_url)
-                )
-                existing = result.scalar_one_or_none()
-            
-            # Create or update company
-            company = await CompanyService.create_or_update_company(
+            # Create or update company, writing only the fields that changed
+            company, changed = await CompanyService.upsert_company(
                 db,
                 company_data,
                 zone_id
             )
+            stage = company.scraping_stage
             
             # Update scraping stage
-            if existing:
-                stats['companies_updated'] += 1
+            if changed is not None:
+                if changed:
+                    stats['companies_updated'] += 1
+                    for field in changed:
+                        stats['fields_changed'][field] = stats['fields_changed'].get(field, 0) + 1
+                else:
+                    stats['companies_unchanged'] += 1
                 # Update to GOOGLE_MAPS if was INITIAL or None
                 if not company.scraping_stage or company.scraping_stage == ScrapingStage.INITIAL.value:
                     company.scraping_stage = ScrapingStage.GOOGLE_MAPS.value
@@ -143,8 +143,9 @@ class ScrapingOrchestrator:
                 company.scraping_stage = ScrapingStage.INITIAL.value
                 stats['stage_breakdown'][ScrapingStage.INITIAL] += 1
             
-            await db.commit()
-            await db.refresh(company)
+            if company.scraping_stage != stage:
+                await db.commit()
+                await db.refresh(company)
             
             # Queue for website scraping if enabled
             if scrape_websites and company.website:
@@ -269,7 +270,8 @@ class ScrapingOrchestrator:
                 (Company.website_scraped_at == None) |
                 (Company.website_scraped_at < cutoff_date),
                 Company.website != None,
-                Company.website_scrape_status != 'no_website'
+                Company.website_scrape_status != 'no_website',
+                Company.canonical_company_id == None
             )
         )
         
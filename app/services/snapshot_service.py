@@ -0,0 +1,310 @@
+"""Delta-encoded enrichment snapshot storage"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, insert, delete, func, bindparam, and_
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+from datetime import datetime, timedelta
+from collections import defaultdict
+import hashlib
+import json
+from app.models.enrichment import EnrichmentSnapshot
+
+# Keys that change on every run and would defeat change detection
+VOLATILE_SNAPSHOT_KEYS = {'website_scraped_at'}
+
+# Write a full snapshot after this many consecutive deltas to bound rebuild cost
+SNAPSHOT_KEYFRAME_INTERVAL = 20
+
+# Companies compacted per round in compact_snapshots
+COMPACTION_BATCH_SIZE = 500
+
+# Snapshots are read as plain rows so bulk writes never fight the identity map
+SNAPSHOT_COLUMNS = (
+    EnrichmentSnapshot.id,
+    EnrichmentSnapshot.company_id,
+    EnrichmentSnapshot.enrichment_source,
+    EnrichmentSnapshot.snapshot_type,
+    EnrichmentSnapshot.snapshot_data,
+    EnrichmentSnapshot.content_hash,
+    EnrichmentSnapshot.chain_seq,
+    EnrichmentSnapshot.created_at,
+)
+
+
+class SnapshotService:
+    """
+    Service for storing enrichment snapshots as deltas
+
+    Each (company, source) history is a chain of rows: a 'full' row holding the
+    complete enrichment state, followed by 'delta' rows holding
+    ``{"set": {...}, "unset": [...]}`` against the previous state. Rows are
+    ordered by ``chain_seq``, which each write increments, so snapshots
+    sharing a timestamp still apply in order. A row is only written when the
+    state hash differs from the latest one.
+    """
+
+    @staticmethod
+    def normalize_state(enrichment_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop volatile keys and make values JSON-serializable"""
+        return {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in enrichment_data.items()
+            if key not in VOLATILE_SNAPSHOT_KEYS
+        }
+
+    @staticmethod
+    def compute_hash(state: Dict[str, Any]) -> str:
+        """Stable content hash of a snapshot state"""
+        encoded = json.dumps(state, sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    @staticmethod
+    def diff_states(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute a delta that turns ``previous`` into ``current``"""
+        return {
+            'set': {
+                key: value for key, value in current.items()
+                if key not in previous or previous[key] != value
+            },
+            'unset': sorted(key for key in previous if key not in current),
+        }
+
+    @staticmethod
+    def apply_delta(state: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply a delta to a state, returning a new state"""
+        new_state = {k: v for k, v in state.items() if k not in set(delta.get('unset', []))}
+        new_state.update(delta.get('set', {}))
+        return new_state
+
+    @staticmethod
+    def rebuild_states(
+        snapshots: Iterable[Any]
+    ) -> List[Tuple[Any, Dict[str, Any]]]:
+        """
+        Rebuild the full state at each snapshot of one company/source chain
+
+        Snapshots are rows with SNAPSHOT_COLUMNS, ordered by ``chain_seq``.
+        """
+        states = []
+        state: Dict[str, Any] = {}
+        for snapshot in snapshots:
+            if snapshot.snapshot_type == 'delta':
+                state = SnapshotService.apply_delta(state, snapshot.snapshot_data)
+            else:
+                state = dict(snapshot.snapshot_data)
+            states.append((snapshot, state))
+        return states
+
+    @staticmethod
+    async def get_history(
+        db: AsyncSession,
+        company_id: Any
+    ) -> List[Dict[str, Any]]:
+        """Get a company's full enrichment history with each state rebuilt"""
+        result = await db.execute(
+            select(*SNAPSHOT_COLUMNS)
+            .where(EnrichmentSnapshot.company_id == company_id)
+            .order_by(EnrichmentSnapshot.chain_seq)
+        )
+        by_source = defaultdict(list)
+        for snapshot in result.all():
+            by_source[snapshot.enrichment_source].append(snapshot)
+
+        history = []
+        for chain in by_source.values():
+            for snapshot, state in SnapshotService.rebuild_states(chain):
+                history.append({
+                    'id': snapshot.id,
+                    'company_id': snapshot.company_id,
+                    'snapshot_data': state,
+                    'enrichment_source': snapshot.enrichment_source,
+                    'content_hash': snapshot.content_hash or SnapshotService.compute_hash(state),
+                    'created_at': snapshot.created_at,
+                })
+        history.sort(key=lambda entry: entry['created_at'])
+        return history
+
+    @staticmethod
+    async def _latest_chain_states(
+        db: AsyncSession,
+        company_ids: List[Any],
+        source: str
+    ) -> Dict[Any, Tuple[Dict[str, Any], Optional[str], int, int]]:
+        """
+        Latest state per company for one source, loaded in a single query
+
+        Only each chain's rows from its latest full row on are read, so at
+        most SNAPSHOT_KEYFRAME_INTERVAL rows per company.
+
+        Returns:
+            company_id -> (state, content_hash, deltas since last full row, chain_seq)
+        """
+        keyframes = (
+            select(
+                EnrichmentSnapshot.company_id,
+                func.max(EnrichmentSnapshot.chain_seq).label('keyframe_seq')
+            )
+            .where(
+                EnrichmentSnapshot.company_id.in_(company_ids),
+                EnrichmentSnapshot.enrichment_source == source,
+                EnrichmentSnapshot.snapshot_type == 'full'
+            )
+            .group_by(EnrichmentSnapshot.company_id)
+            .subquery()
+        )
+        result = await db.execute(
+            select(*SNAPSHOT_COLUMNS)
+            .join(keyframes, and_(
+                EnrichmentSnapshot.company_id == keyframes.c.company_id,
+                EnrichmentSnapshot.chain_seq >= keyframes.c.keyframe_seq
+            ))
+            .where(EnrichmentSnapshot.enrichment_source == source)
+            .order_by(EnrichmentSnapshot.company_id, EnrichmentSnapshot.chain_seq)
+        )
+        chains = defaultdict(list)
+        for snapshot in result.all():
+            chains[snapshot.company_id].append(snapshot)
+
+        latest = {}
+        for company_id, chain in chains.items():
+            snapshot, state = SnapshotService.rebuild_states(chain)[-1]
+            latest[company_id] = (
+                state,
+                snapshot.content_hash or SnapshotService.compute_hash(state),
+                len(chain) - 1,
+                snapshot.chain_seq,
+            )
+        return latest
+
+    @staticmethod
+    async def store_snapshots(
+        db: AsyncSession,
+        entries: List[Tuple[Any, Dict[str, Any]]],
+        source: str
+    ) -> int:
+        """
+        Store snapshots for many companies, skipping unchanged states
+
+        Args:
+            entries: (company_id, enrichment_data) pairs
+            source: Enrichment source, e.g. 'website'
+
+        Returns:
+            Number of snapshot rows written. Does not commit.
+        """
+        if not entries:
+            return 0
+
+        latest = await SnapshotService._latest_chain_states(
+            db, [company_id for company_id, _ in entries], source
+        )
+
+        rows = []
+        for company_id, enrichment_data in entries:
+            state = SnapshotService.normalize_state(enrichment_data)
+            content_hash = SnapshotService.compute_hash(state)
+            previous = latest.get(company_id)
+
+            if previous and previous[1] == content_hash:
+                continue
+
+            if previous and previous[2] < SNAPSHOT_KEYFRAME_INTERVAL - 1:
+                snapshot_type = 'delta'
+                snapshot_data = SnapshotService.diff_states(previous[0], state)
+                deltas = previous[2] + 1
+            else:
+                snapshot_type = 'full'
+                snapshot_data = state
+                deltas = 0
+            chain_seq = previous[3] + 1 if previous else 0
+
+            rows.append({
+                'company_id': company_id,
+                'snapshot_data': snapshot_data,
+                'snapshot_type': snapshot_type,
+                'content_hash': content_hash,
+                'chain_seq': chain_seq,
+                'enrichment_source': source,
+            })
+            # Repeated company IDs within one call chain off each other
+            latest[company_id] = (state, content_hash, deltas, chain_seq)
+
+        if rows:
+            await db.execute(insert(EnrichmentSnapshot), rows)
+        return len(rows)
+
+    @staticmethod
+    async def compact_snapshots(
+        db: AsyncSession,
+        older_than_days: int = 90
+    ) -> Dict[str, int]:
+        """
+        Roll snapshots older than the retention window into one full row
+
+        For each company/source, every snapshot before the cutoff is folded into
+        the newest of them, which becomes a 'full' row. Newer deltas still apply
+        on top of it, so the remaining history rebuilds unchanged.
+
+        Returns:
+            {'companies_compacted': int, 'snapshots_deleted': int}
+        """
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        stats = {'companies_compacted': 0, 'snapshots_deleted': 0}
+
+        result = await db.execute(
+            select(EnrichmentSnapshot.company_id)
+            .where(EnrichmentSnapshot.created_at < cutoff)
+            .group_by(EnrichmentSnapshot.company_id)
+            .having(func.count(EnrichmentSnapshot.id) > 1)
+        )
+        company_ids = [row.company_id for row in result.all()]
+
+        table = EnrichmentSnapshot.__table__
+        rollup_stmt = (
+            update(table)
+            .where(table.c.id == bindparam('b_id'))
+            .values(
+                snapshot_type='full',
+                snapshot_data=bindparam('b_data', type_=table.c.snapshot_data.type),
+                content_hash=bindparam('b_hash'),
+            )
+        )
+
+        for start in range(0, len(company_ids), COMPACTION_BATCH_SIZE):
+            batch_ids = company_ids[start:start + COMPACTION_BATCH_SIZE]
+            result = await db.execute(
+                select(*SNAPSHOT_COLUMNS)
+                .where(
+                    EnrichmentSnapshot.company_id.in_(batch_ids),
+                    EnrichmentSnapshot.created_at < cutoff
+                )
+                .order_by(EnrichmentSnapshot.company_id, EnrichmentSnapshot.chain_seq)
+            )
+            chains = defaultdict(list)
+            for snapshot in result.all():
+                chains[(snapshot.company_id, snapshot.enrichment_source)].append(snapshot)
+
+            rollups = []
+            delete_ids = []
+            for chain in chains.values():
+                if len(chain) < 2:
+                    continue
+                last, state = SnapshotService.rebuild_states(chain)[-1]
+                rollups.append({
+                    'b_id': last.id,
+                    'b_data': state,
+                    'b_hash': SnapshotService.compute_hash(state),
+                })
+                delete_ids.extend(snapshot.id for snapshot in chain[:-1])
+
+            if rollups:
+                await db.execute(rollup_stmt, rollups)
+                await db.execute(
+                    delete(EnrichmentSnapshot)
+                    .where(EnrichmentSnapshot.id.in_(delete_ids))
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+                stats['companies_compacted'] += len(rollups)
+                stats['snapshots_deleted'] += len(delete_ids)
+
+        return stats
@@ -1,9 +1,11 @@
 """Website scraper service using Playwright"""
-from playwright.async_api import async_playwright, Browser, Page
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, TYPE_CHECKING
 import re
 from app.config import settings
 
+if TYPE_CHECKING:
+    from playwright.async_api import Browser
+
 
 class WebsiteScraperService:
     """Service for scraping company websites"""
@@ -11,11 +13,13 @@ class WebsiteScraperService:
     def __init__(self):
         self.headless = settings.playwright_headless
         self.timeout = settings.playwright_timeout
-        self.browser: Optional[Browser] = None
+        self.browser: Optional["Browser"] = None
     
     async def initialize(self):
         """Initialize Playwright browser"""
         if not self.browser:
+            # Imported here so API processes that never scrape don't pay for Playwright
+            from playwright.async_api import async_playwright
             playwright = await async_playwright().start()
             self.browser = await playwright.chromium.launch(headless=self.headless)
     
@@ -0,0 +1,146 @@
+"""Local archive of raw Apify dataset items as gzip-compressed JSON Lines chunks"""
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+import gzip
+import json
+import os
+
+ARCHIVE_INDEX_FILE = "index.json"
+ARCHIVE_INDEX_VERSION = 1
+
+
+class DatasetArchive:
+    """
+    Raw dataset items stored on disk, keyed by Apify run and dataset ID
+
+    Layout::
+
+        <root>/index.json
+        <root>/<run_id>/<dataset_id>/<offset>.jsonl.gz
+
+    Each chunk file holds the items starting at that dataset offset, one JSON
+    object per line. ``index.json`` maps run IDs to their dataset ID, chunk
+    list, archived item count and whether the whole dataset is archived;
+    it's replaced atomically after every write. Chunks must be written in
+    order (each starting where the archive ends), so the archived items are
+    always a contiguous prefix of the dataset. One process should write a
+    given archive at a time; any number can read it.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self._index: Optional[Dict[str, Any]] = None
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / ARCHIVE_INDEX_FILE
+
+    def _load_index(self) -> Dict[str, Any]:
+        if self._index is None:
+            if self.index_path.exists():
+                with open(self.index_path) as f:
+                    self._index = json.load(f)
+            else:
+                self._index = {"version": ARCHIVE_INDEX_VERSION, "runs": {}}
+        return self._index
+
+    def _save_index(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def runs(self) -> Dict[str, Dict[str, Any]]:
+        """Index entries for every archived run"""
+        return self._load_index()["runs"]
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Index entry for a run, or None if nothing is archived
+
+        Returns:
+            {'dataset_id': str, 'items': int, 'complete': bool,
+             'chunks': [{'file': str, 'offset': int, 'count': int}], 'updated_at': str}
+        """
+        return self.runs().get(run_id)
+
+    def chunk_paths(self, run_id: str) -> List[Path]:
+        """Chunk files of a run, in dataset order"""
+        entry = self.get_run(run_id)
+        if not entry:
+            return []
+        return [self.root / chunk["file"] for chunk in entry["chunks"]]
+
+    def write_chunk(self, run_id: str, dataset_id: str, offset: int, items: List[Dict[str, Any]]) -> bool:
+        """
+        Archive a chunk of raw items starting at dataset ``offset``
+
+        Returns False (and writes nothing) if the chunk doesn't start where
+        the run's archive ends, e.g. an import resuming past the archived
+        items; True otherwise.
+        """
+        entry = self.get_run(run_id)
+        archived = entry["items"] if entry else 0
+        if offset != archived or not items:
+            return False
+        if entry is None:
+            entry = {"dataset_id": dataset_id, "items": 0, "complete": False, "chunks": []}
+            self.runs()[run_id] = entry
+
+        relative_path = Path(run_id) / dataset_id / f"{offset:010d}.jsonl.gz"
+        path = self.root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for item in items:
+                f.write(json.dumps(item, ensure_ascii=False))
+                f.write("\n")
+
+        entry["chunks"].append({"file": str(relative_path), "offset": offset, "count": len(items)})
+        entry["items"] = offset + len(items)
+        entry["updated_at"] = datetime.utcnow().isoformat()
+        self._save_index()
+        return True
+
+    def mark_complete(self, run_id: str) -> None:
+        """Record that the run's whole dataset is archived"""
+        entry = self.get_run(run_id)
+        if entry and not entry["complete"]:
+            entry["complete"] = True
+            entry["updated_at"] = datetime.utcnow().isoformat()
+            self._save_index()
+
+    @staticmethod
+    def read_chunk(path: Path) -> List[Dict[str, Any]]:
+        """Items of one chunk file"""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def iter_chunks(
+        self,
+        run_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Yield (offset, items) for a run's archived items from ``offset``
+
+        ``limit`` stops at that dataset offset, like ApifyService.iter_run_items.
+        Chunks that only partly overlap the range are sliced.
+        """
+        entry = self.get_run(run_id)
+        if not entry:
+            return
+        for chunk in entry["chunks"]:
+            start = chunk["offset"]
+            end = start + chunk["count"]
+            if limit is not None:
+                if start >= limit:
+                    return
+                end = min(end, limit)
+            if end <= offset:
+                continue
+            items = self.read_chunk(self.root / chunk["file"])
+            first = max(offset, start)
+            yield first, items[first - start:end - start]
@@ -0,0 +1,167 @@
+"""Incremental readers for large JSON and JSON Lines files"""
+from typing import Any, Iterator, Optional, TextIO
+import json
+
+# Characters read from the file per refill
+JSON_STREAM_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789+-.eE"
+
+
+class _Reader:
+    """Sliding text buffer over a file, refilled as the parser consumes it"""
+
+    def __init__(self, fp: TextIO, chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read another chunk, dropping consumed text; False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at end of file)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+        self.pos += 1
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A value ending with the buffer (a number or literal) may continue in
+            # the next chunk, and a number may have stopped at a partial
+            # fraction or exponent ("2." or "2e")
+            if not self.eof and not self.buffer[end:].strip(_NUMBER_CHARS) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip_value(self) -> None:
+        """Skip the next JSON value without building it"""
+        depth = 0
+        in_string = False
+        escaped = False
+        self.peek()
+        while True:
+            while self.pos < len(self.buffer):
+                char = self.buffer[self.pos]
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == "\\":
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                        if depth == 0:
+                            self.pos += 1
+                            return
+                elif char == '"':
+                    in_string = True
+                elif char in "[{":
+                    depth += 1
+                elif depth == 0 and char in ",]}" + _WHITESPACE:
+                    # End of a bare scalar (number, true, false, null)
+                    return
+                elif char in "]}":
+                    depth -= 1
+                    if depth == 0:
+                        self.pos += 1
+                        return
+                self.pos += 1
+            if not self.fill():
+                if depth == 0 and not in_string:
+                    return
+                raise ValueError("Unexpected end of JSON stream")
+
+
+def iter_json_array(
+    fp: TextIO,
+    key: Optional[str] = None,
+    chunk_size: int = JSON_STREAM_CHUNK_SIZE
+) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array one at a time
+
+    Only one element (plus a read chunk) is held in memory, so arbitrarily
+    large exports can be processed with flat memory use.
+
+    Args:
+        fp: Text file positioned at the start of the document
+        key: Top-level object key holding the array (e.g. ``"companies"``);
+            None when the document itself is an array. Other top-level values
+            are skipped without being parsed.
+        chunk_size: Characters read per refill
+
+    Raises:
+        KeyError: If ``key`` isn't a top-level key of the document
+        ValueError: If the document is malformed
+    """
+    reader = _Reader(fp, chunk_size)
+    decoder = json.JSONDecoder()
+
+    if key is not None:
+        reader.expect("{")
+        while True:
+            if reader.peek() == "}":
+                raise KeyError(key)
+            name = reader.decode(decoder)
+            reader.expect(":")
+            if name == key:
+                break
+            reader.skip_value()
+            if reader.peek() == ",":
+                reader.pos += 1
+
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.decode(decoder)
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, found {separator!r}")
+
+
+def iter_json_lines(fp: TextIO) -> Iterator[Any]:
+    """Yield one decoded value per non-blank line of a JSON Lines file"""
+    for line_number, line in enumerate(fp, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {e}")
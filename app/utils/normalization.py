@@ -0,0 +1,115 @@
+"""Normalized keys for matching companies across sources"""
+from typing import FrozenSet, Optional
+from urllib.parse import urlsplit
+import re
+
+# Country code for numbers written without one
+DEFAULT_COUNTRY_CODE = "1"
+
+_EXTENSION_RE = re.compile(r"(?:ext\.?|extension|x|#)\s*\d+\s*$", re.IGNORECASE)
+_NON_DIGIT_RE = re.compile(r"\D")
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_domain(url: Optional[str]) -> Optional[str]:
+    """
+    Lowercase host of a website URL without ``www.`` or port
+
+    'https://www.Example.com:443/contact' -> 'example.com'; a bare
+    'example.com/path' works too. Returns None if there's no host.
+    """
+    if not url:
+        return None
+    url = url.strip()
+    if "://" not in url:
+        url = f"//{url}"
+    try:
+        host = urlsplit(url).hostname
+    except ValueError:
+        return None
+    if not host:
+        return None
+    host = host.rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    return host or None
+
+
+
+def normalize_phone(phone: Optional[str], country_code: str = DEFAULT_COUNTRY_CODE) -> Optional[str]:
+    """
+    E.164 form of a phone number, or None if it can't be one
+
+    '(801) 555-0100', '801.555.0100 ext 12' and '1-801-555-0100' all give
+    '+18015550100'. Numbers without a '+' or '011' prefix are read as
+    ``country_code`` numbers; North American numbers must have 10 digits
+    with valid area code and exchange.
+    """
+    if not phone:
+        return None
+    phone = _EXTENSION_RE.split(phone, 1)[0].strip()
+    digits = _NON_DIGIT_RE.sub("", phone)
+    if phone.startswith("+"):
+        pass
+    elif digits.startswith("011"):
+        digits = digits[3:]
+    elif country_code == "1" and len(digits) == 11 and digits.startswith("1"):
+        pass
+    else:
+        digits = country_code + digits
+
+    if digits.startswith("1"):
+        # NANP: NXX-NXX-XXXX
+        if len(digits) != 11 or digits[1] in "01" or digits[4] in "01":
+            return None
+    elif not 8 <= len(digits) <= 15 or digits.startswith("0"):
+        return None
+    return f"+{digits}"
+
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash(latitude: float, longitude: float, precision: int = 5) -> str:
+    """Geohash cell of a point (precision 5 cells are about 4.9 x 4.9 km)"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    cell = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(cell) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            cell.append(_GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(cell)
+
+
+# Words in most towing business names, which say nothing about identity
+NAME_STOPWORDS = frozenset((
+    "the", "and", "of", "llc", "inc", "co", "corp", "company", "ltd",
+    "tow", "towing", "wrecker", "wrecking", "recovery", "roadside", "assistance",
+    "service", "services", "transport", "transportation", "24", "hour", "hr", "7", "247",
+))
+
+
+def name_tokens(name: Optional[str]) -> FrozenSet[str]:
+    """Distinctive lowercase words of a business name ('A&B Towing, LLC' -> {'ab'})"""
+    if not name:
+        return frozenset()
+    name = name.lower().replace("&", "").replace("'", "")
+    return frozenset(
+        token for token in _NON_WORD_RE.split(name)
+        if len(token) > 1 and token not in NAME_STOPWORDS
+    )
@@ -1,5 +1,13 @@
 """Message templates for outreach"""
-from typing import Dict
+from typing import Dict, Any, Iterable, List, Optional, TYPE_CHECKING
+from collections import OrderedDict
+import hashlib
+
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
+# Compiled templates kept by TemplateRenderer before least-recently-used eviction
+TEMPLATE_CACHE_SIZE = 256
 
 OUTREACH_TEMPLATES: Dict[str, str] = {
     "email_intro": """
@@ -25,3 +33,96 @@ Hello, this is [Your Name] from TowPilot. I'm calling to introduce our free mast
 """
 }
 
+
+class TemplateRenderer:
+    """
+    Renders message templates from one shared Jinja environment
+    
+    Compiled templates are kept in a bounded LRU keyed by a hash of their
+    source, so repeated sends of the same step don't re-parse the template.
+    Jinja itself is only imported when the first template is compiled.
+    """
+    
+    def __init__(self, max_size: int = TEMPLATE_CACHE_SIZE):
+        self.max_size = max_size
+        self._environment: Optional["Environment"] = None
+        self._compiled: "OrderedDict[str, Template]" = OrderedDict()
+        self._deferred: List[str] = []
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def environment(self) -> "Environment":
+        """Shared Jinja environment, created on first use"""
+        if self._environment is None:
+            from jinja2 import Environment
+            self._environment = Environment()
+        return self._environment
+    
+    @staticmethod
+    def source_key(source: str) -> str:
+        """Cache key for a template source"""
+        return hashlib.sha256(source.encode()).hexdigest()
+    
+    def get_template(self, source: str) -> "Template":
+        """Get the compiled template for a source, compiling it on first use"""
+        if self._deferred:
+            self._compile_deferred()
+        
+        key = self.source_key(source)
+        template = self._compiled.get(key)
+        if template is not None:
+            self._compiled.move_to_end(key)
+            self.hits += 1
+            return template
+        
+        self.misses += 1
+        template = self.environment.from_string(source)
+        self._compiled[key] = template
+        if len(self._compiled) > self.max_size:
+            self._compiled.popitem(last=False)
+        return template
+    
+    def preload(self, sources: Iterable[str], deferred: bool = False) -> None:
+        """
+        Compile templates ahead of first use
+        
+        With ``deferred``, compilation waits until the first template is
+        requested, which keeps Jinja out of module import.
+        """
+        if deferred:
+            self._deferred.extend(sources)
+            return
+        for source in sources:
+            self.get_template(source)
+    
+    def _compile_deferred(self) -> None:
+        sources, self._deferred = self._deferred, []
+        self.preload(sources)
+    
+    def render(self, source: str, **context: Any) -> str:
+        """Render a template source with the given context"""
+        return self.get_template(source).render(**context)
+    
+    def render_many(self, source: str, contexts: Iterable[Dict[str, Any]]) -> List[str]:
+        """Render one template against many contexts"""
+        template = self.get_template(source)
+        return [template.render(**context) for context in contexts]
+    
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Cache statistics
+        
+        Returns:
+            {'size': int, 'max_size': int, 'hits': int, 'misses': int}
+        """
+        return {
+            'size': len(self._compiled),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+template_renderer = TemplateRenderer()
+template_renderer.preload(OUTREACH_TEMPLATES.values(), deferred=True)
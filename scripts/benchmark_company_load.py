@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Company load benchmark
+
+Loads synthetic companies into a scratch zone with each import path and
+reports rows/sec for the initial load (all inserts) and a reload of the same
+rows (all unchanged, so only compared):
+
+    upsert  CompanyService.bulk_upsert_companies in batches (import_from_json default)
+    copy    CompanyLoader: COPY into a staging table, one INSERT ... ON CONFLICT
+
+The benchmark rows and zone are deleted afterwards. Run it against a scratch
+Postgres database; it needs the unique index on companies.google_business_url.
+
+Usage:
+    python scripts/benchmark_company_load.py [--rows 100000] [--batch-size 500]
+    python scripts/benchmark_company_load.py --database-url postgresql+asyncpg://... --loaders copy
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+from uuid import UUID
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from app.config import settings
+from app.database import build_engine_options
+from app.models.company import Company
+from app.models.zone import Zone
+from app.services.company_service import CompanyService
+from app.services.company_loader import CompanyLoader
+
+BENCHMARK_URL_PREFIX = "https://maps.google.com/?cid=benchmark-"
+
+STATES = ["TX", "FL", "CA", "GA", "NC", "AZ", "OH", "PA"]
+
+
+def synthetic_companies(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Mapped company dicts shaped like ApifyService._map_apify_result output"""
+    rng = random.Random(seed)
+    companies = []
+    for i in range(count):
+        state = rng.choice(STATES)
+        companies.append({
+            'name': f'Benchmark Towing {i}',
+            'phone_primary': f'+1{rng.randint(2000000000, 9999999999)}',
+            'google_business_url': f'{BENCHMARK_URL_PREFIX}{seed}-{i}',
+            'website': f'https://towing{i}.example.com',
+            'address_street': f'{rng.randint(1, 9999)} Main St',
+            'address_city': 'Springfield',
+            'address_state': state,
+            'address_zip': f'{rng.randint(10000, 99999)}',
+            'rating': round(rng.uniform(1, 5), 1),
+            'review_count': rng.randint(0, 500),
+            'hours': {'Monday': '24 hours'},
+            'services': ['towing', 'roadside assistance'],
+            'has_impound_service': rng.random() < 0.3,
+        })
+    return companies
+
+
+async def run_upsert(db: AsyncSession, companies: List[Dict[str, Any]], zone_id: UUID, batch_size: int) -> Dict[str, int]:
+    totals = {'created': 0, 'updated': 0, 'unchanged': 0}
+    for start in range(0, len(companies), batch_size):
+        result = await CompanyService.bulk_upsert_companies(
+            db,
+            companies[start:start + batch_size],
+            zone_id,
+            defaults={'scraping_stage': 'google_maps'}
+        )
+        await db.commit()
+        totals['created'] += result['created']
+        totals['updated'] += result['updated']
+        totals['unchanged'] += result['unchanged']
+    return totals
+
+
+async def run_copy(db: AsyncSession, companies: List[Dict[str, Any]], zone_id: UUID, batch_size: int) -> Dict[str, int]:
+    result = await CompanyLoader.load_companies(db, companies, zone_id)
+    return {'created': result['created'], 'updated': result['updated'], 'unchanged': result['unchanged']}
+
+
+LOADERS = {'upsert': run_upsert, 'copy': run_copy}
+
+
+async def cleanup(db: AsyncSession, zone_id: UUID) -> None:
+    await db.execute(delete(Company).where(Company.zone_id == zone_id))
+    await db.execute(delete(Zone).where(Zone.id == zone_id))
+    await db.commit()
+
+
+async def benchmark(database_url: str, rows: int, batch_size: int, loaders: List[str]) -> None:
+    engine = create_async_engine(database_url, **build_engine_options(database_url))
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    print(f"Benchmarking {rows} synthetic companies (batch size {batch_size} for upsert)\n")
+    print(f"{'loader':<8} {'pass':<8} {'rows':>8} {'seconds':>9} {'rows/sec':>10}")
+
+    try:
+        for seed, name in enumerate(loaders):
+            companies = synthetic_companies(rows, seed)
+            async with session_factory() as db:
+                zone = Zone(name=f'Load benchmark ({name})', zone_type='state', state='ZZ')
+                db.add(zone)
+                await db.commit()
+                zone_id = zone.id
+                try:
+                    for label in ('insert', 'reload'):
+                        started = time.perf_counter()
+                        result = await LOADERS[name](db, companies, zone_id, batch_size)
+                        elapsed = time.perf_counter() - started
+                        processed = result['created'] + result['updated'] + result['unchanged']
+                        print(f"{name:<8} {label:<8} {processed:>8} {elapsed:>9.2f} {processed / elapsed:>10.0f}")
+                finally:
+                    await db.rollback()
+                    await cleanup(db, zone_id)
+    finally:
+        await engine.dispose()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Benchmark company import paths')
+    parser.add_argument('--database-url', default=settings.database_url,
+                        help='Scratch database to load into (default: DATABASE_URL)')
+    parser.add_argument('--rows', type=int, default=100000, help='Synthetic companies per loader')
+    parser.add_argument('--batch-size', type=int, default=500, help='Companies per bulk upsert')
+    parser.add_argument('--loaders', nargs='+', choices=sorted(LOADERS), default=['upsert', 'copy'])
+
+    args = parser.parse_args()
+
+    if not args.database_url or make_url(args.database_url).get_backend_name() != 'postgresql':
+        print("ERROR: the benchmark needs a Postgres --database-url (or DATABASE_URL)")
+        sys.exit(1)
+
+    await benchmark(args.database_url, args.rows, args.batch_size, args.loaders)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Apify mapping throughput benchmark
+
+Builds raw Apify Google Maps items from the bundled JSON fixtures (the mapped
+companies in towing_data.json and baltimore_impound_leads.json, converted
+back to the actor's item shape), repeats them up to ``--items``, and maps
+them with BatchMapper in a single process and in a process pool, both from
+in-memory chunks (items are pickled to the workers) and from dataset archive
+chunk files (workers read the files themselves, as reprocess_archive.py does).
+The pool only pays off with several cores and file input.
+
+Usage:
+    python scripts/benchmark_mapping.py [--items 200000] [--chunk-size 1000] [--workers 4]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.apify_mapper import BatchMapper, MappedBatch, MappingSummary
+from app.utils.dataset_archive import DatasetArchive
+
+FIXTURES = ("towing_data.json", "baltimore_impound_leads.json")
+
+
+def raw_item(company: Dict[str, Any]) -> Dict[str, Any]:
+    """Apify item that maps back to ``company``"""
+    address = ", ".join(filter(None, [
+        company.get("address_street"),
+        company.get("address_city"),
+        " ".join(filter(None, [company.get("address_state"), company.get("address_zip")])),
+    ]))
+    item = {
+        "title": company.get("name"),
+        "address": address,
+        "phone": company.get("phone_primary"),
+        "website": company.get("website"),
+        "url": company.get("google_business_url"),
+        "rating": company.get("rating"),
+        "reviewsCount": company.get("review_count"),
+        "openingHours": company.get("hours"),
+    }
+    if company.get("latitude") and company.get("longitude"):
+        item["location"] = {"lat": company["latitude"], "lng": company["longitude"]}
+    for key in ("category", "description", "reviews"):
+        if company.get(key):
+            item[key] = company[key]
+    return item
+
+
+def load_fixture_items() -> List[Dict[str, Any]]:
+    items = []
+    for name in FIXTURES:
+        path = PROJECT_ROOT / name
+        if path.exists():
+            with open(path) as f:
+                items.extend(raw_item(company) for company in json.load(f).get("companies", []))
+    return items
+
+
+def make_chunks(items: List[Dict[str, Any]], total: int, chunk_size: int) -> List[Tuple[int, List[Dict[str, Any]]]]:
+    chunks = []
+    for offset in range(0, total, chunk_size):
+        size = min(chunk_size, total - offset)
+        chunks.append((offset, [items[(offset + i) % len(items)] for i in range(size)]))
+    return chunks
+
+
+def run(batches: Iterator[MappedBatch]) -> Tuple[MappingSummary, float]:
+    summary = MappingSummary()
+    started = time.perf_counter()
+    for batch in batches:
+        summary.add(batch)
+    return summary, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single- vs multi-process Apify item mapping")
+    parser.add_argument("--items", type=int, default=200000, help="Items to map (fixtures are repeated)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Items per chunk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes for the pool run")
+    args = parser.parse_args()
+
+    fixture_items = load_fixture_items()
+    if not fixture_items:
+        print(f"ERROR: No fixtures found ({', '.join(FIXTURES)})")
+        sys.exit(1)
+    chunks = make_chunks(fixture_items, args.items, args.chunk_size)
+    print(f"{len(fixture_items)} fixture items, mapping {args.items} in {len(chunks)} chunks\n")
+    print(f"{'input':<7} {'workers':>7} {'seconds':>9} {'items/sec':>11} {'mapped':>8} "
+          f"{'invalid':>8} {'errors':>7}")
+
+    with tempfile.TemporaryDirectory() as archive_dir:
+        archive = DatasetArchive(archive_dir)
+        for offset, items in chunks:
+            archive.write_chunk("benchmark", "fixtures", offset, items)
+        paths = archive.chunk_paths("benchmark")
+
+        for source in ("memory", "files"):
+            baseline = None
+            for workers in sorted({1, args.workers}):
+                mapper = BatchMapper(workers)
+                batches = mapper.map_chunks(chunks) if source == "memory" else mapper.map_files(paths)
+                summary, elapsed = run(batches)
+                rate = summary.items / elapsed
+                baseline = baseline or rate
+                print(f"{source:<7} {workers:>7} {elapsed:>9.2f} {rate:>11.0f} {summary.mapped:>8} "
+                      f"{summary.invalid:>8} {summary.errors:>7}   x{rate / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Mapped company memory benchmark
+
+Maps ``--records`` raw items built from the bundled JSON fixtures (see
+benchmark_mapping.py) and measures, with tracemalloc, the memory held by the
+batch as map_apify_item dicts versus MappedCompany records, plus the pickled
+size of each (what a worker process sends back).
+
+Usage:
+    python scripts/benchmark_record_memory.py [--records 50000]
+"""
+import argparse
+import gc
+import pickle
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.apify_mapper import map_apify_item, map_apify_record
+from benchmark_mapping import load_fixture_items, FIXTURES
+
+
+def measure(build: Callable[[], List[Any]]) -> Dict[str, Any]:
+    """Bytes allocated and still held after building a batch"""
+    gc.collect()
+    tracemalloc.start()
+    batch = build()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"batch": batch, "held": held, "pickled": len(pickle.dumps(batch, protocol=pickle.HIGHEST_PROTOCOL))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory of dict vs slotted mapped companies")
+    parser.add_argument("--records", type=int, default=50000, help="Records in the batch")
+    args = parser.parse_args()
+
+    fixture_items = load_fixture_items()
+    if not fixture_items:
+        print(f"ERROR: No fixtures found ({', '.join(FIXTURES)})")
+        sys.exit(1)
+    items = [fixture_items[i % len(fixture_items)] for i in range(args.records)]
+
+    results = {
+        "dict": measure(lambda: [map_apify_item(item) for item in items]),
+        "slots": measure(lambda: [map_apify_record(item) for item in items]),
+    }
+
+    print(f"{args.records} mapped companies from {len(fixture_items)} fixture items\n")
+    print(f"{'record':<7} {'held MB':>9} {'bytes/rec':>10} {'pickled MB':>11}")
+    for name, result in results.items():
+        print(f"{name:<7} {result['held'] / 1e6:>9.1f} {result['held'] / args.records:>10.0f} "
+              f"{result['pickled'] / 1e6:>11.1f}")
+
+    dict_held, slots_held = results["dict"]["held"], results["slots"]["held"]
+    print(f"\nSlotted records hold {100 * (1 - slots_held / dict_held):.0f}% less memory "
+          f"({(dict_held - slots_held) / args.records:.0f} bytes per record)")
+
+
+if __name__ == "__main__":
+    main()
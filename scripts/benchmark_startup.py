@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Startup import-time benchmark
+
+Imports a module in fresh interpreters with ``python -X importtime`` and
+reports the cumulative import time plus the slowest imports underneath it.
+
+Usage:
+    python scripts/benchmark_startup.py [--module app.main] [--runs 5] [--top 20]
+    python scripts/benchmark_startup.py --budget 2.0   # exit 1 if the median is over budget
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse ``-X importtime`` output
+
+    Returns:
+        List of (module, self_us, cumulative_us) in import order
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_field, cumulative_field, module = line.split("|", 2)
+        self_us = int(self_field.split(":")[1])
+        entries.append((module.strip(), self_us, int(cumulative_field)))
+    return entries
+
+
+def measure_import(module: str) -> List[Tuple[str, int, int]]:
+    """Import ``module`` in a fresh interpreter and return its importtime entries"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+    return parse_importtime(result.stderr)
+
+
+def module_import_seconds(module: str) -> float:
+    """Cumulative import time of ``module`` in a fresh interpreter, in seconds"""
+    for name, _, cumulative_us in measure_import(module):
+        if name == module:
+            return cumulative_us / 1_000_000
+    raise RuntimeError(f"{module} not found in importtime output")
+
+
+def top_level_packages(entries: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """Sum self time per top-level package (``sqlalchemy``, ``fastapi``, ...)"""
+    totals: Dict[str, int] = {}
+    for module, self_us, _ in entries:
+        package = module.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of the API entry point")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget", type=float, help="Fail if the median import time (seconds) exceeds this")
+    args = parser.parse_args()
+
+    # Warm the bytecode and filesystem caches so runs are comparable
+    measure_import(args.module)
+
+    timings = []
+    last_entries = []
+    for _ in range(args.runs):
+        last_entries = measure_import(args.module)
+        total = next(c for m, _, c in last_entries if m == args.module)
+        timings.append(total / 1_000_000)
+
+    median = statistics.median(timings)
+    print(f"Module: {args.module}")
+    print(f"Runs: {args.runs}")
+    print(f"Import time s  median={median:.3f}  min={min(timings):.3f}  max={max(timings):.3f}")
+
+    print("\nSlowest packages (self time, last run):")
+    packages = sorted(top_level_packages(last_entries).items(), key=lambda item: -item[1])
+    for package, self_us in packages[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+
+    if args.budget is not None and median > args.budget:
+        print(f"\nOver budget: {median:.3f}s > {args.budget:.3f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ Script to download previous Apify towing data runs
 Usage:
     source venv/bin/activate
     python scripts/download_apify_runs.py [--limit-runs N] [--limit-items N] [--output FILE]
+    python scripts/download_apify_runs.py --archive [--run-id ID]   # raw items into APIFY_ARCHIVE_DIR
 """
 import asyncio
 import json
@@ -18,8 +19,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.services.apify_service import ApifyService
+from app.utils.dataset_archive import DatasetArchive
 from app.config import settings
 
+DEFAULT_ARCHIVE_DIR = "data/apify_archive"
+
 
 async def main():
     parser = argparse.ArgumentParser(description="Download previous Apify towing data runs")
@@ -52,6 +56,11 @@ async def main():
         default=None,
         help="Download specific run by ID",
     )
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="Store raw dataset items in the local archive instead of writing --output",
+    )
     
     args = parser.parse_args()
     
@@ -64,9 +73,25 @@ async def main():
         print("2. Add to .env file: APIFY_TOKEN=your_token_here")
         sys.exit(1)
     
-    apify_service = ApifyService()
+    apify_service = ApifyService(
+        archive=DatasetArchive(settings.apify_archive_dir or DEFAULT_ARCHIVE_DIR) if args.archive else None
+    )
     
     try:
+        if args.archive:
+            if args.run_id:
+                run_ids = [args.run_id]
+            else:
+                run_ids = [run["run_id"] for run in await apify_service.list_all_towing_runs(limit=args.limit_runs)]
+            print(f"Archiving {len(run_ids)} runs into {apify_service.archive.root}")
+            for run_id in run_ids:
+                try:
+                    count = await apify_service.archive_run(run_id)
+                    print(f"  ✓ {run_id}: {count} items")
+                except Exception as e:
+                    print(f"  ✗ {run_id}: {e}")
+            return
+        
         if args.run_id:
             # Download specific run
             print(f"Downloading data from run: {args.run_id}")
@@ -2,32 +2,174 @@
 """
 Script to download Apify datasets and import them into Supabase
 
+Datasets are read in chunks and each run's progress is checkpointed in
+apify_runs (import_offset), so an interrupted import resumes from the last
+committed chunk. Runs whose processing_status is 'completed' are skipped; a run cut
+short by --limit-items is left pending and resumes on the next import.
+
 Usage:
     make apify-import-to-supabase ZONE_ID=<uuid> [LIMIT_RUNS=N] [LIMIT_ITEMS=N]
-    Or: python scripts/import_apify_to_supabase.py --zone-id <uuid> [--limit-runs N] [--limit-items N]
+    Or: python scripts/import_apify_to_supabase.py --zone-id <uuid> [--limit-runs N] [--limit-items N] [--loader copy]
+        [--chunk-size 1000] [--restart]
 """
 import asyncio
 import argparse
 import sys
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.services.apify_service import ApifyService
+from app.services.apify_mapper import map_items, MappingSummary, MappedCompany
 from app.services.company_service import CompanyService
+from app.services.company_loader import CompanyLoader, DEFAULT_SCRAPING_STAGE
+from app.services.apify_run_service import ApifyRunService
 from app.services.zone_service import ZoneService
 from app.database import get_db
 from app.config import settings
+from app.models.apify_run import ApifyRun
+from app.models.company import Company
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Dataset items per request and per checkpoint
+IMPORT_CHUNK_SIZE = 1000
+
+
+async def import_chunk(
+    db: AsyncSession,
+    mapped_companies: List[MappedCompany],
+    zone_id: UUID,
+    loader: str,
+    run: ApifyRun,
+    next_offset: int
+) -> Tuple[int, int, int, int]:
+    """
+    Write one chunk of mapped companies and advance the run's checkpoint
+    
+    The copy loader commits the checkpoint in the same transaction as the
+    merge. upsert_company commits per changed company (scraping stage
+    included), so the upsert path only advances the checkpoint once the
+    whole chunk is written.
+    
+    Returns:
+        (created, updated, unchanged, errors)
+    """
+    if loader == 'copy':
+        ApifyRunService.record_chunk(run, next_offset)
+        result = await CompanyLoader.load_companies(db, mapped_companies, zone_id)
+        return result['created'], result['updated'], result['unchanged'], result['skipped']
+    
+    imported = 0
+    updated = 0
+    unchanged = 0
+    errors = 0
+    for mapped in mapped_companies:
+        try:
+            # Create or update company (unchanged companies aren't written)
+            company, changed = await CompanyService.upsert_company(
+                db, mapped.company_values(), zone_id,
+                defaults={'scraping_stage': DEFAULT_SCRAPING_STAGE}
+            )
+            
+            if changed is None:
+                imported += 1
+            elif changed:
+                updated += 1
+            else:
+                unchanged += 1
+        except Exception as e:
+            await db.rollback()
+            errors += 1
+            print(f"    ⚠ Error importing company: {e}")
+    
+    ApifyRunService.record_chunk(run, next_offset)
+    await db.commit()
+    return imported, updated, unchanged, errors
+
+
+async def import_run(
+    db: AsyncSession,
+    apify_service: ApifyService,
+    run: ApifyRun,
+    zone_id: UUID,
+    loader: str = 'upsert',
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    limit: Optional[int] = None,
+    restart: bool = False,
+    mapping_summary: Optional[MappingSummary] = None
+) -> Dict[str, Any]:
+    """
+    Import one run's dataset from its checkpoint
+    
+    ``limit`` stops at that dataset position; a run cut short by it stays
+    resumable rather than completed (see ApifyRunService.end_import).
+    
+    Returns:
+        {'status': 'completed' | 'partial' | 'failed', 'offset': int,
+         'created': int, 'updated': int, 'unchanged': int, 'errors': int}
+    """
+    result = {'status': 'failed', 'created': 0, 'updated': 0, 'unchanged': 0, 'errors': 0}
+    offset = await ApifyRunService.start_import(db, run, restart=restart)
+    if offset:
+        print(f"\n📦 Resuming run {run.run_id} from item {offset}...")
+    else:
+        print(f"\n📦 Importing run {run.run_id}...")
+    
+    try:
+        async for chunk_offset, items in apify_service.iter_run_items(
+            run.run_id,
+            offset=offset,
+            chunk_size=chunk_size,
+            limit=limit
+        ):
+            next_offset = chunk_offset + len(items)
+            batch = map_items(items, chunk_offset)
+            if mapping_summary is not None:
+                mapping_summary.add(batch)
+            chunk_imported, chunk_updated, chunk_unchanged, chunk_errors = await import_chunk(
+                db, batch.companies, zone_id, loader, run, next_offset
+            )
+            chunk_errors += batch.invalid + batch.errors
+            offset = next_offset
+            
+            result['created'] += chunk_imported
+            result['updated'] += chunk_updated
+            result['unchanged'] += chunk_unchanged
+            result['errors'] += chunk_errors
+            print(f"  ✓ Items {chunk_offset}-{next_offset}: {chunk_imported} new, "
+                  f"{chunk_updated} updated, {chunk_unchanged} unchanged, {chunk_errors} errors")
+        
+        if await ApifyRunService.end_import(db, run, offset, limit):
+            result['status'] = 'completed'
+        else:
+            result['status'] = 'partial'
+            print(f"  ⏸ Stopped at the item limit; run {run.run_id} resumes from item {offset}")
+    except Exception as e:
+        await ApifyRunService.fail_import(db, run, str(e))
+        print(f"  ⚠ Error importing run {run.run_id} (resume from item {offset}): {e}")
+    result['offset'] = offset
+    return result
 
 
 async def import_apify_data_to_supabase(
     zone_id: UUID,
     limit_runs: int = 10,
-    limit_items_per_run: int = None
+    limit_items_per_run: int = None,
+    loader: str = 'upsert',
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    restart: bool = False
 ):
-    """Download Apify data and import into Supabase"""
+    """
+    Download Apify data and import into Supabase
+    
+    With ``loader='copy'`` each chunk of mapped companies is written through
+    CompanyLoader's staging table in a single merge. ``restart`` ignores saved
+    checkpoints and reprocesses completed runs from the first item.
+    """
     
     # Check for API token
     if not settings.apify_token:
@@ -56,122 +198,75 @@ async def import_apify_data_to_supabase(
                 sys.exit(1)
             
             print(f"✓ Found zone: {zone.name} ({zone.state})")
-            print(f"\nDownloading Apify data and importing to Supabase...")
+            print(f"\nImporting Apify runs into Supabase...")
             print(f"  Zone ID: {zone_id}")
             print(f"  Max runs: {limit_runs}")
             if limit_items_per_run:
                 print(f"  Max items per run: {limit_items_per_run}")
             print()
             
-            # Download all towing data
-            result = await apify_service.download_all_towing_data(
-                limit_runs=limit_runs,
-                limit_items_per_run=limit_items_per_run
-            )
-            
-            print(f"\nDownload Summary:")
-            print(f"  Total runs processed: {result['total_runs']}")
-            print(f"  Total companies downloaded: {result['total_companies']}")
+            runs = await apify_service.list_all_towing_runs(limit=limit_runs)
+            print(f"Found {len(runs)} towing runs")
             
-            # Import companies
             imported_count = 0
             updated_count = 0
+            unchanged_count = 0
             error_count = 0
+            completed_runs = 0
+            skipped_runs = 0
+            partial_runs = 0
+            failed_runs = 0
+            mapping_summary = MappingSummary()
             
-            for run in result['runs']:
-                if not run.get('downloaded'):
-                    print(f"\n⚠ Skipping run {run['run_id']}: {run.get('error', 'Not downloaded')}")
-                    continue
-                
-                # Download companies from this run
-                run_id = run['run_id']
-                companies_count = run.get('companies_count', 0)
-                
-                if companies_count == 0:
-                    print(f"\n⚠ Run {run_id} has no companies")
+            for run_summary in runs:
+                run_id = run_summary['run_id']
+                run = await ApifyRunService.get_or_create_run(
+                    db,
+                    run_id,
+                    zone_id=zone_id,
+                    query=run_summary.get('search_query'),
+                    status=run_summary.get('status')
+                )
+                if run.processing_status == 'completed' and not restart:
+                    skipped_runs += 1
+                    print(f"\n⏭ Skipping run {run_id}: already completed")
                     continue
                 
-                print(f"\n📦 Downloading {companies_count} companies from run {run_id}...")
-                
-                try:
-                    companies_data = await apify_service.download_run_data(
-                        run_id=run_id,
-                        limit=limit_items_per_run
-                    )
-                except Exception as e:
-                    print(f"  ⚠ Error downloading run {run_id}: {e}")
-                    error_count += companies_count
-                    continue
-                
-                if not companies_data:
-                    print(f"  ⚠ No companies returned from run {run_id}")
-                    continue
-                
-                print(f"  ✓ Downloaded {len(companies_data)} companies, importing...")
-                
-                batch_imported = 0
-                batch_updated = 0
-                batch_errors = 0
-                
-                for company_data in companies_data:
-                    try:
-                        # Map Apify data to our schema
-                        mapped_data = apify_service._map_apify_result(company_data)
-                        if not mapped_data:
-                            batch_errors += 1
-                            continue
-                        
-                        # Check if company exists (for stats)
-                        google_url = mapped_data.get('google_business_url')
-                        if google_url:
-                            from sqlalchemy import select
-                            from app.models.company import Company
-                            result_check = await db.execute(
-                                select(Company).where(Company.google_business_url == google_url)
-                            )
-                            existing = result_check.scalar_one_or_none()
-                            
-                            if existing:
-                                batch_updated += 1
-                            else:
-                                batch_imported += 1
-                        
-                        # Create or update company
-                        company = await CompanyService.create_or_update_company(
-                            db,
-                            mapped_data,
-                            zone_id
-                        )
-                        
-                        # Set scraping stage
-                        if not company.scraping_stage:
-                            company.scraping_stage = 'google_maps'
-                            await db.commit()
-                            await db.refresh(company)
-                        
-                    except Exception as e:
-                        batch_errors += 1
-                        print(f"    ⚠ Error importing company: {e}")
-                        continue
-                
-                await db.commit()
-                imported_count += batch_imported
-                updated_count += batch_updated
-                error_count += batch_errors
-                
-                print(f"  ✓ Imported: {batch_imported} new, {batch_updated} updated, {batch_errors} errors")
+                result = await import_run(
+                    db, apify_service, run, zone_id,
+                    loader=loader,
+                    chunk_size=chunk_size,
+                    limit=limit_items_per_run,
+                    restart=restart,
+                    mapping_summary=mapping_summary
+                )
+                imported_count += result['created']
+                updated_count += result['updated']
+                unchanged_count += result['unchanged']
+                error_count += result['errors']
+                if result['status'] == 'completed':
+                    completed_runs += 1
+                elif result['status'] == 'partial':
+                    partial_runs += 1
+                else:
+                    failed_runs += 1
             
             print(f"\n{'='*60}")
             print(f"Import Complete!")
             print(f"{'='*60}")
             print(f"  ✓ New companies imported: {imported_count}")
             print(f"  ✓ Companies updated: {updated_count}")
+            print(f"  ✓ Companies unchanged: {unchanged_count}")
             print(f"  ✗ Errors: {error_count}")
-            print(f"  Total processed: {imported_count + updated_count}")
+            print(f"  Total processed: {imported_count + updated_count + unchanged_count}")
+            print(f"  Runs: {completed_runs} completed, {partial_runs} stopped at the item limit, "
+                  f"{skipped_runs} already completed, {failed_runs} failed")
+            if mapping_summary.errors:
+                print(f"  ⚠ {mapping_summary.errors} items failed to map, e.g.:")
+                for sample in mapping_summary.error_samples:
+                    print(f"    item {sample['offset']}: {sample['error']}")
             
             # Get final counts
-            from sqlalchemy import select, func
-            from app.models.company import Company
             total_result = await db.execute(
                 select(func.count(Company.id)).where(Company.zone_id == zone_id)
             )
@@ -209,6 +304,23 @@ async def main():
         default=None,
         help="Maximum items per run (default: all)",
     )
+    parser.add_argument(
+        "--loader",
+        choices=["upsert", "copy"],
+        default="upsert",
+        help="upsert: one company at a time; copy: COPY into a staging table and merge per chunk",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=IMPORT_CHUNK_SIZE,
+        help=f"Dataset items per chunk/checkpoint (default: {IMPORT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore checkpoints: reprocess completed runs from the first item",
+    )
     
     args = parser.parse_args()
     
@@ -222,7 +334,10 @@ async def main():
     await import_apify_data_to_supabase(
         zone_id=zone_id,
         limit_runs=args.limit_runs,
-        limit_items_per_run=args.limit_items
+        limit_items_per_run=args.limit_items,
+        loader=args.loader,
+        chunk_size=args.chunk_size,
+        restart=args.restart
     )
 
 
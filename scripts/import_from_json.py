@@ -2,163 +2,273 @@
 """
 Script to import companies from the all_towing_leads.json file
 
+Streams the ``companies`` array (or a JSON Lines file with one company per
+line) instead of loading the whole file, and writes each state's companies in
+bulk upsert batches, so memory stays flat regardless of file size.
+
+``--loader copy`` is for large initial loads: companies are streamed into a
+staging table with COPY and merged with one INSERT ... ON CONFLICT (see
+CompanyLoader), with state zones created in SQL.
+
 Usage:
-    python scripts/import_from_json.py [--json-file path/to/file.json]
+    python scripts/import_from_json.py [--json-file path/to/file.json] [--batch-size 500]
+    python scripts/import_from_json.py --json-file leads.jsonl   # JSON Lines, detected by extension
+    python scripts/import_from_json.py --loader copy
 """
 import asyncio
 import argparse
 import sys
-import json
+import time
 from pathlib import Path
 from collections import defaultdict
+from typing import Any, Dict, Iterator, List
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.database import get_db
 from app.services.company_service import CompanyService
-from app.services.zone_service import ZoneService
+from app.services.company_loader import CompanyLoader
 from app.models.zone import Zone
-from app.models.company import Company
+from app.utils.json_stream import iter_json_array, iter_json_lines
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Companies per bulk upsert (per state)
+IMPORT_BATCH_SIZE = 500
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 5.0
+
+JSON_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+
+
+def iter_companies(json_path: Path, input_format: str = 'auto') -> Iterator[Dict[str, Any]]:
+    """Stream company records from a JSON export or a JSON Lines file"""
+    if input_format == 'auto':
+        input_format = 'jsonl' if json_path.suffix in JSON_LINES_SUFFIXES else 'json'
+
+    with open(json_path, 'r') as f:
+        if input_format == 'jsonl':
+            yield from iter_json_lines(f)
+        else:
+            yield from iter_json_array(f, key='companies')
+
+
+def company_state(company_data: Dict[str, Any]) -> str:
+    """Two-letter state for a record, or '' if it has none usable"""
+    state = company_data.get('address_state') or ''
+    if state == 'Unknown' or len(state) != 2 or not state.isalpha():
+        return ''
+    return state
+
+
+async def get_or_create_state_zone(db: AsyncSession, state: str) -> Zone:
+    """Get the state-level zone, creating it on first use"""
+    result = await db.execute(
+        select(Zone).where(Zone.state == state).where(Zone.zone_type == 'state')
+    )
+    zone = result.scalar_one_or_none()
+
+    if not zone:
+        zone = Zone(
+            name=f'{state} State',
+            zone_type='state',
+            state=state
+        )
+        db.add(zone)
+        await db.commit()
+        await db.refresh(zone)
+        print(f'✓ Created zone: {zone.id} - {zone.name}')
+    else:
+        print(f'✓ Using existing zone: {zone.id} - {zone.name}')
+    return zone
+
+
+class ImportProgress:
+    """Running totals with periodic rows/sec reporting"""
+
+    def __init__(self, interval: float = PROGRESS_INTERVAL):
+        self.interval = interval
+        self.started = time.monotonic()
+        self.last_report = self.started
+        self.read = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.skipped = 0
+        self.errors = 0
+        self.failed_batches = 0
+        self.by_state: Dict[str, int] = defaultdict(int)
+
+    @property
+    def written(self) -> int:
+        return self.created + self.updated
+
+    @property
+    def processed(self) -> int:
+        return self.written + self.unchanged
+
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def maybe_report(self) -> None:
+        now = time.monotonic()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report()
+
+    def report(self) -> None:
+        print(f'  Progress: {self.read} read, {self.written} written '
+              f'({self.created} new, {self.updated} updated), {self.unchanged} unchanged, '
+              f'{self.skipped + self.errors} skipped/errors, {self.rate():.0f} rows/sec')
+
 
+async def flush_state(
+    db: AsyncSession,
+    state: str,
+    batch: List[Dict[str, Any]],
+    zones: Dict[str, Zone],
+    progress: ImportProgress
+) -> None:
+    """Bulk upsert one state's pending batch and commit"""
+    if state not in zones:
+        zones[state] = await get_or_create_state_zone(db, state)
 
-async def import_from_json(json_file: str = "all_towing_leads.json"):
+    try:
+        result = await CompanyService.bulk_upsert_companies(
+            db,
+            batch,
+            zones[state].id,
+            defaults={'scraping_stage': 'google_maps'},
+            reassign_zone=False
+        )
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        progress.errors += len(batch)
+        progress.failed_batches += 1
+        if progress.failed_batches <= 10:
+            print(f'  ⚠ Error importing batch of {len(batch)} for {state}: {e}')
+        return
+
+    progress.created += result['created']
+    progress.updated += result['updated']
+    progress.unchanged += result['unchanged']
+    progress.skipped += result['skipped']
+    progress.by_state[state] += result['created'] + result['updated'] + result['unchanged']
+
+
+async def load_with_copy(db: AsyncSession, json_path: Path, input_format: str, progress: ImportProgress) -> None:
+    """Load the whole file through the staging table in one merge"""
+    def companies() -> Iterator[Dict[str, Any]]:
+        for company_data in iter_companies(json_path, input_format):
+            progress.read += 1
+            if company_state(company_data):
+                yield company_data
+            else:
+                progress.skipped += 1
+
+    result = await CompanyLoader.load_companies(db, companies(), reassign_zone=False)
+    progress.created += result['created']
+    progress.updated += result['updated']
+    progress.unchanged += result['unchanged']
+    progress.skipped += result['skipped']
+    if result['zones_created']:
+        print(f"✓ Created {result['zones_created']} state zones")
+
+
+async def import_from_json(
+    json_file: str = "all_towing_leads.json",
+    batch_size: int = IMPORT_BATCH_SIZE,
+    input_format: str = 'auto',
+    loader: str = 'upsert'
+):
     """Import companies from JSON file"""
-    
+
     json_path = Path(json_file)
     if not json_path.exists():
         print(f"ERROR: JSON file not found: {json_file}")
         sys.exit(1)
-    
-    print(f"Loading companies from {json_file}...")
-    with open(json_path, 'r') as f:
-        data = json.load(f)
-    
-    companies_data = data.get('companies', [])
-    print(f"Found {len(companies_data)} companies in JSON file")
-    
+
+    print(f"Streaming companies from {json_file}...")
+    progress = ImportProgress()
+
     async for db in get_db():
-        # Group companies by state
-        by_state = defaultdict(list)
-        
-        for company_data in companies_data:
-            state = company_data.get('address_state', 'Unknown')
-            if state and state != 'Unknown' and state != '21060' and len(state) == 2:
-                by_state[state].append(company_data)
-        
+        if loader == 'copy':
+            await load_with_copy(db, json_path, input_format, progress)
+            elapsed = time.monotonic() - progress.started
+            print(f'\n' + '='*60)
+            print(f'IMPORT COMPLETE')
+            print(f'='*60)
+            print(f'  ✓ New companies imported: {progress.created}')
+            print(f'  ✓ Companies updated: {progress.updated}')
+            print(f'  = Companies unchanged: {progress.unchanged}')
+            print(f'  = Companies unchanged: {progress.unchanged}')
+            print(f'  ⚠ Skipped (no state, missing required fields, duplicates): {progress.skipped}')
+            print(f'  Total processed: {progress.processed} of {progress.read} read '
+                  f'in {elapsed:.1f}s ({progress.rate():.0f} rows/sec)')
+            break
+
+        zones: Dict[str, Zone] = {}
+        pending: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+        for company_data in iter_companies(json_path, input_format):
+            progress.read += 1
+            state = company_state(company_data)
+            if not state:
+                progress.skipped += 1
+                continue
+            if not company_data.get('name') or not company_data.get('google_business_url'):
+                progress.skipped += 1
+                if progress.skipped <= 5:
+                    print(f'  ⚠ Skipping company {progress.read}: missing name or google_business_url')
+                continue
+
+            batch = pending[state]
+            batch.append(company_data)
+            if len(batch) >= batch_size:
+                await flush_state(db, state, batch, zones, progress)
+                batch.clear()
+            progress.maybe_report()
+
+        for state, batch in pending.items():
+            if batch:
+                await flush_state(db, state, batch, zones, progress)
+
+        elapsed = time.monotonic() - progress.started
         print(f'\nCompanies by state:')
-        for state, companies in sorted(by_state.items()):
-            print(f'  {state}: {len(companies)}')
-        
-        # Create or get zones for each state
-        zones = {}
-        for state in by_state.keys():
-            result = await db.execute(
-                select(Zone).where(Zone.state == state).where(Zone.zone_type == 'state')
-            )
-            zone = result.scalar_one_or_none()
-            
-            if not zone:
-                zone = Zone(
-                    name=f'{state} State',
-                    zone_type='state',
-                    state=state
-                )
-                db.add(zone)
-                await db.commit()
-                await db.refresh(zone)
-                print(f'✓ Created zone: {zone.id} - {zone.name}')
-            else:
-                print(f'✓ Using existing zone: {zone.id} - {zone.name}')
-            
-            zones[state] = zone
-        
-        # Import companies
-        print(f'\nImporting companies...')
-        imported = 0
-        updated = 0
-        errors = 0
-        
-        for state, companies in by_state.items():
-            zone = zones[state]
-            print(f'\nImporting {len(companies)} companies for {state}...')
-            
-            for i, company_data in enumerate(companies, 1):
-                try:
-                    # Ensure required fields
-                    if not company_data.get('name') or not company_data.get('google_business_url'):
-                        errors += 1
-                        if errors <= 5:
-                            print(f'  ⚠ Skipping company {i}: missing name or google_business_url')
-                        continue
-                    
-                    # Check if company already exists
-                    google_url = company_data.get('google_business_url')
-                    result_check = await db.execute(
-                        select(Company).where(Company.google_business_url == google_url)
-                    )
-                    existing = result_check.scalar_one_or_none()
-                    
-                    if existing:
-                        # Update existing company
-                        for key, value in company_data.items():
-                            if hasattr(existing, key) and key not in ['id', 'zone_id', 'created_at', 'updated_at']:
-                                setattr(existing, key, value)
-                        if not existing.scraping_stage:
-                            existing.scraping_stage = 'google_maps'
-                        updated += 1
-                    else:
-                        # Create new company
-                        # Remove fields that don't exist in Company model
-                        clean_data = {k: v for k, v in company_data.items() 
-                                     if k not in ['latitude', 'longitude', 'photos', 'category', 'description', 'reviews']}
-                        
-                        company = await CompanyService.create_or_update_company(
-                            db,
-                            clean_data,
-                            zone.id
-                        )
-                        
-                        if not company.scraping_stage:
-                            company.scraping_stage = 'google_maps'
-                        
-                        imported += 1
-                    
-                    # Commit every 100 companies
-                    if (imported + updated) % 100 == 0:
-                        await db.commit()
-                        print(f'  Progress: {imported + updated}/{len(companies)}...')
-                        
-                except Exception as e:
-                    errors += 1
-                    if errors <= 10:
-                        print(f'  ⚠ Error importing company {i}: {e}')
-                    continue
-            
-            # Final commit for this state
-            await db.commit()
-            print(f'  ✓ Completed {state}: {imported} new, {updated} updated, {errors} errors')
-        
+        for state, count in sorted(progress.by_state.items()):
+            print(f'  {state}: {count}')
+
         print(f'\n' + '='*60)
         print(f'IMPORT COMPLETE')
         print(f'='*60)
-        print(f'  ✓ New companies imported: {imported}')
-        print(f'  ✓ Companies updated: {updated}')
-        print(f'  ✗ Errors: {errors}')
-        print(f'  Total processed: {imported + updated}')
-        
+        print(f'  ✓ New companies imported: {progress.created}')
+        print(f'  ✓ Companies updated: {progress.updated}')
+        print(f'  = Companies unchanged: {progress.unchanged}')
+        print(f'  ⚠ Skipped (no state, missing required fields): {progress.skipped}')
+        print(f'  ✗ Errors: {progress.errors}')
+        print(f'  Total processed: {progress.processed} of {progress.read} read '
+              f'in {elapsed:.1f}s ({progress.rate():.0f} rows/sec)')
+
         break
 
 
 async def main():
     parser = argparse.ArgumentParser(description='Import companies from JSON file')
-    parser.add_argument('--json-file', default='all_towing_leads.json', help='Path to JSON file')
-    
+    parser.add_argument('--json-file', default='all_towing_leads.json', help='Path to JSON or JSON Lines file')
+    parser.add_argument('--format', choices=['auto', 'json', 'jsonl'], default='auto',
+                        help='Input format (auto: .jsonl/.ndjson are JSON Lines)')
+    parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE,
+                        help='Companies per bulk upsert')
+    parser.add_argument('--loader', choices=['upsert', 'copy'], default='upsert',
+                        help='upsert: batched bulk upserts per state; copy: COPY into a staging table and merge once')
+
     args = parser.parse_args()
-    
-    await import_from_json(args.json_file)
+
+    await import_from_json(args.json_file, args.batch_size, args.format, args.loader)
 
 
 if __name__ == '__main__':
     asyncio.run(main())
-
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Load test for authenticated request overhead
+
+Sends requests through get_current_user on an in-process FastAPI app and
+reports latency and memory per request. ``--legacy`` reproduces the old
+behaviour (fresh Supabase clients and no token cache on every request) so the
+two can be compared against the same Supabase project.
+
+Usage:
+    python scripts/load_test_auth.py --token <access_token> [--requests 200]
+    python scripts/load_test_auth.py --mint [--legacy]   # HS256 token from SUPABASE_JWT_SECRET
+"""
+import asyncio
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from fastapi import Depends, FastAPI
+from app.auth import client as auth_client
+from app.auth.dependencies import get_current_user, token_cache
+from app.config import settings
+
+
+def mint_token(secret: str) -> str:
+    """Sign a short-lived test access token with the project's JWT secret"""
+    def b64(data: bytes) -> str:
+        return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+    header = b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = b64(json.dumps({
+        "sub": "load-test-user",
+        "aud": "authenticated",
+        "role": "authenticated",
+        "exp": int(time.time()) + 3600,
+    }).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{b64(signature)}"
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/whoami")
+    async def whoami(current_user: dict = Depends(get_current_user)):
+        return {"id": current_user.get("user", {}).get("id")}
+
+    return app
+
+
+def legacy_reset():
+    """Mimic the pre-cache behaviour: new clients and a cold cache per request"""
+    auth_client.reset_supabase_clients()
+    token_cache.clear()
+    auth_client.get_supabase_client()
+    auth_client.get_supabase_anon_client()
+
+
+async def run(token: str, requests: int, legacy: bool):
+    app = build_app()
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    peaks = []
+
+    async with httpx.AsyncClient(app=app, base_url="http://loadtest") as client:
+        # Warm up imports and the token cache
+        response = await client.get("/whoami", headers=headers)
+        if response.status_code != 200:
+            print(f"Warm-up request failed: {response.status_code} {response.text}")
+            return
+
+        tracemalloc.start()
+        start_current, _ = tracemalloc.get_traced_memory()
+        for _ in range(requests):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            started = time.perf_counter()
+            if legacy:
+                legacy_reset()
+            response = await client.get("/whoami", headers=headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            response.raise_for_status()
+        end_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    latencies.sort()
+    mode = "legacy (per-request clients, no cache)" if legacy else "current"
+    print(f"Mode: {mode}")
+    print(f"Requests: {requests}")
+    print(f"Latency ms  mean={statistics.mean(latencies):.2f}  "
+          f"p50={latencies[len(latencies) // 2]:.2f}  "
+          f"p95={latencies[int(len(latencies) * 0.95) - 1]:.2f}")
+    print(f"Peak memory per request: {statistics.mean(peaks) / 1024:.1f} KiB")
+    print(f"Retained growth per request: {(end_current - start_current) / requests / 1024:.2f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure auth overhead per request")
+    parser.add_argument("--token", help="Supabase access token to send")
+    parser.add_argument("--mint", action="store_true", help="Mint an HS256 token from SUPABASE_JWT_SECRET")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--legacy", action="store_true", help="Reproduce the old per-request behaviour")
+    args = parser.parse_args()
+
+    if args.mint:
+        if not settings.supabase_jwt_secret:
+            parser.error("--mint requires SUPABASE_JWT_SECRET")
+        token = mint_token(settings.supabase_jwt_secret)
+    elif args.token:
+        token = args.token
+    else:
+        parser.error("pass --token or --mint")
+
+    asyncio.run(run(token, args.requests, args.legacy))
+
+
+if __name__ == "__main__":
+    main()
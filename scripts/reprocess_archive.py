@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Re-map archived Apify runs without network access
+
+Reads raw items from the local dataset archive (APIFY_ARCHIVE_DIR), maps them
+with BatchMapper in a process pool (one chunk file per task), and writes the
+mapped companies to a JSON Lines file and/or loads them with CompanyLoader.
+Use it after changing the mapping rules or to import archived runs into
+another zone. Bad items are counted and a few are shown as samples.
+
+Usage:
+    python scripts/reprocess_archive.py --output mapped.jsonl
+    python scripts/reprocess_archive.py --run-id <run_id> --load [--zone-id <uuid>]
+    python scripts/reprocess_archive.py --archive-dir data/apify_archive --workers 8 --output mapped.jsonl
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from uuid import UUID
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.services.apify_mapper import BatchMapper, MappingSummary, MappedCompany
+from app.utils.dataset_archive import DatasetArchive
+
+DEFAULT_ARCHIVE_DIR = "data/apify_archive"
+
+
+def report(summary: MappingSummary, started: float) -> None:
+    elapsed = time.monotonic() - started
+    rate = summary.items / elapsed if elapsed > 0 else 0.0
+    print(f"  Mapped {summary.mapped} companies from {summary.items} items "
+          f"in {elapsed:.1f}s ({rate:.0f} items/sec)")
+    print(f"  Invalid (no title or URL): {summary.invalid}, errors: {summary.errors}")
+    for sample in summary.error_samples:
+        print(f"    item {sample['offset']}: {sample['error']}")
+
+
+def iter_mapped(chunk_files: List[Path], mapper: BatchMapper, summary: MappingSummary) -> Iterator[MappedCompany]:
+    """Mapped companies in archive order"""
+    for batch in mapper.map_files(chunk_files):
+        summary.add(batch)
+        yield from batch.companies
+
+
+async def load_mapped(companies: Iterator[MappedCompany], zone_id: Optional[UUID]) -> Dict[str, int]:
+    from app.database import get_db
+    from app.services.company_loader import CompanyLoader
+
+    async for db in get_db():
+        return await CompanyLoader.load_companies(db, companies, zone_id=zone_id, reassign_zone=zone_id is not None)
+
+
+def select_runs(archive: DatasetArchive, run_ids: Optional[List[str]], include_partial: bool) -> List[str]:
+    runs = archive.runs()
+    if run_ids:
+        missing = [run_id for run_id in run_ids if run_id not in runs]
+        if missing:
+            print(f"ERROR: Runs not in archive: {', '.join(missing)}")
+            sys.exit(1)
+        return run_ids
+    return [run_id for run_id, entry in runs.items() if entry["complete"] or include_partial]
+
+
+async def reprocess(
+    archive_dir: str,
+    run_ids: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    output: Optional[str] = None,
+    load: bool = False,
+    zone_id: Optional[UUID] = None,
+    include_partial: bool = False
+):
+    archive = DatasetArchive(archive_dir)
+    selected = select_runs(archive, run_ids, include_partial)
+    if not selected:
+        print(f"No archived runs to reprocess in {archive_dir}")
+        return
+
+    chunk_files = [path for run_id in selected for path in archive.chunk_paths(run_id)]
+    total_items = sum(archive.get_run(run_id)["items"] for run_id in selected)
+    mapper = BatchMapper(workers)
+    print(f"Re-mapping {total_items} archived items from {len(selected)} runs "
+          f"({len(chunk_files)} chunks, {mapper.workers} workers)")
+
+    started = time.monotonic()
+    summary = MappingSummary()
+    companies = iter_mapped(chunk_files, mapper, summary)
+
+    if output:
+        output_file = open(output, "w")
+
+        def write_through(records: Iterator[MappedCompany]) -> Iterator[MappedCompany]:
+            for record in records:
+                output_file.write(json.dumps(record.to_dict(), default=str))
+                output_file.write("\n")
+                yield record
+
+        companies = write_through(companies)
+
+    try:
+        if load:
+            result = await load_mapped(companies, zone_id)
+            print(f"  ✓ Loaded: {result['created']} new, {result['updated']} updated, "
+                  f"{result['unchanged']} unchanged, {result['skipped']} skipped, {result['zones_created']} zones created")
+        else:
+            for _ in companies:
+                pass
+    finally:
+        if output:
+            output_file.close()
+
+    report(summary, started)
+    if output:
+        print(f"  ✓ Mapped companies written to {output}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Re-map archived Apify runs offline")
+    parser.add_argument("--archive-dir", default=settings.apify_archive_dir or DEFAULT_ARCHIVE_DIR,
+                        help="Dataset archive directory (default: APIFY_ARCHIVE_DIR or data/apify_archive)")
+    parser.add_argument("--run-id", action="append", dest="run_ids",
+                        help="Archived run to reprocess (repeatable; default: all complete runs)")
+    parser.add_argument("--include-partial", action="store_true",
+                        help="Also reprocess runs whose dataset is only partly archived")
+    parser.add_argument("--workers", type=int, default=None, help="Mapping processes (default: CPU count)")
+    parser.add_argument("--output", default=None, help="Write mapped companies to this JSON Lines file")
+    parser.add_argument("--load", action="store_true", help="Load mapped companies into the database")
+    parser.add_argument("--zone-id", default=None,
+                        help="Zone to load into (default: each company's state zone)")
+
+    args = parser.parse_args()
+
+    if not args.output and not args.load:
+        print("ERROR: Pass --output and/or --load")
+        sys.exit(1)
+
+    zone_id = None
+    if args.zone_id:
+        try:
+            zone_id = UUID(args.zone_id)
+        except ValueError:
+            print(f"ERROR: Invalid zone ID format: {args.zone_id}")
+            sys.exit(1)
+
+    await reprocess(
+        args.archive_dir,
+        run_ids=args.run_ids,
+        workers=args.workers,
+        output=args.output,
+        load=args.load,
+        zone_id=zone_id,
+        include_partial=args.include_partial
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
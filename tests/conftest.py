@@ -132,6 +132,33 @@ async def test_company(db_session, test_zone):
     return company
 
 
+@pytest.fixture
+def company_data():
+    """Factory for complete company column dicts, each with its own Google Business URL"""
+    def _company_data(**overrides):
+        data = {
+            "name": "Towing Company",
+            "phone_primary": "555-0100",
+            "google_business_url": f"https://maps.google.com/{uuid4()}",
+            "address_street": "1 Main St",
+            "address_city": "Salt Lake City",
+            "address_state": "UT",
+            "address_zip": "84101",
+            "source": "test",
+        }
+        data.update(overrides)
+        return data
+    return _company_data
+
+
+@pytest.fixture
+def make_company(test_zone, company_data):
+    """Factory for unsaved companies in the test zone"""
+    def _make_company(**overrides):
+        return Company(**company_data(id=str(uuid4()), zone_id=str(test_zone.id), **overrides))
+    return _make_company
+
+
 @pytest.fixture
 def override_get_db(db_session):
     """Override get_db dependency for testing"""
@@ -0,0 +1,43 @@
+"""Tests for Supabase client initialization"""
+import pytest
+from app.auth import client as auth_client
+from app.auth.service import AuthService
+
+
+@pytest.fixture
+def supabase_settings(monkeypatch):
+    """Configure fake Supabase credentials and reset cached clients"""
+    monkeypatch.setattr(auth_client.settings, "supabase_url", "https://example.supabase.co")
+    monkeypatch.setattr(auth_client.settings, "supabase_key", "anon.key.sig")
+    monkeypatch.setattr(auth_client.settings, "supabase_service_role_key", "service.key.sig")
+    auth_client.reset_supabase_clients()
+    yield
+    auth_client.reset_supabase_clients()
+
+
+def test_clients_are_cached_and_share_pool(supabase_settings):
+    """Test both clients are singletons and share one HTTP pool"""
+    service = auth_client.get_supabase_client()
+    anon = auth_client.get_supabase_anon_client()
+
+    assert auth_client.get_supabase_client() is service
+    assert auth_client.get_supabase_anon_client() is anon
+    assert service.auth._http_client is anon.auth._http_client
+    assert service.auth._http_client is auth_client.get_shared_http_client()
+
+
+def test_clients_keep_their_own_keys(supabase_settings):
+    """Test creating the anon client doesn't overwrite the service-role headers"""
+    service = auth_client.get_supabase_client()
+    anon = auth_client.get_supabase_anon_client()
+
+    assert service.auth._headers["Authorization"] == "Bearer service.key.sig"
+    assert anon.auth._headers["Authorization"] == "Bearer anon.key.sig"
+
+
+def test_auth_service_creates_clients_lazily(supabase_settings):
+    """Test constructing AuthService doesn't build any client"""
+    AuthService()
+
+    assert auth_client._supabase_client is None
+    assert auth_client._supabase_anon_client is None
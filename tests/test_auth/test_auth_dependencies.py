@@ -2,7 +2,22 @@
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
 from fastapi import HTTPException
-from app.auth.dependencies import get_current_user, get_current_active_user, get_current_admin_user
+from app.auth.dependencies import (
+    get_current_user,
+    get_current_active_user,
+    get_current_admin_user,
+    token_cache,
+)
+from app.api.v1.auth import logout
+from tests.test_auth.test_tokens import SECRET, make_token
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Start each test with an empty token cache"""
+    token_cache.clear()
+    yield
+    token_cache.clear()
 
 
 @pytest.mark.asyncio
@@ -76,3 +91,114 @@ async def test_get_current_admin_user_non_admin():
     
     assert exc_info.value.status_code == 403
 
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_verifies_locally(monkeypatch):
+    """Test tokens signed with the JWT secret skip Supabase Auth"""
+    monkeypatch.setattr("app.auth.dependencies.settings.supabase_jwt_secret", SECRET)
+    mock_credentials = MagicMock()
+    mock_credentials.credentials = make_token()
+    
+    with patch('app.auth.dependencies.AuthService') as mock_auth_service_class:
+        result = await get_current_user(mock_credentials)
+        mock_auth_service_class.assert_not_called()
+    
+    assert result["user"]["id"] == "user-1"
+    assert (await get_current_admin_user(result)) == result
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_rejects_forged_token(monkeypatch):
+    """Test a token signed with the wrong secret is rejected without a remote call"""
+    monkeypatch.setattr("app.auth.dependencies.settings.supabase_jwt_secret", SECRET)
+    mock_credentials = MagicMock()
+    mock_credentials.credentials = make_token(secret="wrong")
+    
+    with patch('app.auth.dependencies.AuthService') as mock_auth_service_class:
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(mock_credentials)
+        mock_auth_service_class.assert_not_called()
+    
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_caches_remote_lookup():
+    """Test the remote lookup runs once per token while cached"""
+    mock_credentials = MagicMock()
+    mock_credentials.credentials = "opaque-token"
+    mock_user_data = {"user": {"id": "test-user-id"}}
+    
+    with patch('app.auth.dependencies.AuthService') as mock_auth_service_class:
+        mock_auth_service = MagicMock()
+        mock_auth_service.get_user = AsyncMock(return_value=mock_user_data)
+        mock_auth_service_class.return_value = mock_auth_service
+        
+        for _ in range(3):
+            assert await get_current_user(mock_credentials) == mock_user_data
+        
+        mock_auth_service.get_user.assert_awaited_once_with("opaque-token")
+
+
+@pytest.mark.asyncio
+async def test_get_current_active_user_ignores_self_set_email_verified(monkeypatch):
+    """Test a user_metadata email_verified flag doesn't pass the production check"""
+    monkeypatch.setattr("app.auth.dependencies.settings.supabase_jwt_secret", SECRET)
+    monkeypatch.setattr("app.auth.dependencies.settings.environment", "production")
+    mock_credentials = MagicMock()
+    mock_credentials.credentials = make_token()
+    current_user = await get_current_user(mock_credentials)
+    
+    with patch('app.auth.dependencies.AuthService') as mock_auth_service_class:
+        mock_auth_service = MagicMock()
+        mock_auth_service.get_user = AsyncMock(
+            return_value={"user": {"id": "user-1", "email_confirmed_at": None}}
+        )
+        mock_auth_service_class.return_value = mock_auth_service
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_active_user(current_user, mock_credentials)
+    
+    assert exc_info.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_get_current_active_user_confirms_remotely(monkeypatch):
+    """Test a locally verified token is confirmed with Supabase Auth once, then cached"""
+    monkeypatch.setattr("app.auth.dependencies.settings.supabase_jwt_secret", SECRET)
+    monkeypatch.setattr("app.auth.dependencies.settings.environment", "production")
+    mock_credentials = MagicMock()
+    mock_credentials.credentials = make_token()
+    confirmed = {"user": {"id": "user-1", "email_confirmed_at": "2024-01-01T00:00:00Z"}}
+    
+    with patch('app.auth.dependencies.AuthService') as mock_auth_service_class:
+        mock_auth_service = MagicMock()
+        mock_auth_service.get_user = AsyncMock(return_value=confirmed)
+        mock_auth_service_class.return_value = mock_auth_service
+        
+        current_user = await get_current_user(mock_credentials)
+        assert await get_current_active_user(current_user, mock_credentials) == confirmed
+        assert await get_current_user(mock_credentials) == confirmed
+        
+        mock_auth_service.get_user.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_cached_token(monkeypatch):
+    """Test a token is refused after logout even though it still verifies locally"""
+    monkeypatch.setattr("app.auth.dependencies.settings.supabase_jwt_secret", SECRET)
+    mock_credentials = MagicMock()
+    mock_credentials.credentials = make_token()
+    current_user = await get_current_user(mock_credentials)
+    
+    with patch('app.api.v1.auth.AuthService') as mock_auth_service_class:
+        mock_auth_service = MagicMock()
+        mock_auth_service.logout = AsyncMock()
+        mock_auth_service_class.return_value = mock_auth_service
+        await logout(current_user, mock_credentials)
+        mock_auth_service.logout.assert_awaited_once_with(mock_credentials.credentials)
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(mock_credentials)
+    assert exc_info.value.status_code == 401
@@ -104,3 +104,38 @@ async def test_refresh_token_success():
         
         assert result["session"] == mock_session
 
+
+
+@pytest.mark.asyncio
+async def test_slow_auth_backend_does_not_block_event_loop():
+    """Test blocking Supabase calls no longer serialize unrelated requests"""
+    import asyncio
+    import time
+
+    def slow_get_user(jwt):
+        time.sleep(0.2)  # Stand-in for a slow Supabase Auth round trip
+        return {"user": {"id": jwt}}
+
+    with patch('app.auth.service.get_supabase_client') as mock_client:
+        mock_supabase = MagicMock()
+        mock_supabase.auth.get_user.side_effect = slow_get_user
+        mock_client.return_value = mock_supabase
+        auth_service = AuthService()
+
+        async def unrelated_request():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(auth_service.get_user(f"token-{i}") for i in range(4)),
+            unrelated_request(),
+        )
+        elapsed = time.perf_counter() - started
+
+    assert [r["user"]["id"] for r in results[:4]] == [f"token-{i}" for i in range(4)]
+    # The unrelated request isn't stuck behind the auth calls...
+    assert results[4] < 0.1
+    # ...and the auth calls overlap instead of running back to back
+    assert elapsed < 0.6
@@ -0,0 +1,104 @@
+"""Tests for local token verification and the token cache"""
+import base64
+import hashlib
+import hmac
+import json
+import time
+import pytest
+from app.auth.tokens import (
+    TokenCache,
+    UnsupportedTokenError,
+    verify_access_token,
+    user_from_claims,
+)
+
+SECRET = "test-jwt-secret"
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def make_token(claims=None, secret=SECRET, alg="HS256"):
+    """Sign a Supabase-style access token"""
+    payload = {
+        "sub": "user-1",
+        "aud": "authenticated",
+        "role": "authenticated",
+        "email": "user@example.com",
+        "exp": int(time.time()) + 3600,
+        "user_metadata": {"role": "admin", "email_verified": True},
+        **(claims or {}),
+    }
+    payload = {key: value for key, value in payload.items() if value is not None}
+    header = _b64(json.dumps({"alg": alg, "typ": "JWT"}).encode())
+    body = _b64(json.dumps(payload).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{body}".encode(), hashlib.sha256).digest()
+    return f"{header}.{body}.{_b64(signature)}"
+
+
+def test_verify_access_token_success():
+    """Test a valid token yields its claims"""
+    claims = verify_access_token(make_token(), SECRET)
+
+    assert claims["sub"] == "user-1"
+    user = user_from_claims(claims)["user"]
+    assert user["id"] == "user-1"
+    assert user["user_metadata"]["role"] == "admin"
+    # user_metadata is user-writable, so its email_verified doesn't count
+    assert user["email_verified"] is False
+
+    user = user_from_claims({**claims, "app_metadata": {"email_verified": True}})["user"]
+    assert user["email_verified"] is True
+
+
+@pytest.mark.parametrize(
+    "token, message",
+    [
+        (make_token(secret="other-secret"), "signature"),
+        (make_token({"exp": int(time.time()) - 120}), "expired"),
+        (make_token({"aud": "anon"}), "audience"),
+        (make_token({"exp": None}), "missing required claim: exp"),
+        (make_token({"sub": None}), "missing required claim: sub"),
+        (make_token({"exp": "never"}), "invalid exp"),
+        ("not-a-token", "Malformed"),
+    ],
+)
+def test_verify_access_token_rejects(token, message):
+    """Test forged, expired, wrong-audience, exp-less and malformed tokens are rejected"""
+    with pytest.raises(ValueError, match=message):
+        verify_access_token(token, SECRET)
+
+
+def test_verify_access_token_unsupported_alg():
+    """Test asymmetric tokens are flagged for remote validation"""
+    with pytest.raises(UnsupportedTokenError):
+        verify_access_token(make_token(alg="ES256"), SECRET)
+
+
+def test_token_cache_ttl_and_lru():
+    """Test entries expire and the cache stays bounded"""
+    cache = TokenCache(ttl=60, max_size=2)
+    cache.set("a", {"user": "a"})
+    cache.set("b", {"user": "b"}, token_expires_at=time.time() - 1)
+    assert cache.get("b") is None
+
+    cache.set("c", {"user": "c"})
+    assert cache.get("a") == {"user": "a"}
+    assert cache.get("c") == {"user": "c"}
+
+    cache.set("d", {"user": "d"})
+    assert cache.get("a") is None
+    assert cache.get("d") == {"user": "d"}
+
+
+def test_token_cache_invalidate_revokes_until_expiry():
+    """Test an invalidated token stays revoked until its own expiry"""
+    cache = TokenCache(ttl=60)
+    cache.set("a", {"user": "a"})
+    cache.invalidate("a", token_expires_at=time.time() + 3600)
+    cache.invalidate("b", token_expires_at=time.time() - 1)
+
+    assert cache.get("a") is None
+    assert cache.is_revoked("a")
+    assert not cache.is_revoked("b")
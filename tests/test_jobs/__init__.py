@@ -0,0 +1 @@
+"""Scheduled job tests"""
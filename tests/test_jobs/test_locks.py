@@ -0,0 +1,125 @@
+"""Tests for scheduler leader election and job locks"""
+import asyncio
+import pytest
+from sqlalchemy import select
+from app.jobs.locks import AdvisoryLock, SchedulerLeader, advisory_lock_key, locked_job
+from app.models.job_run import JobRun
+from app.services.job_run_service import JobRunService
+from tests.conftest import test_engine, TestSessionLocal
+
+
+def test_advisory_lock_key_is_stable_bigint():
+    """Test lock keys are deterministic and fit a Postgres bigint"""
+    key = advisory_lock_key("job:daily_zone_crawl")
+
+    assert key == advisory_lock_key("job:daily_zone_crawl")
+    assert key != advisory_lock_key("job:process_outreach_queue")
+    assert -2**63 <= key < 2**63
+
+
+@pytest.mark.asyncio
+async def test_advisory_lock_is_exclusive():
+    """Test a second holder can't take the lock until it's released"""
+    first = AdvisoryLock(test_engine, "test:exclusive")
+    second = AdvisoryLock(test_engine, "test:exclusive")
+
+    assert await first.acquire() is True
+    assert await second.acquire() is False
+    assert await first.check() is True
+
+    await first.release()
+    assert await second.acquire() is True
+    await second.release()
+
+
+@pytest.mark.asyncio
+async def test_only_one_scheduler_is_leader():
+    """Test leadership passes to a standby once the leader stops"""
+    events = []
+    leader = SchedulerLeader(
+        test_engine, lambda: events.append("a+"), lambda: events.append("a-"),
+        lock_name="test:leader", check_interval=0.01
+    )
+    standby = SchedulerLeader(
+        test_engine, lambda: events.append("b+"), lambda: events.append("b-"),
+        lock_name="test:leader", check_interval=0.01
+    )
+
+    assert await leader.step() is True
+    assert await standby.step() is False
+    assert await leader.step() is True
+
+    stop_event = asyncio.Event()
+    stop_event.set()
+    await leader.run(stop_event)
+
+    assert await standby.step() is True
+    assert events == ["a+", "a-", "b+"]
+    await standby.lock.release()
+
+
+@pytest.mark.asyncio
+async def test_locked_job_skips_overlap_and_records_runs(db_session, monkeypatch):
+    """Test an overlapping run is skipped and both runs are recorded"""
+    monkeypatch.setattr("app.jobs.locks.database.engine", test_engine)
+    monkeypatch.setattr("app.jobs.locks.database.AsyncSessionLocal", TestSessionLocal)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    @locked_job("test_job")
+    async def slow_job():
+        started.set()
+        await release.wait()
+
+    first = asyncio.create_task(slow_job())
+    await started.wait()
+    await slow_job()  # overlaps the first run
+    release.set()
+    await first
+
+    result = await db_session.execute(select(JobRun.status).order_by(JobRun.started_at))
+    assert sorted(result.scalars().all()) == ["skipped", "succeeded"]
+
+    stats = await JobRunService.get_job_stats(db_session)
+    assert len(stats) == 1
+    assert stats[0]["job_id"] == "test_job"
+    assert stats[0]["runs"] == 2
+    assert stats[0]["skipped"] == 1
+    assert stats[0]["succeeded"] == 1
+    assert stats[0]["max_duration_seconds"] is not None
+
+
+@pytest.mark.asyncio
+async def test_api_scheduler_runs_under_leader_election(monkeypatch):
+    """Test the in-API scheduler starts paused and fires only once elected"""
+    from app import main
+    events = []
+    monkeypatch.setattr("app.database.engine", test_engine)
+    monkeypatch.setattr("app.config.settings.scheduler_in_api", True)
+    monkeypatch.setattr("app.config.settings.use_supabase_env_vars", False)
+    monkeypatch.setattr("app.config.settings.env_cache_notify", False)
+    monkeypatch.setattr("app.config.settings.scheduler_leader_check_interval", 0.01)
+    monkeypatch.setattr("app.jobs.scheduled_jobs.start_scheduler", lambda paused=False: events.append(("start", paused)))
+    monkeypatch.setattr("app.jobs.scheduled_jobs.resume_scheduler", lambda: events.append("resume"))
+    monkeypatch.setattr("app.jobs.scheduled_jobs.pause_scheduler", lambda: events.append("pause"))
+    monkeypatch.setattr("app.jobs.scheduled_jobs.stop_scheduler", lambda: events.append("stop"))
+
+    # Another worker already leads
+    other = AdvisoryLock(test_engine, "scheduler:leader")
+    assert await other.acquire() is True
+
+    await main.startup_event()
+    try:
+        await asyncio.sleep(0.05)
+        assert events == [("start", True)]
+
+        await other.release()
+        for _ in range(100):
+            if "resume" in events:
+                break
+            await asyncio.sleep(0.01)
+        assert events == [("start", True), "resume"]
+    finally:
+        await main.shutdown_event()
+    assert events == [("start", True), "resume", "pause", "stop"]
+    assert main._scheduler_leader_task is None
@@ -0,0 +1,72 @@
+"""Tests for batch Apify item mapping"""
+from app.services.apify_mapper import BatchMapper, MappingSummary, map_apify_item, map_items
+
+
+def _item(i, **overrides):
+    item = {
+        "title": f"Towing {i}",
+        "address": "456 Oak St, Dallas, TX 75201",
+        "phone": "555-0200",
+        "url": f"https://maps.google.com/{i}",
+        "rating": 4.5,
+        "location": {"lat": 32.7, "lng": -96.8},
+    }
+    item.update(overrides)
+    return item
+
+
+def test_map_items_counts_and_samples_bad_items(capsys):
+    """Test invalid and failing items are counted and sampled, not printed"""
+    items = [_item(0), _item(1, title=""), _item(2, rating="n/a"), _item(3)]
+    
+    batch = map_items(items, offset=100, sample_size=1)
+    
+    assert batch.items == 4
+    assert len(batch) == 2
+    assert batch.invalid == 1
+    assert batch.errors == 1
+    assert batch.error_samples[0]["offset"] == 102
+    assert batch.error_samples[0]["error"].startswith("ValueError")
+    assert capsys.readouterr().out == ""
+
+
+def test_batch_records_match_single_item_mapping():
+    """Test compact batch rows expand to the same records as map_apify_item"""
+    items = [_item(0), _item(1, location=None, website="https://towing.example.com")]
+    
+    records = list(map_items(items).records())
+    
+    assert records == [map_apify_item(item) for item in items]
+    assert "latitude" not in records[1]
+
+
+def test_batch_mapper_process_pool_keeps_order():
+    """Test pooled mapping returns batches in input order and totals add up"""
+    chunks = [(offset, [_item(i) for i in range(offset, offset + 3)]) for offset in range(0, 12, 3)]
+    summary = MappingSummary()
+    
+    batches = list(BatchMapper(workers=2).map_chunks(chunks))
+    for batch in batches:
+        summary.add(batch)
+    
+    assert [batch.offset for batch in batches] == [0, 3, 6, 9]
+    assert [record["name"] for record in batches[1].records()] == ["Towing 3", "Towing 4", "Towing 5"]
+    assert summary.items == 12
+    assert summary.mapped == 12
+
+
+def test_mapped_company_feeds_bulk_upsert_values():
+    """Test slotted records expose company column values and survive pickling"""
+    import pickle
+    from app.services.apify_mapper import MappedCompany, map_apify_record
+    from app.services.company_service import company_import_values
+    
+    record = map_apify_record(_item(7, reviews=[{"text": "fast"}]))
+    
+    assert not hasattr(record, "__dict__")
+    values = company_import_values(record)
+    assert values["name"] == "Towing 7"
+    assert values["address_state"] == "TX"
+    assert "latitude" in values and "reviews" not in values
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert MappedCompany.from_row(record.as_row()).to_dict() == record.to_dict()
@@ -131,3 +131,80 @@ async def test_map_apify_result_invalid_data(apify_service):
     # Should return None for invalid data
     assert result is None
 
+
+def test_map_results_logs_one_summary(caplog, capsys):
+    """Test unmappable results are counted into one log line instead of printed"""
+    items = [
+        {"title": "Good Towing", "url": "https://maps.google.com/good"},
+        {"title": "Bad Rating", "url": "https://maps.google.com/bad-1", "rating": "abc"},
+        {"title": "Bad Reviews", "url": "https://maps.google.com/bad-2", "reviewsCount": "abc"},
+    ]
+    
+    with caplog.at_level("WARNING", logger="app.services.apify_service"):
+        companies = ApifyService._map_results(items)
+    
+    assert [company["name"] for company in companies] == ["Good Towing"]
+    assert len(caplog.records) == 1
+    assert "2 of 3 Apify results failed to map" in caplog.records[0].getMessage()
+    assert capsys.readouterr().out == ""
+
+
+
+@pytest.mark.asyncio
+async def test_iter_run_items_pages_from_offset(apify_service):
+    """Test dataset items are paged from a checkpoint offset up to the item limit"""
+    from unittest.mock import MagicMock
+    
+    def response(data):
+        mock_response = MagicMock()
+        mock_response.json = MagicMock(return_value=data)
+        mock_response.raise_for_status = MagicMock()
+        return mock_response
+    
+    dataset = [{"title": f"Towing {i}", "url": f"https://maps.google.com/{i}"} for i in range(7)]
+    
+    async def fake_get(url, params=None):
+        if url.endswith("/actor-runs/run-1"):
+            return response({"data": {"status": "SUCCEEDED", "defaultDatasetId": "dataset-1"}})
+        start = params["offset"]
+        return response(dataset[start:start + params["limit"]])
+    
+    with patch.object(apify_service.client, 'get', new=AsyncMock(side_effect=fake_get)):
+        chunks = [
+            (offset, len(items))
+            async for offset, items in apify_service.iter_run_items("run-1", offset=2, chunk_size=2, limit=6)
+        ]
+    
+    assert chunks == [(2, 2), (4, 2)]
+
+
+@pytest.mark.asyncio
+async def test_iter_run_items_reads_through_archive(tmp_path):
+    """Test a downloaded run is archived and later served without network access"""
+    from unittest.mock import MagicMock
+    from app.utils.dataset_archive import DatasetArchive
+    
+    def response(data):
+        mock_response = MagicMock()
+        mock_response.json = MagicMock(return_value=data)
+        mock_response.raise_for_status = MagicMock()
+        return mock_response
+    
+    dataset = [{"title": f"Towing {i}", "url": f"https://maps.google.com/{i}"} for i in range(5)]
+    
+    async def fake_get(url, params=None):
+        if url.endswith("/actor-runs/run-1"):
+            return response({"data": {"status": "SUCCEEDED", "defaultDatasetId": "dataset-1"}})
+        start = params["offset"]
+        return response(dataset[start:start + params["limit"]])
+    
+    service = ApifyService(archive=DatasetArchive(str(tmp_path)))
+    with patch.object(service.client, 'get', new=AsyncMock(side_effect=fake_get)):
+        assert await service.archive_run("run-1", chunk_size=2) == 5
+    assert service.archive.get_run("run-1")["complete"] is True
+    
+    offline = ApifyService(archive=DatasetArchive(str(tmp_path)))
+    with patch.object(offline.client, 'get', new=AsyncMock(side_effect=AssertionError("network used"))):
+        companies = await offline.download_run_data("run-1", limit=2, offset=1)
+    
+    assert [company["name"] for company in companies] == ["Towing 1", "Towing 2"]
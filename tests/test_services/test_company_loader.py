@@ -0,0 +1,97 @@
+"""Tests for CompanyLoader"""
+import pytest
+from sqlalchemy import select
+from app.models.company import Company
+from app.models.zone import Zone
+from app.services.company_loader import CompanyLoader
+
+
+@pytest.mark.asyncio
+async def test_load_companies_into_state_zones(db_session, test_zone, test_company, company_data):
+    """Test companies are merged in bulk, zoned by state, and existing rows updated"""
+    first = company_data(
+        google_business_url="https://maps.google.com/a",
+        address_state="CO",
+        hours={"Monday": "Open 24 hours"},
+        category="Towing service",  # not a company column
+    )
+    companies = [
+        first,
+        company_data(google_business_url="https://maps.google.com/b"),
+        {**first, "name": "Towing a LLC"},  # later duplicate wins
+        company_data(google_business_url="https://maps.google.com/c", phone_primary=None),  # incomplete
+        {"google_business_url": test_company.google_business_url, "rating": 4.8,
+         "name": None, "address_state": "UT"},  # partial update of an existing company
+    ]
+
+    result = await CompanyLoader.load_companies(db_session, iter(companies), chunk_size=2)
+
+    # test_zone is a city zone, so state zones are created for CO and UT
+    assert result == {
+        "staged": 5, "created": 2, "updated": 1, "unchanged": 0, "skipped": 2, "zones_created": 2,
+    }
+
+    zones = await db_session.execute(select(Zone.state, Zone.id).where(Zone.zone_type == "state"))
+    state_zones = dict(zones.all())
+    rows = await db_session.execute(
+        select(Company.google_business_url, Company.name, Company.zone_id,
+               Company.scraping_stage, Company.hours, Company.rating)
+        .order_by(Company.google_business_url)
+    )
+    by_url = {row.google_business_url: row for row in rows.all()}
+    assert by_url["https://maps.google.com/a"].name == "Towing a LLC"
+    assert by_url["https://maps.google.com/a"].zone_id == state_zones["CO"]
+    assert by_url["https://maps.google.com/a"].scraping_stage == "google_maps"
+    assert by_url["https://maps.google.com/a"].hours == {"Monday": "Open 24 hours"}
+    assert by_url["https://maps.google.com/b"].zone_id == state_zones["UT"]
+    assert "https://maps.google.com/c" not in by_url
+    existing = by_url[test_company.google_business_url]
+    assert (existing.name, existing.rating) == ("Test Towing Company", 4.8)
+    assert existing.zone_id == state_zones["UT"]
+
+
+@pytest.mark.asyncio
+async def test_load_companies_updates_existing_keeping_stored_values(db_session, test_zone, test_company, company_data):
+    """Test a fixed-zone load updates existing companies without nulling stored fields"""
+    update = {
+        "google_business_url": test_company.google_business_url,
+        "name": "Renamed Towing",
+        "phone_primary": None,
+    }
+
+    result = await CompanyLoader.load_companies(
+        db_session, [update, company_data()], zone_id=test_zone.id
+    )
+
+    assert result["created"] == 1
+    assert result["updated"] == 1
+    await db_session.refresh(test_company)
+    company = test_company
+    assert company.name == "Renamed Towing"
+    assert company.phone_primary == "555-0100"
+    assert company.zone_id == test_zone.id
+    assert company.scraping_stage == "google_maps"
+
+
+@pytest.mark.asyncio
+async def test_load_companies_leaves_unchanged_rows_alone(db_session, test_zone, test_company, company_data):
+    """Test reloading the same companies writes nothing and keeps updated_at"""
+    companies = [
+        company_data(google_business_url="https://maps.google.com/a", hours={"Monday": "Open 24 hours"}),
+        company_data(google_business_url="https://maps.google.com/b"),
+    ]
+    await CompanyLoader.load_companies(db_session, companies, zone_id=test_zone.id)
+    rows = await db_session.execute(select(Company.google_business_url, Company.updated_at))
+    loaded_at = dict(rows.all())
+
+    result = await CompanyLoader.load_companies(
+        db_session, [companies[0], {**companies[1], "rating": 3.9}], zone_id=test_zone.id
+    )
+
+    assert result == {
+        "staged": 2, "created": 0, "updated": 1, "unchanged": 1, "skipped": 0, "zones_created": 0,
+    }
+    rows = await db_session.execute(select(Company.google_business_url, Company.updated_at))
+    reloaded_at = dict(rows.all())
+    assert reloaded_at["https://maps.google.com/a"] == loaded_at["https://maps.google.com/a"]
+    assert reloaded_at["https://maps.google.com/b"] > loaded_at["https://maps.google.com/b"]
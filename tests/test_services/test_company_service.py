@@ -55,6 +55,79 @@ async def test_create_or_update_company_existing(db_session, test_zone, test_com
     assert company.phone_primary == "555-0300"
 
 
+@pytest.mark.asyncio
+async def test_upsert_company_reports_changed_fields(db_session, test_zone):
+    """Test that re-upserting the same data writes nothing and changes are reported"""
+    company_data = {
+        "name": "Stable Towing",
+        "phone_primary": "(801) 555-0100",
+        "google_business_url": "https://maps.google.com/stable",
+        "address_street": "1 Main St",
+        "address_city": "Provo",
+        "address_state": "UT",
+        "address_zip": "84601",
+        "hours": {"Monday": "Open 24 hours", "Tuesday": "Open 24 hours"},
+        "rating": 4.5,
+        "source": "test"
+    }
+
+    company, changed = await CompanyService.upsert_company(db_session, dict(company_data), test_zone.id)
+    assert changed is None
+    updated_at = company.updated_at
+
+    # Same values, JSON keys in another order and a null rating
+    recrawl = {
+        **company_data,
+        "hours": {"Tuesday": "Open 24 hours", "Monday": "Open 24 hours"},
+        "rating": None,
+    }
+    company, changed = await CompanyService.upsert_company(db_session, recrawl, test_zone.id)
+    assert changed == []
+    assert company.updated_at == updated_at
+
+    recrawl = {**company_data, "hours": {"Monday": "8 AM-5 PM"}, "rating": 4.6}
+    company, changed = await CompanyService.upsert_company(db_session, recrawl, test_zone.id)
+    assert sorted(changed) == ["hours", "rating"]
+    assert company.hours == {"Monday": "8 AM-5 PM"}
+    assert company.rating == 4.6
+
+
+@pytest.mark.asyncio
+async def test_upsert_company_fills_defaults(db_session, test_zone, test_company):
+    """Test defaults are written with the upsert only where the company has no value"""
+    defaults = {"scraping_stage": "google_maps"}
+    company_data = {
+        "name": test_company.name,
+        "google_business_url": test_company.google_business_url,
+    }
+
+    company, changed = await CompanyService.upsert_company(
+        db_session, company_data, test_zone.id, defaults=defaults
+    )
+    assert changed == ["scraping_stage"]
+    assert company.scraping_stage == "google_maps"
+
+    company.scraping_stage = "website"
+    await db_session.commit()
+    company, changed = await CompanyService.upsert_company(
+        db_session, company_data, test_zone.id, defaults=defaults
+    )
+    assert changed == []
+    assert company.scraping_stage == "website"
+
+    company, changed = await CompanyService.upsert_company(db_session, {
+        "name": "Defaulted Towing",
+        "phone_primary": "555-0600",
+        "google_business_url": "https://maps.google.com/defaulted",
+        "address_street": "2 Main St",
+        "address_city": "Provo",
+        "address_state": "UT",
+        "address_zip": "84601",
+    }, test_zone.id, defaults=defaults)
+    assert changed is None
+    assert company.scraping_stage == "google_maps"
+
+
 @pytest.mark.asyncio
 async def test_get_company_success(db_session, test_company):
     """Test getting company by ID"""
@@ -162,3 +235,114 @@ async def test_bulk_import_companies(db_session, test_zone):
     assert len(companies) == 2
     assert all(c.zone_id == test_zone.id for c in companies)
 
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_companies(db_session, test_zone, test_company):
+    """Test one batch creates new companies, updates existing ones and skips incomplete rows"""
+    from sqlalchemy import select
+    from app.models.company import Company
+
+    new_company = {
+        "name": "Bulk Towing",
+        "phone_primary": "555-0400",
+        "google_business_url": "https://maps.google.com/bulk",
+        "address_street": "1 Bulk St",
+        "address_city": "Provo",
+        "address_state": "UT",
+        "address_zip": "84601",
+        "category": "Towing service",  # not a company column
+    }
+    batch = [
+        new_company,
+        {"google_business_url": test_company.google_business_url, "rating": 4.5, "name": None},
+        {"name": "No Address", "phone_primary": "555-0500",
+         "google_business_url": "https://maps.google.com/incomplete"},
+        {**new_company, "name": "Bulk Towing LLC"},  # duplicate URL, later row wins
+    ]
+
+    result = await CompanyService.bulk_upsert_companies(
+        db_session, batch, test_zone.id, defaults={"scraping_stage": "google_maps"}
+    )
+    await db_session.commit()
+
+    assert result == {"created": 1, "updated": 1, "unchanged": 0, "skipped": 1}
+    rows = await db_session.execute(
+        select(Company.name, Company.rating, Company.scraping_stage)
+        .order_by(Company.name)
+    )
+    assert rows.all() == [
+        ("Bulk Towing LLC", None, "google_maps"),
+        ("Test Towing Company", 4.5, "google_maps"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_companies_skips_unchanged(db_session, test_zone, test_company):
+    """Test re-importing a batch only writes companies whose values changed"""
+    from sqlalchemy import select
+    from app.models.company import Company
+
+    batch = [
+        {"google_business_url": test_company.google_business_url, "rating": 4.5,
+         "hours": {"Monday": "Open 24 hours"}},
+        {"name": "Bulk Towing", "phone_primary": "555-0400",
+         "google_business_url": "https://maps.google.com/bulk", "address_street": "1 Bulk St",
+         "address_city": "Provo", "address_state": "UT", "address_zip": "84601"},
+    ]
+    await CompanyService.bulk_upsert_companies(db_session, batch, test_zone.id)
+    await db_session.commit()
+    rows = await db_session.execute(select(Company.google_business_url, Company.updated_at))
+    imported_at = dict(rows.all())
+
+    result = await CompanyService.bulk_upsert_companies(
+        db_session, [batch[0], {**batch[1], "rating": 3.9}], test_zone.id
+    )
+    await db_session.commit()
+
+    assert result == {"created": 0, "updated": 1, "unchanged": 1, "skipped": 0}
+    rows = await db_session.execute(select(Company.google_business_url, Company.updated_at))
+    reimported_at = dict(rows.all())
+    unchanged_url = test_company.google_business_url
+    assert reimported_at[unchanged_url] == imported_at[unchanged_url]
+    assert reimported_at["https://maps.google.com/bulk"] > imported_at["https://maps.google.com/bulk"]
+
+
+@pytest.mark.asyncio
+async def test_find_companies_by_phone_across_zones(db_session, test_zone, test_company):
+    """Test phone lookups match E.164 keys set on write and by the backfill"""
+    from sqlalchemy import update
+    from app.models.company import Company
+    from app.models.zone import Zone
+
+    other_zone = Zone(id=str(uuid4()), name="Ogden", state="UT", zone_type="city", is_active=True)
+    db_session.add(other_zone)
+    await db_session.commit()
+
+    duplicate = await CompanyService.create_or_update_company(db_session, {
+        "name": "Test Towing (duplicate listing)",
+        "phone_primary": "+1 801-555-0100",
+        "phone_dispatch": "801.555.0199",
+        "google_business_url": "https://maps.google.com/duplicate",
+        "address_street": "9 Side St",
+        "address_city": "Ogden",
+        "address_state": "UT",
+        "address_zip": "84401",
+    }, other_zone.id)
+    assert duplicate.phone_primary_e164 == "+18015550100"
+    assert duplicate.phone_dispatch_e164 == "+18015550199"
+
+    # Written without the service, so the E.164 key comes from the backfill
+    await db_session.execute(
+        update(Company).where(Company.id == test_company.id).values(phone_primary="(801) 555-0100")
+    )
+    assert await CompanyService.backfill_derived_columns(db_session) == 1
+    assert await CompanyService.backfill_derived_columns(db_session) == 0
+
+    matches = await CompanyService.find_companies_by_phone(db_session, "801 555 0100")
+    assert {company.id for company in matches} == {test_company.id, duplicate.id}
+    matches = await CompanyService.find_companies_by_phone(db_session, "18015550199")
+    assert [company.id for company in matches] == [duplicate.id]
+
+    with pytest.raises(ValueError):
+        await CompanyService.find_companies_by_phone(db_session, "555-0100")
@@ -0,0 +1,64 @@
+"""Tests for ContactEnrichmentLoader"""
+import pytest
+from sqlalchemy import update
+from app.models.company import Company
+from app.services.company_service import CompanyService
+from app.services.contact_enrichment_loader import ContactEnrichmentLoader, new_enrichment_stats
+
+
+@pytest.mark.asyncio
+async def test_enrich_chunk_matches_by_website_domain(db_session, test_zone, test_company):
+    """Test scraper items are joined on website_domain and fill only empty fields"""
+    await db_session.execute(
+        update(Company).where(Company.id == test_company.id).values(
+            website="https://www.testtowing.com/", phone_primary="(801) 555-0100",
+            services={"towing": True}
+        )
+    )
+    other = await CompanyService.create_or_update_company(db_session, {
+        "name": "Other Towing",
+        "phone_primary": "555-0200",
+        "email": "office@othertowing.com",
+        "website": "othertowing.com",
+        "google_business_url": "https://maps.google.com/other",
+        "address_street": "1 Main St",
+        "address_city": "Salt Lake City",
+        "address_state": "UT",
+        "address_zip": "84101",
+    }, test_zone.id)
+    assert other.website_domain == "othertowing.com"
+    # test_company was written directly, so its domain and phone are backfilled
+    assert await CompanyService.backfill_derived_columns(db_session, batch_size=1) == 1
+
+    items = [
+        {"url": "https://testtowing.com/contact", "emails": ["dispatch@testtowing.com"],
+         "phones": ["555-0100", "(801) 555-0100", "801-555-0199"], "facebooks": ["https://facebook.com/testtowing"],
+         "instagrams": ["https://instagram.com/testtowing"]},
+        {"url": "http://www.othertowing.com", "emails": ["new@othertowing.com"]},
+        {"url": "https://unknown.example.com", "emails": ["x@unknown.example.com"]},
+    ]
+    stats = new_enrichment_stats()
+
+    preview = await ContactEnrichmentLoader.enrich_chunk(db_session, items, stats, dry_run=True)
+    assert [change["name"] for change in preview] == ["Test Towing Company"]
+    await db_session.refresh(test_company)
+    assert test_company.email is None
+
+    stats = new_enrichment_stats()
+    changes = await ContactEnrichmentLoader.enrich_chunk(db_session, items, stats)
+    await db_session.commit()
+
+    assert stats["records"] == 3
+    assert stats["matched"] == 2
+    assert stats["updated"] == 1
+    assert changes[0]["updates"]["phone_dispatch"] == "801-555-0199"
+
+    await db_session.refresh(test_company)
+    await db_session.refresh(other)
+    assert test_company.email == "dispatch@testtowing.com"
+    assert test_company.phone_dispatch == "801-555-0199"
+    assert test_company.phone_dispatch_e164 == "+18015550199"
+    assert test_company.facebook_page == "https://facebook.com/testtowing"
+    assert test_company.services == {"towing": True, "instagram": "https://instagram.com/testtowing"}
+    assert other.email == "office@othertowing.com"
+    assert other.services is None
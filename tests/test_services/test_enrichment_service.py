@@ -0,0 +1,75 @@
+"""Tests for EnrichmentService batch enrichment"""
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import select, func
+from app.models.company import Company
+from app.models.enrichment import EnrichmentSnapshot
+from app.services.enrichment_service import EnrichmentService
+from app.services.job_tracker import job_tracker
+
+
+@pytest.fixture
+def enrichment_service():
+    """Create EnrichmentService with Playwright patched out"""
+    with patch("app.services.enrichment_service.WebsiteScraperService"):
+        yield EnrichmentService()
+
+
+@pytest.mark.asyncio
+async def test_load_enrichment_targets_by_ids(db_session, test_zone, make_company, enrichment_service):
+    """Test loading an arbitrary ID list in one query"""
+    companies = [
+        make_company(website=f"https://tow{i}.com") for i in range(3)
+    ]
+    db_session.add_all(companies)
+    await db_session.commit()
+
+    targets = await enrichment_service.load_enrichment_targets(
+        db_session,
+        company_ids=[companies[0].id, companies[2].id]
+    )
+
+    assert {c.id for c in targets} == {companies[0].id, companies[2].id}
+
+
+@pytest.mark.asyncio
+async def test_enrich_companies_bulk_writes(db_session, test_zone, make_company, enrichment_service):
+    """Test batch enrichment writes updates and snapshots and reports progress"""
+    good = make_company(website="https://good.com", review_count=150)
+    bad = make_company(website="https://bad.com")
+    db_session.add_all([good, bad])
+    await db_session.commit()
+
+    async def fake_scrape(url):
+        if "good" in url:
+            return {
+                "hours": {"24_7": True},
+                "has_impound": True,
+                "impound_confidence": 0.8,
+                "status": "success",
+            }
+        return {"hours": None, "has_impound": None, "impound_confidence": 0.0, "status": "failed"}
+
+    enrichment_service.website_scraper.scrape_website = AsyncMock(side_effect=fake_scrape)
+    job_id = job_tracker.create("enrichment", total=2)
+
+    stats = await enrichment_service.enrich_companies(db_session, [good, bad], job_id=job_id)
+
+    assert stats == {"companies_processed": 2, "websites_scraped": 1, "websites_failed": 1}
+
+    result = await db_session.execute(
+        select(Company.id, Company.has_impound_service, Company.fleet_size,
+               Company.scraping_stage, Company.website_scrape_status)
+    )
+    rows = {row.id: row for row in result.all()}
+    assert rows[good.id].has_impound_service is True
+    assert rows[good.id].fleet_size == "medium"
+    assert rows[good.id].scraping_stage == "website_scraped"
+    assert rows[bad.id].website_scrape_status == "failed"
+
+    snapshot_count = await db_session.execute(select(func.count(EnrichmentSnapshot.id)))
+    assert snapshot_count.scalar_one() == 2
+
+    job = job_tracker.get(job_id)
+    assert job["processed"] == 2
+    assert job["failed"] == 1
@@ -0,0 +1,162 @@
+"""Tests for EntityResolutionService"""
+import pytest
+from uuid import uuid4
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert
+from app.models.company import Company
+from app.models.outreach import OutreachAssignment, OutreachSequence
+from app.services.enrichment_service import EnrichmentService
+from app.services.entity_resolution_service import EntityResolutionService
+
+
+def _listing(zone_id, name, **values):
+    return {
+        "id": str(uuid4()),
+        "name": name,
+        "zone_id": str(zone_id),
+        "phone_primary": "555-0100",
+        "google_business_url": f"https://maps.google.com/{uuid4()}",
+        "address_street": "1 Main St",
+        "address_city": "Salt Lake City",
+        "address_state": "UT",
+        "address_zip": "84101",
+        "source": "test",
+        "website": "https://example.com",
+        **values,
+    }
+
+
+@pytest.mark.asyncio
+async def test_resolve_duplicates_clusters_listings(db_session, test_zone):
+    """Test listings sharing a phone, domain or location and name are clustered"""
+    now = datetime.utcnow()
+    rows = [
+        # One operator: main listing, a second yard with its own number, a call-tracking listing
+        _listing(test_zone.id, "Wasatch Towing", phone_primary_e164="+18015550100",
+                 website_domain="wasatchtow.com", latitude=40.76, longitude=-111.89,
+                 review_count=120, created_at=now),
+        _listing(test_zone.id, "Wasatch Towing & Recovery", phone_primary_e164="+18015550177",
+                 website_domain="wasatchtow.com", latitude=40.23, longitude=-111.66,
+                 review_count=8, created_at=now - timedelta(days=30)),
+        _listing(test_zone.id, "Wasatch Tow", phone_primary_e164="+18015550100",
+                 latitude=40.7605, longitude=-111.8905, created_at=now),
+        # Same building and name, no phone or website in common
+        _listing(test_zone.id, "Beehive Wrecker Service", phone_primary_e164="+18015550200",
+                 latitude=40.70, longitude=-111.90),
+        _listing(test_zone.id, "Beehive Towing", phone_primary_e164="+18015550201",
+                 latitude=40.7001, longitude=-111.9001),
+        # Shares only an answering service number: different business
+        _listing(test_zone.id, "Summit Auto Haul", phone_primary_e164="+18015550100"),
+        # Facebook pages aren't the same website
+        _listing(test_zone.id, "Canyon Towing", website_domain="facebook.com"),
+        _listing(test_zone.id, "Valley Towing", website_domain="facebook.com"),
+    ]
+    await db_session.execute(insert(Company), rows)
+    await db_session.commit()
+    ids = [row["id"] for row in rows]
+
+    result = await EntityResolutionService.resolve_duplicates(db_session)
+
+    assert result["companies"] == 8
+    assert result["clusters"] == 2
+    assert result["duplicates"] == 3
+    assert result["updated"] == 3
+
+    companies = await db_session.execute(
+        select(Company.id, Company.canonical_company_id, Company.duplicate_score)
+    )
+    canonical = {str(row.id): row.canonical_company_id for row in companies.all()}
+    assert canonical[ids[0]] is None
+    assert canonical[ids[1]] == ids[0]
+    assert canonical[ids[2]] == ids[0]
+    assert canonical[ids[4]] == ids[3] or canonical[ids[3]] == ids[4]
+    assert all(canonical[company_id] is None for company_id in ids[5:])
+
+    # Nothing changes on a rerun
+    result = await EntityResolutionService.resolve_duplicates(db_session)
+    assert result["updated"] == 0
+
+    # Enrichment only loads canonical companies
+    targets = await EnrichmentService().load_enrichment_targets(db_session, zone_id=test_zone.id)
+    assert {str(company.id) for company in targets}.isdisjoint({ids[1], ids[2]})
+    assert ids[0] in {str(company.id) for company in targets}
+
+
+@pytest.mark.asyncio
+async def test_resolve_duplicates_moves_open_assignments(db_session, test_zone):
+    """Test open assignments of new duplicates move to the canonical company or are skipped"""
+    rows = [
+        _listing(test_zone.id, "Wasatch Towing", phone_primary_e164="+18015550100", review_count=120),
+        _listing(test_zone.id, "Wasatch Tow", phone_primary_e164="+18015550100"),
+        _listing(test_zone.id, "Wasatch Towing SLC", phone_primary_e164="+18015550100"),
+    ]
+    await db_session.execute(insert(Company), rows)
+    intro, follow_up = (
+        OutreachSequence(id=str(uuid4()), name=name, is_active=True, steps=[])
+        for name in ("Intro", "Follow-up")
+    )
+    db_session.add_all([intro, follow_up])
+    now = datetime.utcnow()
+    assignments = [
+        # Canonical company's own assignment stays
+        (rows[0], intro, "active"),
+        # Same sequence as the canonical company's open assignment
+        (rows[1], intro, "active"),
+        # Moved; the older of two duplicates wins the sequence
+        (rows[1], follow_up, "paused"),
+        (rows[2], follow_up, "pending"),
+        # Finished assignments aren't touched
+        (rows[2], intro, "completed"),
+    ]
+    ids = []
+    for age, (company, sequence, status) in enumerate(assignments):
+        assignment = OutreachAssignment(
+            id=str(uuid4()), company_id=company["id"], sequence_id=sequence.id,
+            status=status, created_at=now - timedelta(minutes=len(assignments) - age)
+        )
+        db_session.add(assignment)
+        ids.append(assignment.id)
+    await db_session.commit()
+
+    result = await EntityResolutionService.resolve_duplicates(db_session)
+
+    assert result["duplicates"] == 2
+    assert result["assignments_moved"] == 1
+    assert result["assignments_skipped"] == 2
+
+    stored = await db_session.execute(
+        select(OutreachAssignment.id, OutreachAssignment.company_id, OutreachAssignment.status)
+    )
+    stored = {str(row.id): (str(row.company_id), row.status) for row in stored.all()}
+    assert [stored[assignment_id] for assignment_id in ids] == [
+        (rows[0]["id"], "active"),
+        (rows[1]["id"], "skipped"),
+        (rows[0]["id"], "paused"),
+        (rows[2]["id"], "skipped"),
+        (rows[2]["id"], "completed"),
+    ]
+
+    # Nothing is left to move on a rerun
+    result = await EntityResolutionService.resolve_duplicates(db_session)
+    assert (result["assignments_moved"], result["assignments_skipped"]) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_resolution_job_logs_failures(monkeypatch, caplog):
+    """Test a failed background resolution is logged with its traceback and marks the job failed"""
+    from app.services.job_tracker import job_tracker
+    from tests.conftest import TestSessionLocal
+
+    async def failing_resolve(db):
+        raise RuntimeError("lost connection")
+
+    monkeypatch.setattr("app.database.AsyncSessionLocal", TestSessionLocal)
+    monkeypatch.setattr(EntityResolutionService, "resolve_duplicates", staticmethod(failing_resolve))
+    job_id = job_tracker.create("duplicate_resolution", total=1)
+
+    with caplog.at_level("ERROR", logger="app.services.entity_resolution_service"):
+        await EntityResolutionService.run_resolution_job(job_id)
+
+    job = job_tracker.get(job_id)
+    assert (job["status"], job["error"], job["failed"]) == ("failed", "lost connection", 1)
+    assert caplog.records[0].exc_info[1].args == ("lost connection",)
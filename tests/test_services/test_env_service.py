@@ -0,0 +1,187 @@
+"""Tests for EnvService caching"""
+import asyncio
+import pytest
+from types import SimpleNamespace
+from sqlalchemy import update, event
+from app.models.environment_config import EnvironmentConfig
+from app.services.env_service import EnvService, EnvChangeListener, env_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_env_cache():
+    """Start each test with an empty env cache"""
+    env_cache.invalidate()
+    yield
+    env_cache.invalidate()
+
+
+async def _query_count(db_session, coro):
+    """Run a coroutine and count SQL statements it executes"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        result = await coro
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+    return result, len(statements)
+
+
+@pytest.mark.asyncio
+async def test_get_env_var_served_from_cache(db_session):
+    """Test repeat reads for an environment don't hit the database"""
+    await EnvService.set_env_var(db_session, "API_KEY", "one", environment="staging")
+    await EnvService.set_env_var(db_session, "REGION", "us", environment="staging")
+
+    value, queries = await _query_count(
+        db_session, EnvService.get_env_var(db_session, "API_KEY", "staging")
+    )
+    assert value == "one"
+    assert queries == 1
+
+    value, queries = await _query_count(
+        db_session, EnvService.get_env_var(db_session, "REGION", "staging")
+    )
+    assert value == "us"
+    assert queries == 0
+    assert await EnvService.get_env_var(db_session, "MISSING", "staging") is None
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cache(db_session):
+    """Test set_env_var and delete_env_var invalidate the cached environment"""
+    await EnvService.set_env_var(db_session, "API_KEY", "one", environment="staging")
+    assert await EnvService.get_env_var(db_session, "API_KEY", "staging") == "one"
+
+    await EnvService.set_env_var(db_session, "API_KEY", "two", environment="staging")
+    assert await EnvService.get_env_var(db_session, "API_KEY", "staging") == "two"
+
+    await EnvService.delete_env_var(db_session, "API_KEY", "staging")
+    assert await EnvService.get_env_var(db_session, "API_KEY", "staging") is None
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_after_ttl(db_session, monkeypatch):
+    """Test out-of-band changes show up once the TTL passes"""
+    clock = [1000.0]
+    monkeypatch.setattr("app.services.env_service.time.monotonic", lambda: clock[0])
+    monkeypatch.setattr("app.services.env_service.settings.env_cache_ttl", 300)
+
+    await EnvService.set_env_var(db_session, "API_KEY", "one", environment="staging")
+    assert await EnvService.get_env_var(db_session, "API_KEY", "staging") == "one"
+
+    # Changed by another process, bypassing this cache
+    await db_session.execute(
+        update(EnvironmentConfig)
+        .where(EnvironmentConfig.key == "API_KEY")
+        .values(value="external")
+        .execution_options(synchronize_session=False)
+    )
+    await db_session.commit()
+
+    assert await EnvService.get_env_var(db_session, "API_KEY", "staging") == "one"
+    clock[0] += 301
+    assert await EnvService.get_env_var(db_session, "API_KEY", "staging") == "external"
+
+
+class FakeListenConnection:
+    """Stands in for an asyncpg connection holding LISTEN"""
+
+    def __init__(self):
+        self.listeners = []
+        self.terminate = None
+        self.invalidated = False
+
+    def add_termination_listener(self, callback):
+        self.terminate = lambda: callback(self)
+
+    async def add_listener(self, channel, callback):
+        self.listeners.append(callback)
+
+    async def remove_listener(self, channel, callback):
+        self.listeners.remove(callback)
+
+    async def execute(self, query):
+        return "SELECT 1"
+
+
+class FakeListenEngine:
+    """Engine whose connect() fails ``failures`` times, then hands out fake connections"""
+
+    dialect = SimpleNamespace(name="postgresql", driver="asyncpg")
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.connections = []
+
+    def connect(self):
+        engine = self
+
+        class Connection:
+            async def __aenter__(self):
+                if engine.failures:
+                    engine.failures -= 1
+                    raise OSError("connection refused")
+                self.driver_connection = FakeListenConnection()
+                engine.connections.append(self.driver_connection)
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def get_raw_connection(self):
+                return SimpleNamespace(driver_connection=self.driver_connection)
+
+            async def invalidate(self):
+                self.driver_connection.invalidated = True
+
+        return Connection()
+
+
+async def _until(condition):
+    while not condition():
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_change_listener_reconnects_after_drop(monkeypatch):
+    """Test a dropped LISTEN connection is replaced and caches are invalidated"""
+    monkeypatch.setattr("app.services.env_service.ENV_LISTEN_RETRY_SECONDS", 0.01)
+    monkeypatch.setattr("app.services.env_service.settings.db_pgbouncer_mode", False)
+    engine = FakeListenEngine(failures=2)
+    listener = EnvChangeListener()
+
+    assert await listener.start(engine)
+    try:
+        await asyncio.wait_for(listener.connected.wait(), timeout=1)
+        first = engine.connections[0]
+        assert len(first.listeners) == 1
+
+        env_cache.set("staging", {"API_KEY": "one"})
+        first.terminate()
+        await asyncio.wait_for(_until(lambda: len(engine.connections) == 2), timeout=1)
+        await asyncio.wait_for(listener.connected.wait(), timeout=1)
+        assert first.invalidated
+        assert env_cache.get("staging") is None
+
+        second = engine.connections[1]
+        env_cache.set("staging", {"API_KEY": "two"})
+        second.listeners[0](second, 1, "environment_config_changed", "staging")
+        assert env_cache.get("staging") is None
+    finally:
+        await asyncio.wait_for(listener.stop(), timeout=1)
+    assert second.listeners == []
+
+
+@pytest.mark.asyncio
+async def test_change_listener_not_started_behind_pgbouncer(monkeypatch):
+    """Test LISTEN isn't attempted through a transaction pooler"""
+    monkeypatch.setattr("app.services.env_service.settings.db_pgbouncer_mode", True)
+    engine = FakeListenEngine()
+
+    assert not await EnvChangeListener().start(engine)
+    assert engine.connections == []
@@ -0,0 +1,69 @@
+"""Tests for LeadScoringService"""
+import pytest
+import numpy as np
+from sqlalchemy import select
+from app.models.company import Company
+from app.services.lead_scoring_service import LeadScoringService
+
+
+def test_compute_scores_ranks_complete_leads_higher():
+    """Test that a fully-featured lead outscores an empty one"""
+    columns = {
+        "rating": np.array([4.9, np.nan]),
+        "review_count": np.array([800.0, 0.0]),
+        "impound": np.array([0.95, 0.0]),
+        "is_24_7": np.array([True, False]),
+        "website": np.array([True, False]),
+        "email": np.array([True, False]),
+    }
+
+    scores = LeadScoringService.compute_scores(columns)
+
+    assert scores[0] > 90
+    assert scores[1] == 0.0
+
+
+def test_classify_fleet_sizes_matches_heuristic():
+    """Test vectorized fleet size thresholds"""
+    sizes = LeadScoringService.classify_fleet_sizes(np.array([0.0, 50.0, 250.0, 900.0]))
+
+    assert list(sizes) == [None, "small", "medium", "large"]
+
+
+@pytest.mark.asyncio
+async def test_rescore_companies_writes_scores(db_session, test_zone, test_company, make_company):
+    """Test rescoring writes lead_score and fleet_size in bulk"""
+    strong = make_company(
+        rating=4.8,
+        review_count=600,
+        has_impound_service=True,
+        impound_confidence=0.95,
+        is_24_7=True,
+        website="https://strongtowing.com",
+        email="dispatch@strongtowing.com",
+    )
+    db_session.add(strong)
+    await db_session.commit()
+    original_updated_at = strong.updated_at
+
+    result = await LeadScoringService.rescore_companies(db_session, zone_id=test_zone.id)
+
+    assert result["companies_scored"] == 2
+
+    rows = await db_session.execute(
+        select(Company.id, Company.lead_score, Company.fleet_size, Company.updated_at)
+    )
+    by_id = {row.id: row for row in rows.all()}
+    assert by_id[strong.id].lead_score > by_id[test_company.id].lead_score
+    assert by_id[strong.id].fleet_size == "large"
+    assert by_id[test_company.id].fleet_size is None
+    assert by_id[strong.id].updated_at == original_updated_at
+
+
+@pytest.mark.asyncio
+async def test_rescore_companies_empty_zone(db_session, test_zone):
+    """Test rescoring a zone with no companies"""
+    result = await LeadScoringService.rescore_companies(db_session, zone_id=test_zone.id)
+
+    assert result["companies_scored"] == 0
+    assert result["mean_score"] is None
@@ -0,0 +1,476 @@
+"""Tests for OutreachService queue processing"""
+import asyncio
+import json
+import pytest
+from uuid import uuid4
+from datetime import datetime, timedelta
+from sqlalchemy import select, func, insert, update
+from app.models.company import Company
+from app.models.outreach import OutreachSequence, OutreachAssignment, OutreachHistory
+from app.services.eqho_service import EqhoService
+from app.services.outreach_service import OutreachService, OUTREACH_SEND_CONCURRENCY
+
+
+@pytest.fixture
+def outreach_service(monkeypatch):
+    """Create OutreachService using the stub sender (no webhook, no Eqho)"""
+    monkeypatch.setattr("app.services.outreach_service.settings.outreach_webhook_url", None)
+    monkeypatch.setattr("app.services.outreach_service.settings.eqho_api_token", "")
+    return OutreachService()
+
+
+class WebhookStandIn:
+    """Minimal keep-alive HTTP/1.1 webhook that counts what it receives"""
+
+    def __init__(self, fail_company_ids=()):
+        self.fail_company_ids = set(fail_company_ids)
+        self.connections = 0
+        self.requests = 0
+        self.messages = 0
+
+    def reply(self, body):
+        if "messages" not in body:
+            self.messages += 1
+            return {"id": f"msg-{self.messages}", "status": "sent"}
+
+        results = []
+        for message in body["messages"]:
+            self.messages += 1
+            if message["company_id"] in self.fail_company_ids:
+                results.append({"ref": message["ref"], "status": "failed", "error": "bounced"})
+            else:
+                results.append({"ref": message["ref"], "id": f"msg-{self.messages}", "status": "sent"})
+        # Results come back out of order; the service matches them by ref
+        return {"results": results[::-1]}
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                body = json.loads(await reader.readexactly(length))
+                self.requests += 1
+                data = json.dumps(self.reply(body)).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n" % len(data) + data
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+async def webhook_server():
+    """Run a local stand-in webhook"""
+    stand_in = WebhookStandIn()
+    server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    stand_in.url = f"http://127.0.0.1:{port}/webhook"
+    yield stand_in
+    await OutreachService.close_http_client()
+    server.close()
+    await server.wait_closed()
+
+
+def _webhook_service(monkeypatch, url, batch_size=0):
+    monkeypatch.setattr("app.services.outreach_service.settings.outreach_webhook_url", url)
+    monkeypatch.setattr(
+        "app.services.outreach_service.settings.outreach_webhook_batch_size", batch_size
+    )
+    monkeypatch.setattr("app.services.outreach_service.settings.eqho_api_token", "")
+    return OutreachService()
+
+
+@pytest.fixture
+async def test_sequence(db_session):
+    """Create a two-step sequence"""
+    sequence = OutreachSequence(
+        id=str(uuid4()),
+        name="Intro",
+        is_active=True,
+        steps=[
+            {"channel": "email", "delay_hours": 0, "template": "Hi {{ company.name }}"},
+            {"channel": "sms", "delay_hours": 24, "template": "Following up, {{ company.name }}"},
+        ],
+    )
+    db_session.add(sequence)
+    await db_session.commit()
+    return sequence
+
+
+async def _assign(db_session, zone_id, sequence_id, **overrides):
+    company = Company(
+        id=str(uuid4()),
+        name="Queue Towing",
+        zone_id=str(zone_id),
+        phone_primary="555-0600",
+        google_business_url=f"https://maps.google.com/{uuid4()}",
+        address_street="1 Main St",
+        address_city="Salt Lake City",
+        address_state="UT",
+        address_zip="84101",
+        source="test",
+    )
+    assignment = OutreachAssignment(
+        id=str(uuid4()),
+        company_id=company.id,
+        sequence_id=sequence_id,
+        status="active",
+        **overrides,
+    )
+    db_session.add_all([company, assignment])
+    await db_session.commit()
+    return assignment
+
+
+@pytest.mark.asyncio
+async def test_process_outreach_queue_sends_due_steps(
+    db_session, test_zone, test_sequence, outreach_service
+):
+    """Test due assignments are sent and advanced in bulk"""
+    for _ in range(3):
+        await _assign(db_session, test_zone.id, test_sequence.id)
+
+    result = await outreach_service.process_outreach_queue(db_session)
+
+    assert result == {"processed": 3, "sent": 3, "failed": 0, "deferred": 0}
+
+    history = await db_session.execute(select(OutreachHistory.message_content))
+    assert history.scalars().all() == ["Hi Queue Towing"] * 3
+
+    steps = await db_session.execute(
+        select(OutreachAssignment.current_step, OutreachAssignment.started_at)
+    )
+    for row in steps.all():
+        assert row.current_step == 1
+        assert row.started_at is not None
+
+
+@pytest.mark.asyncio
+async def test_process_outreach_queue_skips_and_completes(
+    db_session, test_zone, test_sequence, outreach_service
+):
+    """Test steps that aren't due are skipped and the last step completes"""
+    now = datetime.utcnow()
+    not_due = await _assign(
+        db_session, test_zone.id, test_sequence.id, current_step=1, started_at=now
+    )
+    last_step = await _assign(
+        db_session, test_zone.id, test_sequence.id,
+        current_step=1, started_at=now - timedelta(hours=25)
+    )
+
+    result = await outreach_service.process_outreach_queue(db_session)
+
+    assert result == {"processed": 1, "sent": 1, "failed": 0, "deferred": 0}
+
+    rows = await db_session.execute(
+        select(OutreachAssignment.id, OutreachAssignment.status, OutreachAssignment.current_step)
+    )
+    by_id = {row.id: row for row in rows.all()}
+    assert by_id[not_due.id].current_step == 1
+    assert by_id[not_due.id].status == "active"
+    assert by_id[last_step.id].status == "completed"
+
+    count = await db_session.execute(select(func.count(OutreachHistory.id)))
+    assert count.scalar_one() == 1
+
+
+@pytest.mark.asyncio
+async def test_process_outreach_queue_schedules_next_step(
+    db_session, test_zone, test_sequence, outreach_service
+):
+    """Test sent steps persist the next due time and backfilled rows aren't sent"""
+    started = datetime.utcnow() - timedelta(hours=1)
+    fresh = await _assign(db_session, test_zone.id, test_sequence.id)
+    legacy = await _assign(
+        db_session, test_zone.id, test_sequence.id, current_step=1, started_at=started
+    )
+
+    result = await outreach_service.process_outreach_queue(db_session)
+    assert result == {"processed": 1, "sent": 1, "failed": 0, "deferred": 0}
+
+    rows = await db_session.execute(
+        select(
+            OutreachAssignment.id,
+            OutreachAssignment.current_step,
+            OutreachAssignment.started_at,
+            OutreachAssignment.next_step_due_at,
+        )
+    )
+    by_id = {row.id: row for row in rows.all()}
+    assert by_id[fresh.id].current_step == 1
+    assert by_id[fresh.id].next_step_due_at == by_id[fresh.id].started_at + timedelta(hours=24)
+    assert by_id[legacy.id].current_step == 1
+    assert by_id[legacy.id].next_step_due_at == started + timedelta(hours=24)
+
+    # Nothing is due on the next tick
+    result = await outreach_service.process_outreach_queue(db_session)
+    assert result == {"processed": 0, "sent": 0, "failed": 0, "deferred": 0}
+
+
+@pytest.mark.asyncio
+async def test_process_outreach_queue_defers_repeat_calls(
+    db_session, test_zone, outreach_service
+):
+    """Test a phone step to a number already called this run is deferred by the cooldown"""
+    sequence = OutreachSequence(
+        id=str(uuid4()),
+        name="Call",
+        is_active=True,
+        steps=[{"channel": "phone", "delay_hours": 0, "template": "Call {{ company.name }}"}],
+    )
+    db_session.add(sequence)
+    await db_session.commit()
+    first = await _assign(db_session, test_zone.id, sequence.id)
+    second = await _assign(db_session, test_zone.id, sequence.id)
+    # Two listings of one business
+    await db_session.execute(update(Company).values(phone_primary_e164="+18015550600"))
+    await db_session.commit()
+
+    result = await outreach_service.process_outreach_queue(db_session)
+
+    assert result == {"processed": 1, "sent": 1, "failed": 0, "deferred": 1}
+    rows = await db_session.execute(
+        select(OutreachAssignment.id, OutreachAssignment.current_step, OutreachAssignment.next_step_due_at)
+    )
+    by_id = {row.id: row for row in rows.all()}
+    called, deferred = sorted(
+        (by_id[first.id], by_id[second.id]), key=lambda row: row.current_step, reverse=True
+    )
+    assert called.current_step == 1
+    assert deferred.current_step == 0
+    assert deferred.next_step_due_at > datetime.utcnow() + timedelta(hours=71)
+
+    # The sent call now blocks the number on later runs too
+    assert await OutreachService.recently_called_phones(
+        db_session, ["+18015550600", "+18015550601"], datetime.utcnow() - timedelta(hours=1)
+    ) == {"+18015550600"}
+
+
+@pytest.mark.asyncio
+async def test_webhook_sends_reuse_pooled_connections(
+    db_session, test_zone, test_sequence, webhook_server, monkeypatch
+):
+    """Test per-message webhook sends share keep-alive connections"""
+    service = _webhook_service(monkeypatch, webhook_server.url)
+    for _ in range(60):
+        await _assign(db_session, test_zone.id, test_sequence.id)
+
+    result = await service.process_outreach_queue(db_session)
+
+    assert result == {"processed": 60, "sent": 60, "failed": 0, "deferred": 0}
+    assert webhook_server.requests == 60
+    assert webhook_server.messages == 60
+    assert webhook_server.connections <= OUTREACH_SEND_CONCURRENCY
+
+
+@pytest.mark.asyncio
+async def test_webhook_batch_mode_maps_results(
+    db_session, test_zone, test_sequence, webhook_server, monkeypatch
+):
+    """Test batch mode posts arrays and maps per-message results to history rows"""
+    service = _webhook_service(monkeypatch, webhook_server.url, batch_size=25)
+    assignments = [await _assign(db_session, test_zone.id, test_sequence.id) for _ in range(60)]
+    webhook_server.fail_company_ids = {str(assignments[7].company_id)}
+
+    result = await service.process_outreach_queue(db_session)
+
+    assert result == {"processed": 60, "sent": 59, "failed": 1, "deferred": 0}
+    assert webhook_server.requests == 3
+    assert webhook_server.messages == 60
+
+    rows = await db_session.execute(
+        select(OutreachHistory.company_id, OutreachHistory.status, OutreachHistory.external_id)
+    )
+    by_company = {row.company_id: row for row in rows.all()}
+    assert len(by_company) == 60
+    assert by_company[assignments[7].company_id].status == "failed"
+    assert all(
+        row.external_id.startswith("msg-")
+        for company_id, row in by_company.items()
+        if company_id != assignments[7].company_id
+    )
+
+
+class FakeEqho:
+    """In-process fake of the Eqho lead list, upload and call methods"""
+
+    def __init__(self):
+        self.requests = []
+        self.lists = {}
+        self.calls = 0
+        self.drop_leads = 0  # leads left out of each upload response
+
+    async def create_lead_list(self, name, description=None):
+        self.requests.append(("create_lead_list", name))
+        list_id = f"list-{len(self.lists) + 1}"
+        self.lists[list_id] = []
+        return {"id": list_id, "name": name}
+
+    async def upload_leads(self, list_id, leads):
+        self.requests.append(("upload_leads", list_id))
+        start = len(self.lists[list_id])
+        self.lists[list_id].extend(leads)
+        created = [
+            {"id": f"{list_id}-lead-{start + i}", "company_id": lead["custom_fields"]["company_id"]}
+            for i, lead in enumerate(leads)
+        ]
+        # Eqho doesn't promise input order
+        created.reverse()
+        return {"leads": created[self.drop_leads:]}
+
+    async def trigger_call(self, campaign_id, lead_id):
+        self.calls += 1
+        return {"call_id": f"call-{self.calls}", "status": "queued", "lead_id": lead_id}
+
+
+@pytest.fixture
+def eqho_service(monkeypatch):
+    """Create OutreachService talking to a fake Eqho API"""
+    monkeypatch.setattr("app.services.outreach_service.settings.eqho_api_token", "test-token")
+    monkeypatch.setattr(EqhoService, "_campaign_lists", {})
+    fake = FakeEqho()
+    service = OutreachService()
+    for name in ("create_lead_list", "upload_leads", "trigger_call"):
+        monkeypatch.setattr(service.eqho_service, name, getattr(fake, name))
+    service.fake_eqho = fake
+    return service
+
+
+async def _insert_companies(db_session, zone_id, count, **values):
+    rows = [
+        {
+            "id": str(uuid4()),
+            "name": f"Impound Towing {i}",
+            "zone_id": str(zone_id),
+            "phone_primary": f"555-{i:05d}",
+            "google_business_url": f"https://maps.google.com/{uuid4()}",
+            "address_street": "1 Main St",
+            "address_city": "Ogden",
+            "address_state": "UT",
+            "address_zip": "84401",
+            "source": "test",
+            **values,
+        }
+        for i in range(count)
+    ]
+    await db_session.execute(insert(Company), rows)
+    await db_session.commit()
+    return rows
+
+
+@pytest.mark.asyncio
+async def test_push_campaign_leads_uploads_in_bulk(db_session, test_zone, eqho_service):
+    """Test 5,000 impound leads go up in a handful of requests on one reused list"""
+    rows = await _insert_companies(db_session, test_zone.id, 5000, has_impound_service=True)
+    await _insert_companies(db_session, test_zone.id, 40, has_impound_service=False)
+
+    result = await eqho_service.push_campaign_leads(
+        db_session, "camp-1", has_impound_service=True
+    )
+
+    fake = eqho_service.fake_eqho
+    assert result["leads_uploaded"] == 5000
+    assert result["upload_requests"] == 5
+    assert len(fake.requests) == 6  # one list creation + five uploads
+    assert list(fake.lists) == ["list-1"]
+
+    # A second push reuses the campaign's list
+    result = await eqho_service.push_campaign_leads(
+        db_session, "camp-1", company_ids=[row["id"] for row in rows[:10]]
+    )
+    assert result["list_id"] == "list-1"
+    assert fake.requests[6:] == [("upload_leads", "list-1")]
+    assert len(fake.lists["list-1"]) == 5010
+
+
+@pytest.mark.asyncio
+async def test_push_campaign_leads_triggers_calls(db_session, test_zone, eqho_service):
+    """Test bulk calls are triggered per uploaded lead and recorded as history"""
+    rows = await _insert_companies(db_session, test_zone.id, 30, has_impound_service=True)
+
+    result = await eqho_service.push_campaign_leads(
+        db_session, "camp-2", zone_id=test_zone.id, trigger_calls=True
+    )
+
+    assert result["calls_triggered"] == 30
+    assert result["calls_failed"] == 0
+    assert eqho_service.fake_eqho.calls == 30
+
+    history = await db_session.execute(
+        select(OutreachHistory.company_id, OutreachHistory.channel, OutreachHistory.external_id)
+    )
+    history = history.all()
+    assert {row.company_id for row in history} == {row["id"] for row in rows}
+    assert all(row.channel == "phone" and row.external_id.startswith("call-") for row in history)
+
+    # Each call went to its own company's lead
+    metadata = await db_session.execute(
+        select(OutreachHistory.company_id, OutreachHistory.outreach_metadata)
+    )
+    leads = dict(zip(
+        (lead["custom_fields"]["company_id"] for lead in eqho_service.fake_eqho.lists["list-1"]),
+        (f"list-1-lead-{i}" for i in range(30)),
+    ))
+    assert all(leads[company_id] == data["lead_id"] for company_id, data in metadata.all())
+
+
+@pytest.mark.asyncio
+async def test_push_campaign_leads_short_upload_response(db_session, test_zone, eqho_service):
+    """Test companies missing from the upload response are failed calls, not misattributed"""
+    await _insert_companies(db_session, test_zone.id, 5)
+    eqho_service.fake_eqho.drop_leads = 2
+
+    result = await eqho_service.push_campaign_leads(db_session, "camp-4", trigger_calls=True)
+
+    assert (result["calls_triggered"], result["calls_failed"]) == (3, 2)
+    history = await db_session.execute(select(OutreachHistory.status))
+    statuses = sorted(history.scalars().all())
+    assert statuses == ["failed", "failed", "sent", "sent", "sent"]
+
+
+@pytest.mark.asyncio
+async def test_push_campaign_leads_reports_skipped_companies(db_session, test_zone, eqho_service):
+    """Test requested companies that can't be uploaded are reported as skipped"""
+    rows = await _insert_companies(db_session, test_zone.id, 2)
+    no_phone = await _insert_companies(db_session, test_zone.id, 1, phone_primary="")
+    missing = str(uuid4())
+
+    result = await eqho_service.push_campaign_leads(
+        db_session, "camp-5", company_ids=[rows[0]["id"], rows[1]["id"], no_phone[0]["id"], missing]
+    )
+
+    assert result["leads_uploaded"] == 2
+    assert sorted(result["skipped_company_ids"]) == sorted([no_phone[0]["id"], missing])
+
+
+@pytest.mark.asyncio
+async def test_push_campaign_leads_skips_repeat_calls(db_session, test_zone, eqho_service):
+    """Test duplicate listings and recently called numbers aren't called again"""
+    await _insert_companies(db_session, test_zone.id, 3, phone_primary_e164="+18015550100")
+    await _insert_companies(db_session, test_zone.id, 1, phone_primary_e164="+18015550101")
+    recent = await _insert_companies(db_session, test_zone.id, 1, phone_primary_e164="+18015550102")
+    await db_session.execute(insert(OutreachHistory), [{
+        "id": str(uuid4()),
+        "company_id": recent[0]["id"],
+        "channel": "phone",
+        "status": "sent",
+        "message_content": "Earlier call",
+        "sent_at": datetime.utcnow() - timedelta(hours=10),
+    }])
+    await db_session.commit()
+
+    result = await eqho_service.push_campaign_leads(db_session, "camp-3", trigger_calls=True)
+
+    assert result["calls_triggered"] == 2
+    assert result["calls_skipped"] == 3
+    assert result["leads_uploaded"] == 2
+    assert eqho_service.fake_eqho.calls == 2
@@ -0,0 +1,105 @@
+"""Tests for delta-encoded enrichment snapshots"""
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import select, func, update
+from app.models.enrichment import EnrichmentSnapshot
+from app.services import snapshot_service
+from app.services.snapshot_service import SnapshotService
+
+
+def test_diff_and_apply_roundtrip():
+    """Test that applying a diff reproduces the new state"""
+    previous = {"fleet_size": "small", "has_impound_service": False, "hours_website": {"24_7": True}}
+    current = {"fleet_size": "medium", "has_impound_service": False}
+
+    delta = SnapshotService.diff_states(previous, current)
+
+    assert delta == {"set": {"fleet_size": "medium"}, "unset": ["hours_website"]}
+    assert SnapshotService.apply_delta(previous, delta) == current
+
+
+@pytest.mark.asyncio
+async def test_store_snapshots_skips_unchanged(db_session, test_company):
+    """Test identical enrichment output writes no new snapshot"""
+    data = {"fleet_size": "small", "website_scraped_at": datetime.utcnow()}
+    written = await SnapshotService.store_snapshots(db_session, [(test_company.id, data)], "website")
+    await db_session.commit()
+    assert written == 1
+
+    # Only the volatile timestamp differs
+    data = {"fleet_size": "small", "website_scraped_at": datetime.utcnow() + timedelta(days=1)}
+    written = await SnapshotService.store_snapshots(db_session, [(test_company.id, data)], "website")
+    await db_session.commit()
+    assert written == 0
+
+    count = await db_session.execute(select(func.count(EnrichmentSnapshot.id)))
+    assert count.scalar_one() == 1
+
+
+@pytest.mark.asyncio
+async def test_store_snapshots_writes_delta_and_rebuilds_history(db_session, test_company):
+    """Test changed output is stored as a delta and history rebuilds full states"""
+    first = {"fleet_size": "small", "has_impound_service": True}
+    second = {"fleet_size": "medium", "has_impound_service": True}
+    await SnapshotService.store_snapshots(db_session, [(test_company.id, first)], "website")
+    await db_session.commit()
+    await SnapshotService.store_snapshots(db_session, [(test_company.id, second)], "website")
+    await db_session.commit()
+
+    result = await db_session.execute(
+        select(EnrichmentSnapshot).order_by(EnrichmentSnapshot.chain_seq)
+    )
+    rows = result.scalars().all()
+    assert [row.snapshot_type for row in rows] == ["full", "delta"]
+    assert rows[1].snapshot_data == {"set": {"fleet_size": "medium"}, "unset": []}
+
+    history = await SnapshotService.get_history(db_session, test_company.id)
+    assert [entry["snapshot_data"] for entry in history] == [first, second]
+
+
+@pytest.mark.asyncio
+async def test_compact_snapshots_rolls_up_old_rows(db_session, test_company):
+    """Test compaction folds old snapshots while keeping the latest state intact"""
+    states = [{"fleet_size": size} for size in ("small", "medium", "large", "medium")]
+    for state in states:
+        await SnapshotService.store_snapshots(db_session, [(test_company.id, state)], "website")
+        await db_session.commit()
+
+    # Age all but the newest snapshot past the retention window, all at one
+    # timestamp so only chain_seq orders them
+    await db_session.execute(
+        update(EnrichmentSnapshot)
+        .where(EnrichmentSnapshot.chain_seq < len(states) - 1)
+        .values(created_at=datetime.utcnow() - timedelta(days=200))
+        .execution_options(synchronize_session=False)
+    )
+    await db_session.commit()
+
+    stats = await SnapshotService.compact_snapshots(db_session, older_than_days=90)
+
+    assert stats == {"companies_compacted": 1, "snapshots_deleted": 2}
+    history = await SnapshotService.get_history(db_session, test_company.id)
+    assert [entry["snapshot_data"] for entry in history] == [states[2], states[3]]
+
+
+@pytest.mark.asyncio
+async def test_store_snapshots_rebuilds_from_latest_keyframe(db_session, test_company, monkeypatch):
+    """Test a full row is written every keyframe interval and later writes chain off it"""
+    monkeypatch.setattr(snapshot_service, "SNAPSHOT_KEYFRAME_INTERVAL", 2)
+    states = [{"review_count": count} for count in range(5)]
+    for state in states:
+        await SnapshotService.store_snapshots(db_session, [(test_company.id, state)], "website")
+        await db_session.commit()
+
+    result = await db_session.execute(
+        select(EnrichmentSnapshot.snapshot_type, EnrichmentSnapshot.chain_seq)
+        .order_by(EnrichmentSnapshot.chain_seq)
+    )
+    assert result.all() == [("full", 0), ("delta", 1), ("full", 2), ("delta", 3), ("full", 4)]
+
+    latest = await SnapshotService._latest_chain_states(db_session, [test_company.id], "website")
+    assert latest[test_company.id][0] == states[-1]
+    assert latest[test_company.id][2:] == (0, 4)
+
+    history = await SnapshotService.get_history(db_session, test_company.id)
+    assert [entry["snapshot_data"] for entry in history] == states
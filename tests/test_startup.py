@@ -0,0 +1,57 @@
+"""Tests for API startup cost"""
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Cumulative `python -X importtime` budget for app.main, in seconds. Generous so
+# slow CI machines pass; it catches a heavy dependency moving back to import time.
+APP_IMPORT_BUDGET_SECONDS = float(os.environ.get("APP_IMPORT_BUDGET_SECONDS", "5.0"))
+
+# Best of this many fresh-interpreter imports is compared to the budget
+IMPORT_BUDGET_RUNS = 3
+
+# Heavy dependencies only needed once a route or job actually uses them
+LAZY_MODULES = ("playwright", "apscheduler", "supabase", "gotrue", "jinja2", "numpy", "httpx")
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_app_main_defers_heavy_imports():
+    """Test importing the API doesn't import heavy optional dependencies"""
+    result = _run(
+        "import sys, app.main; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+
+    assert result.stdout.strip() == ""
+
+
+def _load_benchmark_script():
+    spec = importlib.util.spec_from_file_location(
+        "benchmark_startup", PROJECT_ROOT / "scripts" / "benchmark_startup.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_app_main_import_time_budget():
+    """Test app.main imports within the startup budget"""
+    benchmark = _load_benchmark_script()
+    benchmark.module_import_seconds("app.main")  # warm filesystem caches
+
+    seconds = min(benchmark.module_import_seconds("app.main") for _ in range(IMPORT_BUDGET_RUNS))
+
+    assert seconds < APP_IMPORT_BUDGET_SECONDS
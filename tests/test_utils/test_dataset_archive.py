@@ -0,0 +1,39 @@
+"""Tests for the raw dataset archive"""
+from app.utils.dataset_archive import DatasetArchive
+
+
+def _items(start, count):
+    return [{"title": f"Towing {i}", "url": f"https://maps.google.com/{i}"} for i in range(start, start + count)]
+
+
+def test_write_and_read_chunks(tmp_path):
+    """Test chunks are indexed and read back from any offset"""
+    archive = DatasetArchive(str(tmp_path))
+    assert archive.write_chunk("run-1", "dataset-1", 0, _items(0, 3))
+    assert archive.write_chunk("run-1", "dataset-1", 3, _items(3, 3))
+    archive.mark_complete("run-1")
+    
+    # A fresh instance reads the persisted index
+    archive = DatasetArchive(str(tmp_path))
+    entry = archive.get_run("run-1")
+    assert entry["dataset_id"] == "dataset-1"
+    assert entry["items"] == 6
+    assert entry["complete"] is True
+    assert len(archive.chunk_paths("run-1")) == 2
+    
+    chunks = list(archive.iter_chunks("run-1", offset=2, limit=5))
+    assert [(offset, [item["title"] for item in items]) for offset, items in chunks] == [
+        (2, ["Towing 2"]),
+        (3, ["Towing 3", "Towing 4"]),
+    ]
+
+
+def test_write_chunk_requires_contiguous_offsets(tmp_path):
+    """Test a chunk that doesn't continue the archive isn't written"""
+    archive = DatasetArchive(str(tmp_path))
+    assert not archive.write_chunk("run-1", "dataset-1", 5, _items(5, 2))
+    assert archive.get_run("run-1") is None
+    
+    assert archive.write_chunk("run-1", "dataset-1", 0, _items(0, 2))
+    assert not archive.write_chunk("run-1", "dataset-1", 0, _items(0, 2))
+    assert archive.get_run("run-1")["items"] == 2
@@ -0,0 +1,39 @@
+"""Tests for streaming JSON readers"""
+import io
+import json
+import pytest
+from app.utils.json_stream import iter_json_array, iter_json_lines
+
+
+DOCUMENT = {
+    "total_runs": 2,
+    "runs": [{"run_id": "a", "note": "brackets ]} and \"quotes\""}, {"run_id": "b"}],
+    "companies": [{"name": "A", "rating": 4.5}, {"name": "B", "review_count": 12}, 7, -1.5e-3, True, None],
+    "trailer": "ignored",
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 17, 65536])
+def test_iter_json_array_streams_keyed_array(chunk_size):
+    """Test the keyed array is streamed intact whatever the chunk boundaries"""
+    fp = io.StringIO(json.dumps(DOCUMENT, indent=2))
+
+    assert list(iter_json_array(fp, key="companies", chunk_size=chunk_size)) == DOCUMENT["companies"]
+
+
+def test_iter_json_array_top_level_and_errors():
+    """Test bare arrays, empty arrays, missing keys and malformed input"""
+    assert list(iter_json_array(io.StringIO('[1, "two", {"3": [3]}]'))) == [1, "two", {"3": [3]}]
+    assert list(iter_json_array(io.StringIO(" [ ] "))) == []
+
+    with pytest.raises(KeyError):
+        list(iter_json_array(io.StringIO('{"runs": []}'), key="companies"))
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[1 2]')))
+
+
+def test_iter_json_lines_skips_blank_lines():
+    """Test JSON Lines input yields one record per line"""
+    fp = io.StringIO('{"name": "A"}\n\n{"name": "B"}\n')
+
+    assert list(iter_json_lines(fp)) == [{"name": "A"}, {"name": "B"}]
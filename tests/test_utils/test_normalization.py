@@ -0,0 +1,36 @@
+"""Tests for normalization utilities"""
+from app.utils.normalization import normalize_domain, normalize_phone
+
+
+def test_normalize_domain():
+    """Test website URLs reduce to a bare lowercase host"""
+    assert normalize_domain("https://www.Example.com:443/contact?x=1") == "example.com"
+    assert normalize_domain("http://example.com/") == "example.com"
+    assert normalize_domain("WWW.example.com/about") == "example.com"
+    assert normalize_domain("tow.example.com.") == "tow.example.com"
+    assert normalize_domain("") is None
+    assert normalize_domain(None) is None
+    assert normalize_domain("https:///path") is None
+
+
+def test_normalize_phone():
+    """Test phone numbers are normalized to E.164"""
+    assert normalize_phone("(801) 555-0100") == "+18015550100"
+    assert normalize_phone("1-801-555-0100") == "+18015550100"
+    assert normalize_phone("801.555.0100 ext 12") == "+18015550100"
+    assert normalize_phone("+44 20 7946 0958") == "+442079460958"
+    assert normalize_phone("011 44 20 7946 0958") == "+442079460958"
+    assert normalize_phone("555-0100") is None  # no area code
+    assert normalize_phone("(801) 055-0100") is None  # invalid exchange
+    assert normalize_phone(None) is None
+
+
+def test_geohash_and_name_tokens():
+    """Test location cells and distinctive business name words"""
+    from app.utils.normalization import geohash, name_tokens
+
+    assert geohash(57.64911, 10.40744, precision=11) == "u4pruydqqvj"
+    assert geohash(40.7608, -111.891) == geohash(40.7610, -111.890)
+    assert name_tokens("A&B Towing, LLC") == {"ab"}
+    assert name_tokens("Joe's 24/7 Towing & Recovery") == {"joes"}
+    assert name_tokens(None) == frozenset()
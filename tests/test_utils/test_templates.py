@@ -0,0 +1,67 @@
+"""Tests for outreach template rendering"""
+from types import SimpleNamespace
+from jinja2 import Template
+from app.utils.templates import OUTREACH_TEMPLATES, TemplateRenderer, template_renderer
+
+
+def test_render_matches_uncached_template():
+    """Test cached rendering matches a freshly compiled template"""
+    renderer = TemplateRenderer()
+    company = SimpleNamespace(name="Acme Towing", address_city="Provo")
+    source = OUTREACH_TEMPLATES["email_intro"]
+
+    assert renderer.render(source, company=company) == Template(source).render(company=company)
+
+
+def test_get_template_reuses_compiled_template():
+    """Test the same source compiles once"""
+    renderer = TemplateRenderer()
+
+    first = renderer.get_template("Hi {{ name }}")
+    second = renderer.get_template("Hi {{ name }}")
+
+    assert first is second
+    assert renderer.cache_info() == {"size": 1, "max_size": 256, "hits": 1, "misses": 1}
+
+
+def test_cache_evicts_least_recently_used():
+    """Test the cache stays bounded and keeps recently used templates"""
+    renderer = TemplateRenderer(max_size=2)
+    renderer.get_template("a")
+    renderer.get_template("b")
+    renderer.get_template("a")
+    renderer.get_template("c")
+
+    assert renderer.cache_info()["size"] == 2
+    assert renderer.source_key("a") in renderer._compiled
+    assert renderer.source_key("b") not in renderer._compiled
+
+
+def test_render_many():
+    """Test one template renders against many contexts"""
+    renderer = TemplateRenderer()
+
+    rendered = renderer.render_many("Hi {{ name }}", ({"name": n} for n in ("A", "B")))
+
+    assert rendered == ["Hi A", "Hi B"]
+    assert renderer.cache_info()["misses"] == 1
+
+
+def test_outreach_templates_preloaded():
+    """Test the shared renderer compiles all built-in templates on first use"""
+    template_renderer.render(OUTREACH_TEMPLATES["sms_intro"], company={"name": "A"})
+
+    for source in OUTREACH_TEMPLATES.values():
+        assert template_renderer.source_key(source) in template_renderer._compiled
+
+
+def test_deferred_preload_waits_for_first_use():
+    """Test deferred preloading compiles nothing until a template is requested"""
+    renderer = TemplateRenderer()
+    renderer.preload(["Hi {{ name }}", "Bye {{ name }}"], deferred=True)
+
+    assert renderer.cache_info()["size"] == 0
+    assert renderer._environment is None
+
+    assert renderer.render("Bye {{ name }}", name="A") == "Bye A"
+    assert renderer.cache_info()["size"] == 2